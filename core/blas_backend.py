@@ -0,0 +1,106 @@
+import os
+import glob
+import ctypes
+import numpy as np
+
+class BlasBackend:
+    """
+    Información y número de hilos de la biblioteca BLAS que usa NumPy.
+
+    El número de hilos se cambia llamando directamente a la biblioteca cargada
+    (OpenBLAS o MKL) mediante ctypes, así que tiene efecto inmediato sin
+    reiniciar la aplicación. Si la biblioteca no se reconoce, controllable es False.
+    """
+    # Nombres de las funciones set/get según la biblioteca y cómo se compiló
+    THREAD_FUNCTIONS = (
+        ("openblas_set_num_threads", "openblas_get_num_threads"),
+        ("openblas_set_num_threads64_", "openblas_get_num_threads64_"),
+        ("scipy_openblas_set_num_threads64_", "scipy_openblas_get_num_threads64_"),
+        ("scipy_openblas_set_num_threads", "scipy_openblas_get_num_threads"),
+        ("MKL_Set_Num_Threads", "MKL_Get_Max_Threads"),
+    )
+
+    def __init__(self):
+        self._set = None
+        self._get = None
+        self.library = None
+        for path in self._candidate_libraries():
+            try:
+                lib = ctypes.CDLL(path)
+            except OSError:
+                continue
+            for set_name, get_name in self.THREAD_FUNCTIONS:
+                if hasattr(lib, set_name) and hasattr(lib, get_name):
+                    self._set = getattr(lib, set_name)
+                    self._get = getattr(lib, get_name)
+                    self._get.restype = ctypes.c_int
+                    self.library = path
+                    return
+
+    def _candidate_libraries(self):
+        # Primero las bibliotecas ya cargadas en el proceso, después las que trae la rueda de NumPy
+        candidates = []
+        if os.path.exists("/proc/self/maps"):
+            with open("/proc/self/maps") as f:
+                for line in f:
+                    path = line.split()[-1]
+                    name = os.path.basename(path).lower()
+                    if ("blas" in name or "mkl" in name) and path not in candidates:
+                        candidates.append(path)
+        numpy_dir = os.path.dirname(np.__file__)
+        for pattern in ("../numpy.libs/*blas*", ".dylibs/*blas*", "../numpy.libs/*mkl*"):
+            for path in glob.glob(os.path.join(numpy_dir, pattern)):
+                if path not in candidates:
+                    candidates.append(path)
+        return candidates
+
+    @property
+    def controllable(self):
+        return self._set is not None
+
+    def get_threads(self):
+        """Número de hilos actual de BLAS, o None si no se puede consultar."""
+        return int(self._get()) if self._get is not None else None
+
+    def set_threads(self, n):
+        if self._set is None:
+            raise ValueError("No se puede cambiar el número de hilos de esta biblioteca BLAS.")
+        n = int(n)
+        if n < 1:
+            raise ValueError("El número de hilos debe ser al menos 1.")
+        self._set(n)
+
+    def info(self):
+        """Nombre, versión y configuración de BLAS según NumPy, más los hilos en uso."""
+        try:
+            blas = np.show_config(mode="dicts")["Build Dependencies"]["blas"]
+        except Exception:
+            blas = {}
+        return {
+            "name": blas.get("name", "desconocida"),
+            "version": blas.get("version", "desconocida"),
+            "threads": self.get_threads(),
+            "max_threads": os.cpu_count() or 1,
+            "controllable": self.controllable,
+        }
+
+    def limit(self, n):
+        """Contexto que fija n hilos y restaura el valor anterior al salir."""
+        return _ThreadLimit(self, n)
+
+class _ThreadLimit:
+    def __init__(self, backend, n):
+        self.backend = backend
+        self.n = n
+        self.previous = None
+
+    def __enter__(self):
+        if self.n is not None and self.backend.controllable:
+            self.previous = self.backend.get_threads()
+            self.backend.set_threads(self.n)
+        return self
+
+    def __exit__(self, *exc):
+        if self.previous is not None:
+            self.backend.set_threads(self.previous)
+        return False
@@ -4,8 +4,11 @@ import re
 from typing import Dict, Tuple, List, Union, Callable
 
 class DiffEquationOperations:
+    # Número máximo de mallas del campo de pendientes guardadas en caché
+    MAX_CACHE = 32
+
     def __init__(self):
-        pass
+        self._cache_campos = {}
     
     # MÉTODO ANALÍTICO
     def normalizar_raices(self, expr_str, func_name, indep_var):
@@ -417,4 +420,76 @@ class DiffEquationOperations:
             return x, y_ajustado, f"Solución usando regresión lineal (y = {m:.4f}x + {b:.4f}, R² = {r_squared:.4f})"
             
         except Exception as e:
-            return None, None, f"Error al resolver con mínimos cuadrados: {str(e)}" 
\ No newline at end of file
+            return None, None, f"Error al resolver con mínimos cuadrados: {str(e)}" 
+
+    # CAMPO DE PENDIENTES
+    def compilar_edo(self, ecuacion_str: str) -> Callable:
+        """Compila f(x, y) de dy/dx = f(x, y) para evaluarla sobre arrays completos."""
+        f_str, error = self.extraer_edo_primer_orden(ecuacion_str)
+        if error:
+            raise ValueError(error)
+        codigo = compile(f_str.replace('^', '**'), '<edo>', 'eval')
+        entorno = {"sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp,
+                   "log": np.log, "sqrt": np.sqrt, "pi": np.pi, "e": np.e}
+        
+        def f(x, y):
+            valor = eval(codigo, entorno, {"x": x, "y": y})
+            # Las expresiones constantes devuelven un escalar
+            return np.broadcast_to(valor, np.broadcast(x, y).shape).astype(float)
+        
+        return f
+    
+    def campo_pendientes(self, ecuacion_str: str, x_rango: Tuple[float, float], y_rango: Tuple[float, float], n: int = 20):
+        """
+        Evalúa el campo de pendientes de dy/dx = f(x, y) sobre una malla n x n
+        con una única evaluación vectorizada.
+        
+        Returns:
+            tuple: (X, Y, U, V) con (U, V) unitarios, listos para plt.quiver
+        """
+        try:
+            clave = (ecuacion_str.replace(' ', ''), tuple(x_rango), tuple(y_rango), n)
+            if clave not in self._cache_campos:
+                if len(self._cache_campos) >= self.MAX_CACHE:
+                    self._cache_campos.pop(next(iter(self._cache_campos)))
+                f = self.compilar_edo(ecuacion_str)
+                X, Y = np.meshgrid(np.linspace(x_rango[0], x_rango[1], n), np.linspace(y_rango[0], y_rango[1], n))
+                with np.errstate(all='ignore'):
+                    pendiente = f(X, Y)
+                    norma = np.sqrt(1 + pendiente ** 2)
+                self._cache_campos[clave] = (X, Y, 1 / norma, pendiente / norma)
+            return self._cache_campos[clave]
+        except Exception as e:
+            raise ValueError(f"Error al calcular el campo de pendientes: {str(e)}")
+    
+    def trayectorias_lote(self, ecuacion_str: str, x0: float, y0s, t_total: float, h: float):
+        """
+        Integra con Runge-Kutta 4 todas las condiciones iniciales y(x0) = y0s
+        a la vez, avanzando el array completo en cada paso.
+        
+        Returns:
+            tuple: (puntos x, valores con forma (len(puntos), len(y0s)))
+        """
+        try:
+            if t_total <= 0 or h <= 0:
+                raise ValueError("El intervalo y el paso deben ser positivos")
+            f = self.compilar_edo(ecuacion_str)
+            x_puntos = np.arange(x0, x0 + t_total + h/2, h)
+            valores = np.empty((len(x_puntos), len(y0s)))
+            valores[0] = y0s
+            
+            with np.errstate(all='ignore'):
+                for i in range(1, len(x_puntos)):
+                    x = x_puntos[i-1]
+                    y = valores[i-1]
+                    
+                    k1 = h * f(x, y)
+                    k2 = h * f(x + h/2, y + k1/2)
+                    k3 = h * f(x + h/2, y + k2/2)
+                    k4 = h * f(x + h, y + k3)
+                    
+                    valores[i] = y + (k1 + 2*k2 + 2*k3 + k4) / 6
+            
+            return x_puntos, valores
+        except Exception as e:
+            raise ValueError(f"Error al integrar las trayectorias: {str(e)}")
@@ -7,12 +7,18 @@ from typing import Dict, Tuple, List, Union
 logger = logging.getLogger(__name__)
 
 class DiffSystemOperations:
+    # Funciones que el preprocesamiento no debe confundir con variables
+    FUNCIONES = ['sin', 'cos', 'tan', 'exp', 'log', 'sqrt']
+
+    # Número máximo de mallas del campo de direcciones guardadas en caché
+    MAX_CACHE = 32
+
     def __init__(self):
         self.t = sp.Symbol('t')
-        self.x = sp.Function('x')(self.t)
-        self.y = sp.Function('y')(self.t)
+        self._cache_compilados = {}
+        self._cache_campos = {}
     
-    def _preprocesar_ecuacion(self, eq: str) -> str:
+    def _preprocesar_ecuacion(self, eq: str) -> Tuple[str, str]:
         try:
             # Eliminar espacios innecesarios
             eq = eq.strip()
@@ -22,27 +28,28 @@ class DiffSystemOperations:
                 raise ValueError("La ecuación debe contener un signo igual (=)")
             
             lhs, rhs = eq.split('=')
-            lhs = lhs.strip()
+            lhs = lhs.strip().replace(' ', '')
             rhs = rhs.strip()
             
-            # Procesar el lado izquierdo (derivada)
-            lhs = lhs.lower()  # Convertir a minúsculas para manejar diferentes formatos
-            if lhs in ['dx/dt', 'dx/d(t)', 'd(x)/dt', 'd(x)/d(t)']:
-                lhs = 'Derivative(x(t), t)'
-            elif lhs in ['dy/dt', 'dy/d(t)', 'd(y)/dt', 'd(y)/d(t)']:
-                lhs = 'Derivative(y(t), t)'
-            else:
-                raise ValueError("El lado izquierdo debe ser dx/dt o dy/dt")
+            # Procesar el lado izquierdo (derivada): dx/dt, d(x)/dt, dx1/d(t), ...
+            match = re.match(r'^d\(?([a-zA-Z_]\w*)\)?/d\(?t\)?$', lhs)
+            if not match or match.group(1) == 't':
+                raise ValueError("El lado izquierdo debe tener la forma dx/dt")
+            variable = match.group(1)
             
             # Procesar el lado derecho
             # Reemplazar comas por puntos en los números decimales
             rhs = re.sub(r'(\d),(\d)', r'\1.\2', rhs)
             
+            # Proteger las funciones conocidas con un marcador temporal
+            for func in self.FUNCIONES:
+                rhs = re.sub(fr'\b{func}\s*\(', f'__{func}__[', rhs)
+            
             # Agregar * entre número y variable (ej: 0.3x -> 0.3*x)
-            rhs = re.sub(r'(\d*\.?\d+)([a-zA-Z])', r'\1*\2', rhs)
+            rhs = re.sub(r'(?<![\w.])(\d*\.?\d+)([a-zA-Z_])', r'\1*\2', rhs)
             
             # Agregar * entre variable y variable (ej: x y -> x*y)
-            rhs = re.sub(r'([a-zA-Z])\s+([a-zA-Z])', r'\1*\2', rhs)
+            rhs = re.sub(r'(\w)\s+(?=[a-zA-Z_])', r'\1*', rhs)
             
             # Agregar * entre cierre de paréntesis y variable (ej: )x -> )*x)
             rhs = re.sub(r'(\))(\w)', r'\1*\2', rhs)
@@ -51,56 +58,104 @@ class DiffSystemOperations:
             rhs = re.sub(r'(\d*\.?\d+)(\()', r'\1*\2', rhs)
             
             # Agregar * entre variable y paréntesis (ej: x(y) -> x*(y))
-            rhs = re.sub(r'([a-zA-Z])(\()', r'\1*\2', rhs)
+            rhs = re.sub(r'([a-zA-Z_]\w*)(\()', r'\1*\2', rhs)
+            
+            # Restaurar las funciones protegidas
+            for func in self.FUNCIONES:
+                rhs = rhs.replace(f'__{func}__[', f'{func}(')
             
             # Manejar potencias
-            rhs = re.sub(r'(\w+)\s*\^\s*(\d+)', r'\1**\2', rhs)
+            rhs = rhs.replace('^', '**')
             
             # Eliminar espacios innecesarios
             rhs = rhs.replace(' ', '')
             
-            # Asegurar que las variables x e y estén en función de t
-            # Solo reemplazar x e y que no estén ya en función de t
-            rhs = re.sub(r'\bx\b(?!\()', 'x(t)', rhs)
-            rhs = re.sub(r'\by\b(?!\()', 'y(t)', rhs)
-            
-            # Construir la ecuación final en la forma dx/dt = f(x,y)
-            eq = f"{lhs}-({rhs})"
-            
-            return eq
+            return variable, rhs
         except Exception as e:
             logger.error(f"Error en preprocesamiento de ecuación: {str(e)}")
             raise ValueError(f"Error en formato de ecuación: {str(e)}")
     
-    def preparar_sistema(self, sistema_str: str) -> Tuple[sp.Matrix, sp.Matrix]:
+    def _separar_productos(self, rhs: str, conocidos) -> str:
+        """
+        Sustituye cada identificador desconocido que sea la concatenación de nombres
+        conocidos por su producto ("xy" -> "x*y", "x1x2" -> "x1*x2"). Los que no se
+        pueden descomponer se dejan igual, y parsear_sistema los informa como desconocidos.
+        """
+        def descomponer(palabra):
+            # partes[i]: descomposición de palabra[:i] en nombres conocidos, o None
+            partes = [[]] + [None] * len(palabra)
+            for fin in range(1, len(palabra) + 1):
+                for inicio in range(fin):
+                    if partes[inicio] is not None and palabra[inicio:fin] in conocidos:
+                        partes[fin] = partes[inicio] + [palabra[inicio:fin]]
+                        break
+            return partes[-1]
+
+        def sustituir(match):
+            palabra = match.group(0)
+            if palabra in conocidos or palabra in self.FUNCIONES or hasattr(sp, palabra):
+                return palabra
+            partes = descomponer(palabra)
+            return '*'.join(partes) if partes else palabra
+
+        return re.sub(r'[a-zA-Z_]\w*', sustituir, rhs)
+    
+    def parsear_sistema(self, sistema_str: str, parametros: List[str] = ()) -> Tuple[List[sp.Symbol], sp.Matrix]:
+        """
+        Convierte un sistema dx_i/dt = f_i(x_1, ..., x_n) en la lista de
+        variables (en el orden de las ecuaciones) y el vector de lados derechos.
+        
+        Los nombres en `parametros` se aceptan como símbolos libres.
+        """
         try:
-            # Convertir el string del sistema en ecuaciones
-            ecuaciones = sistema_str.strip().split('\n')
-            if len(ecuaciones) != 2:
-                raise ValueError("El sistema debe tener exactamente dos ecuaciones, una por línea.")
+            ecuaciones = [eq for eq in sistema_str.strip().split('\n') if eq.strip()]
+            if not ecuaciones:
+                raise ValueError("El sistema debe tener al menos una ecuación, una por línea.")
             
-            # Preprocesar ecuaciones
-            eq1 = self._preprocesar_ecuacion(ecuaciones[0])
-            eq2 = self._preprocesar_ecuacion(ecuaciones[1])
+            nombres = []
+            lados_derechos = []
+            for eq in ecuaciones:
+                variable, rhs = self._preprocesar_ecuacion(eq)
+                if variable in nombres:
+                    raise ValueError(f"La variable {variable} tiene más de una ecuación")
+                nombres.append(variable)
+                lados_derechos.append(rhs)
+            
+            # Productos escritos sin operador entre variables conocidas: 0.02xy -> 0.02*x*y
+            conocidos = set(nombres) | set(parametros) | {'t'}
+            lados_derechos = [self._separar_productos(rhs, conocidos) for rhs in lados_derechos]
+            
+            variables = [sp.Symbol(nombre) for nombre in nombres]
+            local_dict = {nombre: var for nombre, var in zip(nombres, variables)}
+            local_dict['t'] = self.t
+            simbolos_parametros = {sp.Symbol(nombre) for nombre in parametros}
+            local_dict.update({str(p): p for p in simbolos_parametros})
             
             # Parsear expresiones
             try:
-                eq1 = sp.parse_expr(eq1)
-                eq2 = sp.parse_expr(eq2)
+                rhs_exprs = [sp.parse_expr(rhs, local_dict=local_dict) for rhs in lados_derechos]
             except Exception as e:
                 raise ValueError(f"Error al parsear las ecuaciones: {str(e)}")
             
-            # Extraer coeficientes de x y y
-            A = sp.Matrix([
-                [-sp.diff(eq1, self.x), -sp.diff(eq1, self.y)],
-                [-sp.diff(eq2, self.x), -sp.diff(eq2, self.y)]
-            ])
+            desconocidas = set().union(*(expr.free_symbols for expr in rhs_exprs)) - set(variables) - simbolos_parametros
+            if desconocidas:
+                nombres_desc = ', '.join(sorted(str(s) for s in desconocidas))
+                raise ValueError(f"Símbolos sin ecuación en el sistema: {nombres_desc}")
+            
+            return variables, sp.Matrix(rhs_exprs)
+        except Exception as e:
+            logger.error(f"Error al parsear el sistema: {str(e)}")
+            raise ValueError(f"Error al parsear el sistema: {str(e)}")
+    
+    def preparar_sistema(self, sistema_str: str) -> Tuple[sp.Matrix, sp.Matrix]:
+        try:
+            variables, rhs = self.parsear_sistema(sistema_str)
+            
+            # Extraer coeficientes: A_ij = d f_i / d x_j
+            A = rhs.jacobian(variables)
             
             # Extraer términos independientes
-            b = sp.Matrix([
-                -eq1.subs({sp.diff(self.x, self.t): 0, sp.diff(self.y, self.t): 0}),
-                -eq2.subs({sp.diff(self.x, self.t): 0, sp.diff(self.y, self.t): 0})
-            ])
+            b = rhs.subs({var: 0 for var in variables})
             
             return A, b
             
@@ -108,225 +163,494 @@ class DiffSystemOperations:
             logger.error(f"Error al preparar el sistema: {str(e)}")
             raise ValueError(f"Error al preparar el sistema: {str(e)}")
     
-    def _convertir_a_complejo(self, expr):
+    def _exponencial_matriz(self, M: np.ndarray) -> np.ndarray:
+        """
+        Calcula e^M por escalado y cuadrado con aproximante de Padé (6, 6).
+        """
+        n = M.shape[0]
+        norma = np.linalg.norm(M, np.inf)
+        # Escalar para que ||M / 2^s|| <= 1/2
+        s = max(0, int(np.ceil(np.log2(norma))) + 1) if norma > 0 else 0
+        X = M / (2.0 ** s)
+        
+        q = 6
+        c = 1.0
+        identidad = np.eye(n)
+        potencia = identidad
+        N = identidad.copy()
+        D = identidad.copy()
+        for k in range(1, q + 1):
+            c = c * (q - k + 1) / (k * (2 * q - k + 1))
+            potencia = potencia @ X
+            N = N + c * potencia
+            D = D + ((-1) ** k) * c * potencia
+        E = np.linalg.solve(D, N)
+        
+        for _ in range(s):
+            E = E @ E
+        return E
+    
+    def _propagar_lineal(self, A: np.ndarray, b: np.ndarray, z0: np.ndarray, h: float, n_puntos: int) -> np.ndarray:
+        """
+        Evalúa la solución de dz/dt = A z + b en una malla uniforme de paso h.
+        
+        El propagador e^{Ah} y el término afín se obtienen una sola vez de la
+        exponencial de la matriz aumentada [[A, b], [0, 0]]; después cada paso
+        es un producto matriz-vector.
+        """
+        n = A.shape[0]
+        M = np.zeros((n + 1, n + 1))
+        M[:n, :n] = A
+        M[:n, n] = b
+        E = self._exponencial_matriz(M * h)
+        propagador = E[:n, :n]
+        termino_afin = E[:n, n]
+        
+        valores = np.empty((n_puntos, n))
+        valores[0] = z0
+        for k in range(1, n_puntos):
+            valores[k] = propagador @ valores[k - 1] + termino_afin
+        return valores
+    
+    def resolver_sistema_lineal(self, sistema_str: str, condiciones_iniciales: Dict[str, float], t_total: float, h: float) -> Tuple[np.ndarray, np.ndarray, List[str], Dict]:
+        """
+        Resuelve numéricamente un sistema lineal n x n dx_i/dt = sum_j a_ij x_j + b_i.
         
+        Las condiciones iniciales se indican como {'x1(0)': valor, ...}; las que
+        falten valen 0.
+        
+        Returns:
+            Tuple: (tiempos, valores con forma (len(tiempos), n), nombres de las variables, información)
+        """
         try:
-            # Evaluar la expresión simbólica numéricamente
-            expr_eval = sp.N(expr)
-            # Si es un número real simple
-            if isinstance(expr_eval, (sp.core.numbers.Float, sp.core.numbers.Integer)):
-                return complex(float(expr_eval), 0)
-            # Si es un número complejo de sympy
-            if isinstance(expr_eval, sp.core.numbers.ComplexInfinity):
-                raise ValueError("Complejo infinito no soportado")
-            # Si es una expresión con I o compleja
-            try:
-                valor = complex(expr_eval)
-                return valor
-            except Exception:
-                # Si falla, intentar extraer parte real e imaginaria
-                try:
-                    real = float(expr_eval.as_real_imag()[0])
-                    imag = float(expr_eval.as_real_imag()[1])
-                    return complex(real, imag)
-                except Exception:
-                    # Último intento: evaluar como float
-                    return complex(float(expr_eval))
+            if t_total <= 0 or h <= 0:
+                raise ValueError("El tiempo total y el paso deben ser positivos")
+            variables, rhs = self.parsear_sistema(sistema_str)
+            A, b = self.preparar_sistema(sistema_str)
+            if A.free_symbols:
+                raise ValueError("El sistema no es lineal con coeficientes constantes")
+            
+            nombres = [str(var) for var in variables]
+            A_num = np.array(A.evalf(), dtype=float)
+            b_num = np.array(b.evalf(), dtype=float).reshape(-1)
+            z0 = np.array([float(condiciones_iniciales.get(f"{nombre}(0)", 0)) for nombre in nombres])
+            
+            t_puntos = np.arange(0, t_total + h / 2, h)
+            valores = self._propagar_lineal(A_num, b_num, z0, h, len(t_puntos))
+            
+            info_adicional = {
+                'variables': nombres,
+                'matriz_sistema': str(A),
+                'vector_independiente': str(b),
+            }
+            return t_puntos, valores, nombres, info_adicional
         except Exception as e:
-            logger.error(f"Error al convertir expresión a complejo: {str(e)}")
-            raise ValueError(f"No se pudo convertir la expresión a número complejo: {expr}")
-
-    def calcular_valores_propios(self, A):
+            logger.error(f"Error al resolver el sistema lineal: {str(e)}")
+            raise ValueError(f"Error al resolver el sistema lineal: {str(e)}")
+    
+    def es_lineal(self, variables: List[sp.Symbol], rhs: sp.Matrix) -> bool:
+        """Indica si el sistema es lineal con coeficientes constantes y autónomo."""
+        if self.t in rhs.free_symbols:
+            return False
+        return not rhs.jacobian(variables).free_symbols
+    
+    def compilar_sistema(self, variables: List[sp.Symbol], rhs: sp.Matrix):
+        """
+        Compila el vector de lados derechos en una única función NumPy f(t, Z).
+        
+        Z tiene forma (n,) o (n, m) para evaluar m estados a la vez; el resultado
+        tiene la misma forma que Z.
+        """
+        f_lista = sp.lambdify((self.t, variables), list(rhs), 'numpy')
+        
+        def f(t, Z):
+            Z = np.asarray(Z, dtype=float)
+            componentes = f_lista(t, list(Z))
+            # Las componentes constantes se devuelven como escalares
+            return np.array([np.broadcast_to(c, Z.shape[1:]) for c in componentes], dtype=float)
+        
+        return f
+    
+    # Coeficientes de Dormand-Prince 5(4)
+    _DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+    _DP_A = [
+        [],
+        [1/5],
+        [3/40, 9/40],
+        [44/45, -56/15, 32/9],
+        [19372/6561, -25360/2187, 64448/6561, -212/729],
+        [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+        [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+    ]
+    _DP_B5 = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+    _DP_B4 = np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+    
+    def integrar_rk45(self, f, t_puntos: np.ndarray, z0: np.ndarray, rtol: float = 1e-6, atol: float = 1e-9, max_pasos: int = 100000) -> np.ndarray:
+        """
+        Integra dz/dt = f(t, z) con Runge-Kutta adaptativo de Dormand-Prince 5(4)
+        y devuelve la solución en los instantes t_puntos.
+        
+        z0 puede tener forma (n,) o (n, m); en el segundo caso las m trayectorias
+        avanzan juntas con el mismo paso, controlado por la peor de ellas.
+        
+        Returns:
+            np.ndarray: valores con forma (len(t_puntos),) + z0.shape
+        """
+        z = np.array(z0, dtype=float)
+        valores = np.empty((len(t_puntos),) + z.shape)
+        valores[0] = z
+        t = float(t_puntos[0])
+        paso = (t_puntos[-1] - t_puntos[0]) / 100 if len(t_puntos) > 1 else 0
+        pasos = 0
+        k1 = f(t, z)
+        
+        for i in range(1, len(t_puntos)):
+            t_objetivo = float(t_puntos[i])
+            while t < t_objetivo:
+                pasos += 1
+                if pasos > max_pasos:
+                    raise ValueError("Se superó el número máximo de pasos de integración")
+                paso = min(paso, t_objetivo - t)
+                
+                k = [k1]
+                for j in range(1, 7):
+                    incremento = sum(a * kj for a, kj in zip(self._DP_A[j], k))
+                    k.append(f(t + self._DP_C[j] * paso, z + paso * incremento))
+                z_nuevo = z + paso * sum(b * kj for b, kj in zip(self._DP_B5, k))
+                error = paso * sum((b5 - b4) * kj for b5, b4, kj in zip(self._DP_B5, self._DP_B4, k))
+                
+                escala = atol + rtol * np.maximum(np.abs(z), np.abs(z_nuevo))
+                norma = np.max(np.sqrt(np.mean((error / escala) ** 2, axis=0))) if error.size else 0.0
+                if not np.isfinite(norma):
+                    raise ValueError("La solución diverge durante la integración")
+                
+                if norma <= 1:
+                    t += paso
+                    z = z_nuevo
+                    # Propiedad FSAL: la última etapa es la primera del siguiente paso
+                    k1 = k[6]
+                factor = 0.9 * norma ** (-0.2) if norma > 0 else 5.0
+                paso *= min(5.0, max(0.2, factor))
+            valores[i] = z
+        
+        return valores
+    
+    def calcular_equilibrios(self, variables: List[sp.Symbol], rhs: sp.Matrix) -> List[Dict[str, float]]:
+        """
+        Busca los puntos de equilibrio reales (f(z) = 0) de un sistema polinómico.
+        """
+        if not all(expr.is_polynomial(*variables) for expr in rhs):
+            raise ValueError("Solo se calculan equilibrios de sistemas polinómicos")
+        soluciones = sp.solve(list(rhs), variables, dict=True)
+        equilibrios = []
+        for sol in soluciones:
+            try:
+                punto = [complex(sp.N(sol.get(var, var))) for var in variables]
+            except TypeError:
+                # Variedades de equilibrios (quedan variables libres)
+                continue
+            if all(abs(c.imag) < 1e-10 for c in punto):
+                equilibrios.append({str(var): round(c.real, 6) for var, c in zip(variables, punto)})
+        return equilibrios
+    
+    def linealizar(self, variables: List[sp.Symbol], rhs: sp.Matrix, punto: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve el jacobiano evaluado en el punto y sus valores propios.
+        """
+        J = rhs.jacobian(variables).subs({var: punto[str(var)] for var in variables})
+        J_num = np.array(J.evalf(), dtype=float)
+        return J_num, np.linalg.eigvals(J_num)
+    
+    def resolver_sistema_no_lineal(self, sistema_str: str, condiciones_iniciales: Dict[str, float], t_total: float, h: float) -> Tuple[np.ndarray, np.ndarray, List[str], Dict]:
+        """
+        Resuelve numéricamente un sistema no lineal (Lotka-Volterra, SIR, ...)
+        con RK45 adaptativo, e informa por separado los equilibrios y la
+        linealización en cada uno.
+        
+        Returns:
+            Tuple: (tiempos, valores con forma (len(tiempos), n), nombres de las variables, información)
+        """
         try:
-            # Obtener valores propios
-            valores_propios = A.eigenvals()
-            
-            # Convertir a lista y ordenar por parte real descendente
-            valores_propios_lista = []
-            for valor, _ in valores_propios.items():
-                try:
-                    # Convertir a número complejo
-                    valor_complejo = self._convertir_a_complejo(valor)
-                    
-                    # Redondear a 6 decimales
-                    valor_real = round(valor_complejo.real, 6)
-                    valor_imag = round(valor_complejo.imag, 6)
-                    
-                    # Si la parte imaginaria es muy pequeña, considerarla como 0
-                    if abs(valor_imag) < 1e-10:
-                        valores_propios_lista.append((valor_real, 0))
-                    else:
-                        valores_propios_lista.append((valor_real, valor_imag))
-                        
-                except Exception as e:
-                    logger.warning(f"Error al procesar valor propio {valor}: {str(e)}")
-                    continue
-            
-            # Ordenar por parte real descendente
-            valores_propios_lista.sort(key=lambda x: x[0], reverse=True)
-            
-            # Convertir a formato de string
-            valores_propios_str = []
-            for real, imag in valores_propios_lista:
-                if abs(imag) < 1e-10:
-                    valores_propios_str.append(f"λ = {real:.6f}")
-                else:
-                    signo = '+' if imag >= 0 else '-'
-                    valores_propios_str.append(f"λ = {real:.6f} {signo} {abs(imag):.6f}i")
-            
-            return valores_propios_str
+            if t_total <= 0 or h <= 0:
+                raise ValueError("El tiempo total y el paso deben ser positivos")
+            variables, rhs = self.parsear_sistema(sistema_str)
+            nombres = [str(var) for var in variables]
+            f = self.compilar_sistema(variables, rhs)
+            z0 = np.array([float(condiciones_iniciales.get(f"{nombre}(0)", 0)) for nombre in nombres])
             
+            t_puntos = np.arange(0, t_total + h / 2, h)
+            valores = self.integrar_rk45(f, t_puntos, z0)
+            
+            # Equilibrios y linealización (informativos, no afectan a la solución)
+            lineas_equilibrios = []
+            try:
+                equilibrios = self.calcular_equilibrios(variables, rhs)
+                for punto in equilibrios:
+                    _, vals = self.linealizar(variables, rhs, punto)
+                    coords = ", ".join(f"{nombre} = {punto[nombre]}" for nombre in nombres)
+                    vals_str = ", ".join(self._formatear_complejo(v) for v in vals)
+                    lineas_equilibrios.append(
+                        f"({coords})\n  λ: {vals_str}\n  {self.analizar_estabilidad(list(vals))}"
+                    )
+                if not lineas_equilibrios:
+                    lineas_equilibrios.append("No se encontraron equilibrios aislados")
+            except Exception as eq_err:
+                logger.warning(f"No se pudieron calcular los equilibrios: {str(eq_err)}")
+                lineas_equilibrios.append(f"No se pudieron calcular los equilibrios: {str(eq_err)}")
+            
+            info_adicional = {
+                'variables': nombres,
+                'sistema': str(rhs),
+                'jacobiano': str(rhs.jacobian(variables)),
+                'equilibrios': "\n".join(lineas_equilibrios),
+            }
+            return t_puntos, valores, nombres, info_adicional
+        except Exception as e:
+            logger.error(f"Error al resolver el sistema no lineal: {str(e)}")
+            raise ValueError(f"Error al resolver el sistema no lineal: {str(e)}")
+    
+    def _compilar_cacheado(self, sistema_str: str):
+        """Parsea y compila el sistema una sola vez por texto de entrada."""
+        clave = "\n".join(eq.replace(' ', '') for eq in sistema_str.strip().split('\n') if eq.strip())
+        if clave not in self._cache_compilados:
+            if len(self._cache_compilados) >= self.MAX_CACHE:
+                self._cache_compilados.pop(next(iter(self._cache_compilados)))
+            variables, rhs = self.parsear_sistema(sistema_str)
+            self._cache_compilados[clave] = (clave, variables, self.compilar_sistema(variables, rhs))
+        return self._cache_compilados[clave]
+    
+    def campo_direcciones(self, sistema_str: str, x_rango: Tuple[float, float], y_rango: Tuple[float, float], n: int = 20) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Evalúa el campo de direcciones de un sistema 2D autónomo sobre una malla
+        n x n en una sola llamada a la función compilada.
+        
+        Returns:
+            Tuple: (X, Y, U, V) listos para plt.quiver o plt.streamplot
+        """
+        try:
+            clave_sistema, variables, f = self._compilar_cacheado(sistema_str)
+            if len(variables) != 2:
+                raise ValueError("El campo de direcciones requiere un sistema de dos ecuaciones")
+            clave = (clave_sistema, tuple(x_rango), tuple(y_rango), n)
+            if clave not in self._cache_campos:
+                if len(self._cache_campos) >= self.MAX_CACHE:
+                    self._cache_campos.pop(next(iter(self._cache_campos)))
+                X, Y = np.meshgrid(np.linspace(x_rango[0], x_rango[1], n), np.linspace(y_rango[0], y_rango[1], n))
+                U, V = f(0.0, np.array([X, Y]))
+                self._cache_campos[clave] = (X, Y, U, V)
+            return self._cache_campos[clave]
         except Exception as e:
-            logger.error(f"Error al calcular valores propios: {str(e)}")
-            raise ValueError(f"Error al calcular valores propios: {str(e)}")
+            logger.error(f"Error al calcular el campo de direcciones: {str(e)}")
+            raise ValueError(f"Error al calcular el campo de direcciones: {str(e)}")
     
-    def calcular_vectores_propios(self, A: sp.Matrix) -> List[Tuple[str, int, List[List[complex]]]]:
+    def trayectorias_fase(self, sistema_str: str, semillas: np.ndarray, t_total: float, h: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Integra a la vez las trayectorias que parten de cada semilla.
+        
+        Args:
+            semillas: array (m, n) con un estado inicial por fila
+            
+        Returns:
+            Tuple: (tiempos, valores con forma (len(tiempos), n, m))
+        """
         try:
-            eigenvects = A.eigenvects()
-            vectores_propios_formateados = []
-            for valor_propio, multiplicidad, vectores in eigenvects:
-                try:
-                    vectores_numericos = []
-                    for v in vectores:
-                        v_num = []
-                        for comp in v:
-                            try:
-                                comp_complejo = self._convertir_a_complejo(comp)
-                                comp_real = round(comp_complejo.real, 6)
-                                comp_imag = round(comp_complejo.imag, 6)
-                                if abs(comp_imag) < 1e-10:
-                                    v_num.append(comp_real)
-                                else:
-                                    v_num.append(complex(comp_real, comp_imag))
-                            except Exception as e:
-                                logger.warning(f"Error al procesar componente {comp}: {str(e)}")
-                                continue
-                        if len(v_num) == 2:
-                            vectores_numericos.append(v_num)
-                    valor_complejo = self._convertir_a_complejo(valor_propio)
-                    valor_real = round(valor_complejo.real, 6)
-                    valor_imag = round(valor_complejo.imag, 6)
-                    if abs(valor_imag) < 1e-10:
-                        valor_str = f"{valor_real:.6f}"
-                    else:
-                        signo = '+' if valor_imag >= 0 else '-'
-                        valor_str = f"{valor_real:.6f} {signo} {abs(valor_imag):.6f}i"
-                    if vectores_numericos:
-                        vectores_propios_formateados.append((valor_str, multiplicidad, vectores_numericos))
-                except Exception as e:
-                    logger.warning(f"Error al procesar vector propio para valor {valor_propio}: {str(e)}")
-                    continue
-            if not vectores_propios_formateados:
-                raise ValueError("No se pudieron procesar los vectores propios")
-            return vectores_propios_formateados
+            if t_total <= 0 or h <= 0:
+                raise ValueError("El tiempo total y el paso deben ser positivos")
+            _, variables, f = self._compilar_cacheado(sistema_str)
+            semillas = np.atleast_2d(np.asarray(semillas, dtype=float))
+            if semillas.shape[1] != len(variables):
+                raise ValueError(f"Cada semilla debe tener {len(variables)} componentes")
+            t_puntos = np.arange(0, t_total + h / 2, h)
+            # Todas las semillas forman un único estado (n, m)
+            return t_puntos, self.integrar_rk45(f, t_puntos, semillas.T)
         except Exception as e:
-            logger.error(f"Error al calcular vectores propios: {str(e)}")
-            raise ValueError(f"Error al calcular vectores propios: {str(e)}")
+            logger.error(f"Error al integrar las trayectorias: {str(e)}")
+            raise ValueError(f"Error al integrar las trayectorias: {str(e)}")
+    
+    def _formatear_complejo(self, valor: complex) -> str:
+        valor = complex(valor)
+        if abs(valor.imag) < 1e-10:
+            return f"{valor.real:.6f}"
+        signo = '+' if valor.imag >= 0 else '-'
+        return f"{valor.real:.6f} {signo} {abs(valor.imag):.6f}i"
     
     def resolver_sistema(self, sistema_str: str, condiciones_iniciales: Dict[str, float], t_total: float, h: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict]:
         try:
             if t_total <= 0 or h <= 0:
                 raise ValueError("El tiempo total y el paso deben ser positivos")
+            variables, rhs = self.parsear_sistema(sistema_str)
+            if len(variables) != 2:
+                raise ValueError("El sistema debe tener exactamente dos ecuaciones, una por línea.")
+            # Columnas de x e y: las de los valores siguen el orden en que se escribieron las ecuaciones
+            nombres = [str(var) for var in variables]
+            ix, iy = (nombres.index('x'), nombres.index('y')) if {'x', 'y'} <= set(nombres) else (0, 1)
+            if not self.es_lineal(variables, rhs):
+                # Los sistemas no lineales no se pueden resolver por valores propios
+                t_puntos, valores, _, info_adicional = self.resolver_sistema_no_lineal(sistema_str, condiciones_iniciales, t_total, h)
+                return t_puntos, np.round(valores[:, ix], 6), np.round(valores[:, iy], 6), info_adicional
             A, b = self.preparar_sistema(sistema_str)
-            valores_propios = self.calcular_valores_propios(A)
-            vectores_propios = self.calcular_vectores_propios(A)
-            lambda1_str = valores_propios[0].split('=')[1].strip()
-            lambda2_str = valores_propios[1].split('=')[1].strip()
-            # Convertir a números complejos si es necesario
-            def parse_lambda(lstr):
-                lstr = lstr.replace(' ', '')
-                if 'i' in lstr:
-                    lstr = lstr.replace('i','j')
-                    # Reemplazar +j o -j por +1j o -1j
-                    lstr = re.sub(r'([+-])j', r'\g<1>1j', lstr)
-                    lstr = re.sub(r'^j', '1j', lstr)
-                    lstr = re.sub(r'^-j', '-1j', lstr)
-                    # Usar regex para extraer partes real e imaginaria
-                    match = re.match(r'^([+-]?\d*\.?\d+)([+-]\d*\.?\d+)j$', lstr)
-                    if match:
-                        real = float(match.group(1))
-                        imag = float(match.group(2))
-                        return complex(real, imag)
-                    # Caso puramente imaginario
-                    match_imag = re.match(r'^([+-]?\d*\.?\d+)j$', lstr)
-                    if match_imag:
-                        return complex(0, float(match_imag.group(1)))
-                    # Caso puramente real
-                    match_real = re.match(r'^([+-]?\d*\.?\d+)$', lstr)
-                    if match_real:
-                        return float(match_real.group(1))
-                    # Último intento
-                    try:
-                        return complex(lstr)
-                    except Exception as e:
-                        logger.error(f"parse_lambda: string no reconocido: {lstr}")
-                        raise
-                else:
-                    return float(lstr)
-            lambda1 = parse_lambda(lambda1_str)
-            lambda2 = parse_lambda(lambda2_str)
-            # Obtener y normalizar los vectores propios (ahora como números)
-            v1 = vectores_propios[0][2][0]
-            v2 = vectores_propios[1][2][0]
-            v1_arr = np.array([complex(x) for x in v1])
-            v2_arr = np.array([complex(x) for x in v2])
-            v1_norm = v1_arr / np.linalg.norm(v1_arr)
-            v2_norm = v2_arr / np.linalg.norm(v2_arr)
-            C1, C2 = sp.symbols('C1 C2')
+            A_num = np.array(A.evalf(), dtype=float)
+            b_num = np.array(b.evalf(), dtype=float).reshape(-1)
+            
+            # Valores y vectores propios en forma cerrada a partir de traza y determinante
+            analisis = self.analisis_2x2(A_num)
+            lambda1, lambda2 = analisis['valores_propios']
+            v1, v2 = analisis['vectores_propios']
+            
+            z0 = np.array([float(condiciones_iniciales.get(f"{v}(0)", 0)) for v in variables])
+            # Evaluar en lote con el propagador e^{Ah} del resolvedor lineal general
+            t_puntos, valores, _, _ = self.resolver_sistema_lineal(sistema_str, condiciones_iniciales, t_total, h)
+            x_valores = np.round(valores[:, ix], 6)
+            y_valores = np.round(valores[:, iy], 6)
+            
+            # Solución general C1 v1 e^{λ1 t} + C2 v2 e^{λ2 t} + z_p (solo para mostrar)
             t = sp.Symbol('t')
-            x_sol = C1 * v1_norm[0] * sp.exp(lambda1 * t) + C2 * v2_norm[0] * sp.exp(lambda2 * t)
-            y_sol = C1 * v1_norm[1] * sp.exp(lambda1 * t) + C2 * v2_norm[1] * sp.exp(lambda2 * t)
-            x0 = condiciones_iniciales.get('x(0)', 0)
-            y0 = condiciones_iniciales.get('y(0)', 0)
-            const_sols = sp.solve([
-                x_sol.subs(t, 0) - x0,
-                y_sol.subs(t, 0) - y0
-            ], [C1, C2])
-            if const_sols is False or const_sols is None:
-                raise ValueError("No se pudieron determinar las constantes de integración.")
-            t_puntos = np.arange(0, t_total + h, h)
-            try:
-                x_sol_final = sp.lambdify(t, x_sol.subs(const_sols), 'numpy')
-                y_sol_final = sp.lambdify(t, y_sol.subs(const_sols), 'numpy')
-                x_valores = x_sol_final(t_puntos)
-                y_valores = y_sol_final(t_puntos)
-                if np.any(np.iscomplex(x_valores)):
-                    x_valores = np.real(x_valores)
-                if np.any(np.iscomplex(y_valores)):
-                    y_valores = np.real(y_valores)
-                x_valores = np.round(x_valores, 6)
-                y_valores = np.round(y_valores, 6)
-            except Exception as eval_err:
-                logger.error(f"Error al evaluar la solución: {str(eval_err)}")
-                raise ValueError(f"Error al evaluar la solución: {str(eval_err)}")
-            if x_valores is None or y_valores is None:
-                raise ValueError("La solución no pudo ser evaluada numéricamente.")
+            V = np.column_stack([v1, v2])
+            if abs(analisis['determinante']) > 1e-12:
+                z_p = -np.linalg.solve(A_num, b_num)
+            else:
+                z_p = np.zeros(2)
+            if abs(np.linalg.det(V)) > 1e-10:
+                C1, C2 = np.linalg.solve(V, (z0 - z_p).astype(complex))
+                x_sol = C1 * v1[ix] * sp.exp(lambda1 * t) + C2 * v2[ix] * sp.exp(lambda2 * t) + z_p[ix]
+                y_sol = C1 * v1[iy] * sp.exp(lambda1 * t) + C2 * v2[iy] * sp.exp(lambda2 * t) + z_p[iy]
+                solucion_x, solucion_y = str(x_sol), str(y_sol)
+            else:
+                solucion_x = solucion_y = "Matriz no diagonalizable: solución evaluada con e^(At)"
+            
             # Formatear la información de valores y vectores propios
-            info_valores_propios = "\n".join(valores_propios)
+            info_valores_propios = "\n".join(f"λ = {self._formatear_complejo(l)}" for l in (lambda1, lambda2))
             # Formatear los vectores propios para mostrar
             def format_vector(v):
-                return f"[{v[0]}, {v[1]}]"
+                return f"[{self._formatear_complejo(v[ix])}, {self._formatear_complejo(v[iy])}]"
             info_vectores_propios = "\n".join([
-                f"Para {v[0]}:\n" + "\n".join([f"  Vector: {format_vector(vec)}" for vec in v[2]])
-                for v in vectores_propios
+                f"Para {self._formatear_complejo(l)}:\n  Vector: {format_vector(v)}"
+                for l, v in ((lambda1, v1), (lambda2, v2))
             ])
             info_adicional = {
                 'matriz_sistema': str(A),
                 'vector_independiente': str(b),
                 'valores_propios': info_valores_propios,
                 'vectores_propios': info_vectores_propios,
-                'solucion_x': str(x_sol.subs(const_sols)),
-                'solucion_y': str(y_sol.subs(const_sols))
+                'clasificacion': analisis['clasificacion'],
+                'solucion_x': solucion_x,
+                'solucion_y': solucion_y
             }
             return t_puntos, x_valores, y_valores, info_adicional
         except Exception as e:
             logger.error(f"Error al resolver el sistema: {str(e)}")
             raise ValueError(f"Error al resolver el sistema: {str(e)}")
     
+    # Tipos de punto de equilibrio según el plano traza-determinante
+    CLASIFICACIONES = [
+        "Punto silla",
+        "Nodo estable",
+        "Nodo inestable",
+        "Espiral estable",
+        "Espiral inestable",
+        "Centro",
+        "Nodo degenerado estable",
+        "Nodo degenerado inestable",
+        "Degenerado (det = 0)",
+    ]
+    
+    def clasificar_traza_determinante(self, traza, determinante, tol: float = 1e-12) -> np.ndarray:
+        """
+        Clasifica (vectorizado) sistemas 2x2 a partir de su traza y determinante.
+        
+        Returns:
+            np.ndarray: índices en CLASIFICACIONES, con la forma de las entradas
+        """
+        traza = np.asarray(traza, dtype=float)
+        determinante = np.asarray(determinante, dtype=float)
+        discriminante = traza ** 2 - 4 * determinante
+        escala = tol * np.maximum(1.0, np.maximum(traza ** 2, np.abs(determinante)))
+        
+        condiciones = [
+            determinante < -escala,
+            np.abs(determinante) <= escala,
+            (discriminante > escala) & (traza < 0),
+            discriminante > escala,
+            (np.abs(discriminante) <= escala) & (traza < 0),
+            np.abs(discriminante) <= escala,
+            np.abs(traza) <= np.sqrt(escala),
+            traza < 0,
+        ]
+        codigos = [0, 8, 1, 2, 6, 7, 5, 3]
+        return np.select(condiciones, codigos, default=4)
+    
+    def analisis_2x2(self, A: np.ndarray) -> Dict:
+        """
+        Valores y vectores propios de una matriz real 2x2 en forma cerrada.
+        
+        Usa λ = (tr ± sqrt(tr² - 4 det)) / 2, calculando la raíz de menor módulo
+        como det / λ1 para evitar cancelación.
+        """
+        a, b_, c, d = np.asarray(A, dtype=float).ravel()
+        traza = a + d
+        determinante = a * d - b_ * c
+        discriminante = traza * traza - 4 * determinante
+        
+        if discriminante >= 0:
+            raiz = np.sqrt(discriminante)
+            lambda1 = (traza + np.copysign(raiz, traza)) / 2
+            lambda2 = determinante / lambda1 if lambda1 != 0 else traza - lambda1
+            valores = sorted([lambda1, lambda2], reverse=True)
+        else:
+            raiz = np.sqrt(-discriminante)
+            valores = [complex(traza / 2, raiz / 2), complex(traza / 2, -raiz / 2)]
+        
+        vectores = []
+        for i, lam in enumerate(valores):
+            # (A - λI) v = 0: cualquiera de las dos filas da un vector del núcleo
+            candidatos = [np.array([b_, lam - a]), np.array([lam - d, c])]
+            v = max(candidatos, key=lambda u: np.linalg.norm(u))
+            if np.linalg.norm(v) < 1e-12 * max(1.0, abs(traza)):
+                # A = λI: todo vector es propio
+                v = np.eye(2)[i]
+            vectores.append(v / np.linalg.norm(v))
+        
+        codigo = int(self.clasificar_traza_determinante(traza, determinante))
+        return {
+            'traza': traza,
+            'determinante': determinante,
+            'discriminante': discriminante,
+            'valores_propios': valores,
+            'vectores_propios': vectores,
+            'clasificacion': self.CLASIFICACIONES[codigo],
+        }
+    
+    def barrido_traza_determinante(self, sistema_str: str, parametro: str, valores: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Evalúa traza, determinante y clasificación de un sistema lineal 2x2 que
+        depende de un parámetro, para todos los valores del parámetro a la vez.
+        """
+        try:
+            variables, rhs = self.parsear_sistema(sistema_str, parametros=[parametro])
+            if len(variables) != 2:
+                raise ValueError("El barrido requiere un sistema de dos ecuaciones")
+            p = sp.Symbol(parametro)
+            A = rhs.jacobian(variables)
+            if A.free_symbols - {p}:
+                raise ValueError("El sistema no es lineal en las variables")
+            
+            valores = np.asarray(valores, dtype=float)
+            f = sp.lambdify(p, [A.trace(), A.det()], 'numpy')
+            traza, determinante = (np.broadcast_to(v, valores.shape).astype(float) for v in f(valores))
+            return {
+                'parametro': valores,
+                'traza': traza,
+                'determinante': determinante,
+                'clasificacion': self.clasificar_traza_determinante(traza, determinante),
+            }
+        except Exception as e:
+            logger.error(f"Error en el barrido de parámetros: {str(e)}")
+            raise ValueError(f"Error en el barrido de parámetros: {str(e)}")
+    
     def analizar_estabilidad(self, valores_propios: List[sp.Expr]) -> str:
         try:
             # Convertir valores propios a números complejos
-            vals = [complex(str(v)) for v in valores_propios]
+            vals = [complex(v) for v in valores_propios]
             
             # Analizar estabilidad
             if all(v.real < 0 for v in vals):
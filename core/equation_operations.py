@@ -1,11 +1,134 @@
+import re
 import sympy as sp
 import numpy as np
+from fractions import Fraction
+from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application, convert_xor
+from core.number_parser import parse_numbers, parse_table
+from core.matrix_operations import LUFactorization, MatrixOperations
 
 class EquationOperations:
     def __init__(self):
         self.x = sp.symbols("x")
         self.y = sp.symbols("y")
+        self.matrix_ops = MatrixOperations()
         
+    # Número de coeficientes por fila de cada tipo de ecuación en solve_batch
+    BATCH_COLUMNS = {"Lineal": 2, "Cuadrática": 3, "Sistema 2x2": 6}
+    # Por encima de este número de condición el sistema 2x2 se trata como singular
+    COND_LIMIT = 1 / np.finfo(float).eps
+    # Un discriminante menor que esta fracción de b² + 4|ac| (coeficientes escalados)
+    # es error de redondeo: la cuadrática tiene una raíz doble
+    DOUBLE_ROOT_TOL = 8 * np.finfo(float).eps
+    # Hasta este grado las raíces se calculan como valores propios de la matriz compañera;
+    # por encima se usa Aberth-Ehrlich, O(n²) por iteración en lugar de O(n³)
+    COMPANION_MAX_DEGREE = 80
+    ABERTH_MAX_ITER = 500
+    POLISH_STEPS = 3
+    # Multiplicación implícita ("2x", "3sin(x)") y ^ como potencia
+    TRANSFORMATIONS = standard_transformations + (implicit_multiplication_application, convert_xor)
+    # Puntos de la malla donde se buscan cambios de signo y tolerancia de Brent
+    ROOT_GRID_POINTS = 10000
+    ROOT_XTOL = 1e-14
+    ROOT_MAX_ITER = 100
+    # Pasos máximos de refinamiento iterativo en sistemas lineales
+    REFINEMENT_STEPS = 5
+    # Newton amortiguado para sistemas no lineales: puntos de partida, iteraciones,
+    # tolerancia del residuo y distancia por debajo de la cual dos raíces son la misma
+    NEWTON_STARTS = 100
+    NEWTON_MAX_ITER = 50
+    NEWTON_FTOL = 1e-12
+    ROOT_MERGE_TOL = 1e-6
+
+    def solve_linear_batch(self, a, b):
+        """
+        Resuelve a x + b = 0 para arrays de coeficientes.
+
+        Devuelve x con NaN donde a == 0 (sin solución o infinitas soluciones).
+        """
+        a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+        return np.divide(-b, a, out=np.full(a.shape, np.nan), where=a != 0)
+
+    def solve_quadratic_batch(self, a, b, c):
+        """
+        Raíces de a x² + b x + c = 0 para arrays de coeficientes; devuelve (N, 2) complejo.
+
+        Con raíces reales se usa q = -(b + signo(b) √Δ) / 2 y x₁ = q / a, x₂ = c / q,
+        que evita restar cantidades parecidas cuando b² ≫ 4ac. Cada fila se
+        divide antes por la potencia de dos más cercana a max(|a|, |b|, |c|), lo
+        que no cambia las raíces ni redondea los coeficientes, pero evita que Δ
+        desborde o se anule con coeficientes como (1, 1e200, 1). Las raíces reales
+        salen ordenadas de menor a mayor y las complejas con la parte imaginaria
+        negativa primero; si a == 0 la segunda raíz es NaN.
+        """
+        a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c)))
+        roots = np.full(a.shape + (2,), np.nan, dtype=complex)
+        quadratic = a != 0
+        _, exponent = np.frexp(np.maximum(np.maximum(np.abs(a), np.abs(b)), np.abs(c)))
+        a, b, c = (np.ldexp(v, -exponent) for v in (a, b, c))
+        with np.errstate(divide='ignore', invalid='ignore', under='ignore'):
+            disc = b * b - 4 * a * c
+            real = quadratic & (disc >= 0)
+            sign = np.where(b >= 0, 1.0, -1.0)
+            q = -0.5 * (b + sign * np.sqrt(np.where(real, disc, 0.0)))
+            x1 = q / a
+            # q == 0 solo si b == 0 y Δ == 0, es decir, raíz doble en 0
+            x2 = np.where(q != 0, c / q, 0.0)
+            roots[real, 0] = np.minimum(x1, x2)[real]
+            roots[real, 1] = np.maximum(x1, x2)[real]
+            complex_roots = quadratic & (disc < 0)
+            # + 0.0 evita mostrar -0 como parte real
+            re = -b / (2 * a) + 0.0
+            im = np.sqrt(-disc) / (2 * np.abs(a))
+            roots[complex_roots, 0] = (re - 1j * im)[complex_roots]
+            roots[complex_roots, 1] = (re + 1j * im)[complex_roots]
+            roots[~quadratic, 0] = self.solve_linear_batch(b, c)[~quadratic]
+        return roots
+
+    def solve_system_2x2_batch(self, a1, b1, c1, a2, b2, c2):
+        """
+        Regla de Cramer para arrays de sistemas a₁x + b₁y = c₁, a₂x + b₂y = c₂.
+
+        Devuelve (soluciones (N, 2), números de condición (N,)). El número de
+        condición en norma 1 de una matriz 2x2 es ‖A‖₁‖A‖∞ / |det A|; los
+        sistemas con condición mayor que COND_LIMIT tienen solución NaN.
+        """
+        a1, b1, c1, a2, b2, c2 = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a1, b1, c1, a2, b2, c2)))
+        det = a1 * b2 - a2 * b1
+        norm_1 = np.maximum(np.abs(a1) + np.abs(a2), np.abs(b1) + np.abs(b2))
+        norm_inf = np.maximum(np.abs(a1) + np.abs(b1), np.abs(a2) + np.abs(b2))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cond = np.where(det != 0, norm_1 * norm_inf / np.abs(det), np.inf)
+            solvable = cond <= self.COND_LIMIT
+            x = np.where(solvable, (c1 * b2 - c2 * b1) / det + 0.0, np.nan)
+            y = np.where(solvable, (a1 * c2 - a2 * c1) / det + 0.0, np.nan)
+        return np.stack([x, y], axis=-1), cond
+
+    def solve_batch(self, eq_type, coefficients):
+        """
+        Resuelve una ecuación por fila de un array de coeficientes (p. ej. leído de un CSV).
+
+        Las columnas son (a, b) para "Lineal", (a, b, c) para "Cuadrática" y
+        (a₁, b₁, c₁, a₂, b₂, c₂) para "Sistema 2x2". Devuelve un array real con
+        una fila por ecuación: x; Re x₁, Im x₁, Re x₂, Im x₂; o x, y, condición.
+        """
+        try:
+            coefficients = np.atleast_2d(np.asarray(coefficients, dtype=float))
+            n_cols = self.BATCH_COLUMNS.get(eq_type)
+            if n_cols is None:
+                raise ValueError(f"Tipo de ecuación desconocido: {eq_type}")
+            if coefficients.shape[1] != n_cols:
+                raise ValueError(f"Se esperaban {n_cols} coeficientes por fila y hay {coefficients.shape[1]}")
+            columns = coefficients.T
+            if eq_type == "Lineal":
+                return self.solve_linear_batch(*columns)[:, np.newaxis]
+            if eq_type == "Cuadrática":
+                roots = self.solve_quadratic_batch(*columns)
+                return np.column_stack([roots[:, 0].real, roots[:, 0].imag, roots[:, 1].real, roots[:, 1].imag])
+            solutions, cond = self.solve_system_2x2_batch(*columns)
+            return np.column_stack([solutions, cond])
+        except Exception as e:
+            raise ValueError(f"Error al resolver las ecuaciones: {str(e)}")
+
     def solve_linear_equation(self, a, b):
         try:
             if a == 0:
@@ -13,10 +136,7 @@ class EquationOperations:
                     return ["Infinitas soluciones"]
                 else:
                     return ["Sin solución"]
-            
-            eq = sp.Eq(a * self.x + b, 0)
-            sols = sp.solve(eq, self.x)
-            return [float(sol) for sol in sols]
+            return [float(self.solve_linear_batch(a, b))]
         except Exception as e:
             raise ValueError(f"Error al resolver la ecuación: {str(e)}")
     
@@ -25,17 +145,24 @@ class EquationOperations:
             if a == 0:
                 return self.solve_linear_equation(b, c)
                 
-            eq = sp.Eq(a * self.x**2 + b * self.x + c, 0)
-            sols = sp.solve(eq, self.x)
+            # Una raíz doble se devuelve una sola vez; se decide con el discriminante de
+            # los coeficientes escalados, ya que las dos raíces calculadas pueden no coincidir
+            scale = max(abs(a), abs(b), abs(c))
+            a_s, b_s, c_s = a / scale, b / scale, c / scale
+            disc = b_s * b_s - 4 * a_s * c_s
+            if abs(disc) <= self.DOUBLE_ROOT_TOL * (b_s * b_s + 4 * abs(a_s * c_s)):
+                roots = np.array([-b_s / (2 * a_s) + 0.0], dtype=complex)
+            else:
+                roots = self.solve_quadratic_batch(a, b, c)
             
             # Convertir a formato complejo si es necesario
             result = []
-            for sol in sols:
-                if sp.im(sol) == 0:
-                    result.append(float(sol))
+            for sol in roots:
+                if sol.imag == 0:
+                    result.append(float(sol.real))
                 else:
-                    real = float(sp.re(sol))
-                    imag = float(sp.im(sol))
+                    real = float(sol.real)
+                    imag = float(sol.imag)
                     # Formatear complejos como "a+bi" o "a-bi"
                     if imag >= 0:
                         result.append(f"{real:.4f}+{imag:.4f}i")
@@ -46,23 +173,767 @@ class EquationOperations:
         except Exception as e:
             raise ValueError(f"Error al resolver la ecuación: {str(e)}")
     
+    def exact_roots(self, eq_type, *coeffs):
+        """Soluciones exactas (radicales) en LaTeX con SymPy; solo para mostrarlas."""
+        try:
+            coeffs = [sp.nsimplify(c, rational=True) for c in coeffs]
+            if eq_type == "Sistema 2x2":
+                a1, b1, c1, a2, b2, c2 = coeffs
+                sols = sp.solve((sp.Eq(a1 * self.x + b1 * self.y, c1), sp.Eq(a2 * self.x + b2 * self.y, c2)), (self.x, self.y))
+                if not sols:
+                    return []
+                return [f"x = {sp.latex(sols[self.x])}, y = {sp.latex(sols[self.y])}"]
+            if eq_type == "Cuadrática":
+                a, b, c = coeffs
+                poly = a * self.x**2 + b * self.x + c
+            else:
+                a, b = coeffs
+                poly = a * self.x + b
+            return [sp.latex(sol) for sol in sp.solve(sp.Eq(poly, 0), self.x)]
+        except Exception as e:
+            raise ValueError(f"Error al calcular las soluciones exactas: {str(e)}")
+    
     def solve_system_2x2(self, a1, b1, c1, a2, b2, c2):
         try:
-            eq1 = sp.Eq(a1 * self.x + b1 * self.y, c1)
-            eq2 = sp.Eq(a2 * self.x + b2 * self.y, c2)
-            
-            sols = sp.solve((eq1, eq2), (self.x, self.y))
+            solution, cond = self.solve_system_2x2_batch(a1, b1, c1, a2, b2, c2)
             
-            if not sols:
+            if not np.all(np.isfinite(solution)):
                 return "Sin solución o infinitas soluciones"
             
-            x_val = float(sols[self.x])
-            y_val = float(sols[self.y])
+            x_val = float(solution[0])
+            y_val = float(solution[1])
             
-            return {"x": x_val, "y": y_val}
+            return {"x": x_val, "y": y_val, "cond": float(cond)}
         except Exception as e:
             raise ValueError(f"Error al resolver el sistema: {str(e)}")
     
+    def parse_equation(self, equation_str, variables=None):
+        """
+        Convierte "lhs = rhs" (o solo "lhs") en la expresión lhs - rhs, que se iguala a 0.
+        
+        Solo se admiten las variables indicadas (por defecto x); e y pi son las constantes.
+        """
+        variables = tuple(variables) if variables else (self.x,)
+        local_dict = {str(v): v for v in variables}
+        local_dict['e'] = sp.E
+        try:
+            sides = equation_str.split('=')
+            if len(sides) > 2:
+                raise ValueError("La ecuación solo puede tener un signo '='")
+            exprs = [parse_expr(side, local_dict=local_dict, transformations=self.TRANSFORMATIONS) for side in sides]
+        except Exception as e:
+            raise ValueError(f"Error al parsear la ecuación: {str(e)}")
+        expr = exprs[0] - exprs[1] if len(exprs) == 2 else exprs[0]
+        unknown = expr.free_symbols - set(variables)
+        if unknown:
+            raise ValueError(f"Símbolos desconocidos: {', '.join(sorted(str(u) for u in unknown))}")
+        return expr
+
+    def parse_polynomial(self, poly_input):
+        """
+        Coeficientes (de mayor a menor grado) de un polinomio en x.
+        
+        Acepta una lista de coeficientes ("1, 0, -2, 1") o una expresión
+        ("x^3 - 2x + 1", con multiplicación implícita y ^ como potencia).
+        """
+        if not isinstance(poly_input, str):
+            coeffs = np.asarray(poly_input)
+            coeffs = coeffs.astype(complex if np.iscomplexobj(coeffs) else float)
+        else:
+            try:
+                coeffs = parse_numbers(poly_input)
+            except ValueError:
+                coeffs = None
+            if coeffs is None:
+                try:
+                    poly = sp.Poly(sp.expand(self.parse_equation(poly_input)), self.x)
+                except Exception as e:
+                    raise ValueError(f"Error al parsear el polinomio: {str(e)}")
+                coeffs = np.array([complex(c) for c in poly.all_coeffs()])
+                if not np.any(coeffs.imag):
+                    coeffs = coeffs.real
+        coeffs = np.trim_zeros(np.atleast_1d(coeffs), 'f')
+        if coeffs.size == 0 or not np.all(np.isfinite(coeffs)):
+            raise ValueError("El polinomio no tiene coeficientes válidos")
+        return coeffs
+
+    def _reverse_horner(self, coeffs, z):
+        """
+        Evalúa p/p', el número de condición y el error hacia atrás en cada z.
+        
+        Para |z| > 1 se evalúa el polinomio invertido en 1/z, así que no hay
+        desbordamiento ni para grados de cientos.
+        """
+        n = len(coeffs) - 1
+        z = np.asarray(z, dtype=complex)
+        outer = np.abs(z) > 1
+        w = np.where(outer, 1 / np.where(outer, z, 1), z)
+        p = np.zeros_like(w)
+        dp = np.zeros_like(w)
+        p_rev = np.zeros_like(w)
+        dp_rev = np.zeros_like(w)
+        scale = np.zeros(w.shape)
+        scale_rev = np.zeros(w.shape)
+        abs_w = np.abs(w)
+        for k in range(n + 1):
+            dp = dp * w + p
+            p = p * w + coeffs[k]
+            scale = scale * abs_w + abs(coeffs[k])
+            dp_rev = dp_rev * w + p_rev
+            p_rev = p_rev * w + coeffs[n - k]
+            scale_rev = scale_rev * abs_w + abs(coeffs[n - k])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Con |z| > 1: p(z) = z^n r(w), p'(z) = z^(n-1) (n r(w) - w r'(w))
+            deriv_rev = n * p_rev - w * dp_rev
+            ratio = np.where(outer, z * p_rev / deriv_rev, p / dp)
+            condition = np.where(outer, scale_rev / np.abs(deriv_rev), scale / (np.abs(z) * np.abs(dp)))
+            backward = np.where(outer, np.abs(p_rev) / scale_rev, np.abs(p) / scale)
+        return ratio, condition, backward
+
+    def _aberth(self, coeffs):
+        n = len(coeffs) - 1
+        # Aproximaciones iniciales en una circunferencia del radio de las raíces (cota de Fujiwara)
+        ratios = np.abs(coeffs[1:] / coeffs[0]) ** (1.0 / np.arange(1, n + 1))
+        radius = 2 * ratios.max() if ratios.max() > 0 else 1.0
+        center = -coeffs[1] / (n * coeffs[0])
+        angles = 2 * np.pi * np.arange(n) / n + 0.4
+        z = center + radius / 2 * np.exp(1j * angles)
+        eps = np.finfo(float).eps
+        active = np.ones(n, dtype=bool)
+        iterations = 0
+        for iterations in range(1, self.ABERTH_MAX_ITER + 1):
+            ratio, _, backward = self._reverse_horner(coeffs, z[active])
+            diff = z[active, np.newaxis] - z[np.newaxis, :]
+            diff[np.arange(active.sum()), np.flatnonzero(active)] = np.inf
+            repulsion = np.sum(1 / diff, axis=1)
+            step = ratio / (1 - ratio * repulsion)
+            step = np.where(np.isfinite(step), step, 0)
+            z[active] -= step
+            # Cada raíz deja de iterar cuando su corrección es despreciable o
+            # cuando ya es raíz exacta de un polinomio a distancia de redondeo
+            converged = (np.abs(step) <= 4 * eps * np.abs(z[active])) | (backward <= 4 * eps)
+            active[np.flatnonzero(active)[converged]] = False
+            if not active.any():
+                break
+        return z, iterations, not active.any()
+
+    def polynomial_roots(self, poly_input, method="auto"):
+        """
+        Todas las raíces complejas de un polinomio de grado arbitrario.
+        
+        method="companion" calcula los valores propios de la matriz compañera y
+        method="aberth" usa la iteración de Aberth-Ehrlich (simultánea, para
+        grados altos); "auto" elige según COMPANION_MAX_DEGREE. Después se
+        pulen con POLISH_STEPS pasos de Newton.
+        
+        Returns:
+            Dict: roots, condition (número de condición relativo de cada raíz),
+            backward_error (|p(z)| / Σ|aₖ||z|ᵏ), method, iterations y converged
+            (False si Aberth agotó ABERTH_MAX_ITER iteraciones)
+        """
+        try:
+            coeffs = self.parse_polynomial(poly_input)
+            # Las raíces nulas se separan antes (coeficientes finales nulos)
+            n_zero = len(coeffs) - len(np.trim_zeros(coeffs, 'b'))
+            coeffs = np.trim_zeros(coeffs, 'b')
+            degree = len(coeffs) - 1
+            if method == "auto":
+                method = "companion" if degree <= self.COMPANION_MAX_DEGREE else "aberth"
+            iterations = 0
+            converged = True
+            if degree == 0:
+                roots = np.zeros(0, dtype=complex)
+            elif method == "companion":
+                companion = np.zeros((degree, degree), dtype=coeffs.dtype)
+                companion[0] = -coeffs[1:] / coeffs[0]
+                companion[np.arange(1, degree), np.arange(degree - 1)] = 1
+                roots = np.linalg.eigvals(companion).astype(complex)
+            elif method == "aberth":
+                roots, iterations, converged = self._aberth(coeffs)
+            else:
+                raise ValueError(f"Método desconocido: {method}")
+            
+            if degree:
+                for _ in range(self.POLISH_STEPS):
+                    ratio, _, backward = self._reverse_horner(coeffs, roots)
+                    candidate = roots - np.where(np.isfinite(ratio), ratio, 0)
+                    # Solo se acepta el paso de Newton si reduce el error hacia atrás
+                    improved = self._reverse_horner(coeffs, candidate)[2] < backward
+                    roots = np.where(improved, candidate, roots)
+                _, condition, backward = self._reverse_horner(coeffs, roots)
+            else:
+                condition = backward = np.zeros(0)
+            
+            roots = np.concatenate([roots, np.zeros(n_zero, dtype=complex)])
+            # El error relativo de una raíz nula no está acotado
+            condition = np.concatenate([condition, np.full(n_zero, np.inf)])
+            backward = np.concatenate([backward, np.zeros(n_zero)])
+            order = np.lexsort((roots.imag, roots.real))
+            return {
+                "roots": roots[order] + 0.0,
+                "condition": condition[order],
+                "backward_error": backward[order],
+                "method": method,
+                "iterations": iterations,
+                "converged": converged,
+            }
+        except Exception as e:
+            raise ValueError(f"Error al calcular las raíces: {str(e)}")
+
+    def _compile_scalar(self, expr):
+        # Función vectorizada en x; las expresiones constantes también devuelven un array
+        f = sp.lambdify(self.x, expr, modules='numpy')
+        return lambda x: np.broadcast_to(np.asarray(f(x), dtype=float), np.shape(x)).copy()
+
+    def find_roots(self, equation_str, a, b, n_grid=None, use_derivative=True):
+        """
+        Todas las raíces reales de f(x) = 0 en [a, b].
+        
+        Se evalúa f de una vez sobre una malla de n_grid puntos y cada cambio de
+        signo se refina con el método de Brent; si SymPy puede derivar f, los
+        pasos de interpolación se sustituyen por pasos de Newton (dentro del
+        intervalo de Brent). Los cambios de signo en los que |f| no tiende a 0
+        (polos, como en tan(x)) se descartan. Las raíces dobles que la malla no
+        encierra (sin cambio de signo) se buscan con Newton desde los mínimos
+        locales de |f|. Si f se anula en toda la malla se lanza ValueError.
+        
+        Returns:
+            Dict: roots, residuals, f_evals, df_evals, iterations (por raíz)
+        """
+        try:
+            a, b = float(a), float(b)
+            if not a < b:
+                raise ValueError("El extremo izquierdo debe ser menor que el derecho")
+            expr = self.parse_equation(equation_str)
+            f = self._compile_scalar(expr)
+            df = self._compile_scalar(sp.diff(expr, self.x)) if use_derivative else None
+            counts = {"f": 0, "df": 0}
+
+            def f_scalar(x):
+                counts["f"] += 1
+                return float(f(np.float64(x)))
+
+            def df_scalar(x):
+                counts["df"] += 1
+                return float(df(np.float64(x)))
+
+            n_grid = int(n_grid or self.ROOT_GRID_POINTS)
+            grid = np.linspace(a, b, n_grid)
+            with np.errstate(all='ignore'):
+                values = f(grid)
+            counts["f"] += n_grid
+            finite = np.isfinite(values)
+            # f ≡ 0: todo punto es raíz y no hay una lista finita que devolver
+            if np.all(values == 0):
+                raise ValueError("La ecuación se cumple para todo x")
+            signs = np.sign(values)
+            # Raíces exactas en la malla y cambios de signo entre puntos consecutivos
+            exact = np.flatnonzero(finite & (values == 0))
+            brackets = np.flatnonzero(finite[:-1] & finite[1:] & (signs[:-1] * signs[1:] < 0))
+
+            roots, residuals, iterations = [], [], []
+            scale = np.max(np.abs(values[finite]), initial=1.0)
+            for i in brackets:
+                root, n_iter = self._brent(f_scalar, df_scalar if df is not None else None, grid[i], grid[i + 1], values[i], values[i + 1])
+                residual = abs(f_scalar(root))
+                # En un polo |f| crece al acercarse al cambio de signo
+                if residual <= 1e-6 * scale or residual <= min(abs(values[i]), abs(values[i + 1])):
+                    roots.append(root)
+                    residuals.append(residual)
+                    iterations.append(n_iter)
+            for i in exact:
+                roots.append(grid[i])
+                residuals.append(0.0)
+                iterations.append(0)
+
+            if df is not None:
+                # Mínimos locales de |f| sin cambio de signo: posibles raíces de multiplicidad par
+                abs_values = np.where(finite, np.abs(values), np.inf)
+                minima = np.flatnonzero(
+                    (abs_values[1:-1] < abs_values[:-2]) & (abs_values[1:-1] <= abs_values[2:])
+                    & (signs[:-2] == signs[1:-1]) & (signs[1:-1] == signs[2:])
+                ) + 1
+                step = grid[1] - grid[0]
+                for i in minima:
+                    root, n_iter = self._newton(f_scalar, df_scalar, grid[i], grid[i - 1], grid[i + 1])
+                    if root is None or any(abs(root - r) <= step for r in roots):
+                        continue
+                    roots.append(root)
+                    residuals.append(abs(f_scalar(root)))
+                    iterations.append(n_iter)
+
+            order = np.argsort(roots)
+            return {
+                "roots": np.array(roots)[order],
+                "residuals": np.array(residuals)[order],
+                "f_evals": counts["f"],
+                "df_evals": counts["df"],
+                "iterations": np.array(iterations, dtype=int)[order],
+            }
+        except Exception as e:
+            raise ValueError(f"Error al buscar las raíces: {str(e)}")
+
+    def _brent(self, f, df, a, b, fa, fb):
+        """
+        Método de Brent en [a, b] con f(a) f(b) < 0.
+        
+        El paso propuesto es de Newton si hay derivada y, si no, interpolación
+        cuadrática inversa o secante; se acepta solo si cae dentro del
+        intervalo y reduce el intervalo lo suficiente, si no se biseca.
+        """
+        if abs(fa) < abs(fb):
+            a, b, fa, fb = b, a, fb, fa
+        c, fc = a, fa
+        d = e = b - a
+        for iteration in range(1, self.ROOT_MAX_ITER + 1):
+            if fb == 0:
+                return b, iteration
+            if np.sign(fb) == np.sign(fc):
+                c, fc = a, fa
+                d = e = b - a
+            if abs(fc) < abs(fb):
+                a, b, c = b, c, b
+                fa, fb, fc = fb, fc, fb
+            tol = 2 * np.finfo(float).eps * abs(b) + self.ROOT_XTOL / 2
+            m = (c - b) / 2
+            if abs(m) <= tol:
+                return b, iteration
+            if abs(e) >= tol and abs(fa) > abs(fb):
+                # El paso propuesto es -p / q
+                slope = df(b) if df is not None else 0.0
+                if slope != 0 and np.isfinite(slope):
+                    # Newton
+                    p, q = fb, slope
+                elif a == c:
+                    # Secante
+                    s = fb / fa
+                    p, q = 2 * m * s, 1 - s
+                else:
+                    # Interpolación cuadrática inversa
+                    qa, rb, s = fa / fc, fb / fc, fb / fa
+                    p = s * (2 * m * qa * (qa - rb) - (b - a) * (rb - 1))
+                    q = (qa - 1) * (rb - 1) * (s - 1)
+                if p > 0:
+                    q = -q
+                p = abs(p)
+                # Se acepta si queda dentro del intervalo y lo reduce lo bastante
+                if q != 0 and 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                    e, d = d, p / q
+                else:
+                    d = e = m
+            else:
+                d = e = m
+            a, fa = b, fb
+            b = b + d if abs(d) > tol else b + (tol if m > 0 else -tol)
+            fb = f(b)
+        return b, self.ROOT_MAX_ITER
+
+    def _newton(self, f, df, x0, lower, upper):
+        # Newton sin intervalo; la raíz se acepta si no sale de [lower, upper] y f se anula
+        x = x0
+        for iteration in range(1, self.ROOT_MAX_ITER + 1):
+            fx = f(x)
+            dfx = df(x)
+            if fx == 0:
+                return x, iteration
+            if dfx == 0 or not np.isfinite(dfx):
+                break
+            step = fx / dfx
+            x -= step
+            if not lower <= x <= upper:
+                return None, iteration
+            if abs(step) <= 2 * np.finfo(float).eps * abs(x) + self.ROOT_XTOL:
+                return (x, iteration) if abs(f(x)) <= 1e-10 else (None, iteration)
+        return None, self.ROOT_MAX_ITER
+
+    def _natural_key(self, name):
+        # x2 antes que x10
+        return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+    def _detect_variables(self, text):
+        # Identificadores que no son constantes (e, pi) ni llamadas a funciones de SymPy,
+        # en orden natural. Un nombre de SymPy sin paréntesis (beta, gamma, E) es una
+        # variable; parse_equation lo recibe como Symbol y no como la función
+        calls = set(re.findall(r'([A-Za-z_]\w*)\s*\(', text))
+        names = set(re.findall(r'[A-Za-z_]\w*', text))
+        return sorted(
+            (n for n in names if n not in ('e', 'pi') and not (n in calls and callable(getattr(sp, n, None)))),
+            key=self._natural_key,
+        )
+
+    def parse_linear_system(self, system_str):
+        """
+        Lee un sistema lineal como ecuaciones o como matriz ampliada.
+        
+        Las ecuaciones ("2x + 3y - z = 1") van separadas por líneas o ';'; la
+        matriz ampliada [A | b] se escribe con una fila por línea. Devuelve
+        (A, b, nombres de las variables); A y b son listas de filas de Fraction.
+        """
+        lines = [line for line in system_str.strip().splitlines() if line.strip()]
+        if not lines:
+            raise ValueError("El sistema está vacío")
+        try:
+            parse_table(system_str)
+            is_matrix = True
+        except ValueError:
+            is_matrix = False
+        if is_matrix:
+            # Mismas reglas de separadores que parse_table, pero con valores exactos
+            separator = r'[\s;]+' if ';' in system_str or '\t' in system_str else r'[\s,]+'
+            rows = [
+                [self.matrix_ops.parse_value(v) for v in re.split(separator, line.strip()) if v]
+                for line in lines
+            ]
+            if len(rows[0]) < 2:
+                raise ValueError("La matriz ampliada necesita al menos dos columnas")
+            names = [f"x{i + 1}" for i in range(len(rows[0]) - 1)]
+            return [row[:-1] for row in rows], [row[-1] for row in rows], names
+
+        equations = [eq for line in lines for eq in line.split(';') if eq.strip()]
+        names = self._detect_variables(system_str)
+        symbols = [sp.Symbol(n) for n in names]
+        exprs = [self.parse_equation(eq, symbols) for eq in equations]
+        try:
+            A, b = sp.linear_eq_to_matrix(exprs, symbols)
+        except Exception:
+            raise ValueError("El sistema no es lineal")
+        to_fraction = lambda v: Fraction(str(sp.nsimplify(v, rational=True)))
+        A = [[to_fraction(v) for v in A.row(i)] for i in range(A.rows)]
+        b = [to_fraction(v) for v in b]
+        return A, b, names
+
+    def _back_substitute(self, U, pivots, n_vars):
+        """
+        Solución general desde una forma escalonada [U | c]: x = x_p + Σ tₖ vₖ.
+        
+        Las variables libres son las columnas sin pivote; devuelve x_p y un vector
+        vₖ por variable libre (funciona con Fraction y con float).
+        """
+        free = [j for j in range(n_vars) if j not in pivots]
+        zero = U[0][0] * 0 if U and U[0] else 0
+        columns = [[row[n_vars] for row in U]] + [[-row[j] for row in U] for j in free]
+        solutions = []
+        for index, rhs in enumerate(columns):
+            x = [zero] * n_vars
+            if index:
+                x[free[index - 1]] = zero + 1
+            for r in range(len(pivots) - 1, -1, -1):
+                k = pivots[r]
+                total = rhs[r] - sum((U[r][j] * x[j] for j in range(k + 1, n_vars) if j not in free), zero)
+                x[k] = total / U[r][k]
+            solutions.append(x)
+        return solutions[0], solutions[1:], free
+
+    def _float_echelon(self, augmented, n_vars):
+        # Eliminación con pivoteo parcial; los pivotes por debajo de tol se consideran nulos
+        M = np.array(augmented, dtype=float)
+        n_rows = M.shape[0]
+        tol = max(M.shape) * np.finfo(float).eps * max(np.abs(M[:, :n_vars]).max(initial=0), 1e-300)
+        pivots = []
+        r = 0
+        for k in range(n_vars):
+            if r == n_rows:
+                break
+            p = r + int(np.argmax(np.abs(M[r:, k])))
+            if abs(M[p, k]) <= tol:
+                M[r:, k] = 0
+                continue
+            M[[r, p]] = M[[p, r]]
+            M[r + 1:, k:] -= np.outer(M[r + 1:, k] / M[r, k], M[r, k:])
+            pivots.append(k)
+            r += 1
+        return M, pivots, tol
+
+    def solve_linear_system(self, system, exact=False):
+        """
+        Resuelve un sistema lineal m × n dado como texto o como (A, b).
+        
+        Numéricamente, los sistemas cuadrados bien condicionados se resuelven
+        por LU con refinamiento iterativo (residuo en precisión extendida);
+        el resto, con eliminación con pivoteo parcial. Con exact=True se usa
+        eliminación de Bareiss sin fracciones y la solución es de Fraction.
+        Los sistemas compatibles indeterminados se parametrizan con sus
+        variables libres.
+        
+        Returns:
+            Dict: variables, type ("única", "infinitas" o "incompatible"),
+            solution (x_p), basis (un vector por variable libre), free, rank,
+            parametric (texto de cada variable) y, en el caso numérico,
+            residual, refinement_steps y cond
+        """
+        try:
+            if isinstance(system, str):
+                A, b, names = self.parse_linear_system(system)
+            else:
+                A, b = system
+                A = [list(row) for row in np.atleast_2d(np.asarray(A, dtype=object))]
+                b = list(np.ravel(np.asarray(b, dtype=object)))
+                names = [f"x{i + 1}" for i in range(len(A[0]))]
+            n_vars = len(names)
+            if len(b) != len(A) or any(len(row) != n_vars for row in A):
+                raise ValueError("Las dimensiones de A y b no coinciden")
+            augmented = [list(row) + [rhs] for row, rhs in zip(A, b)]
+            result = {"variables": names}
+
+            if exact:
+                U, pivots = self.matrix_ops.bareiss_echelon(augmented, n_cols=n_vars)
+                U = [[Fraction(v) for v in row] for row in U]
+                inconsistent = any(row[n_vars] != 0 for row in U[len(pivots):])
+            else:
+                A_float = np.array(A, dtype=float)
+                b_float = np.array(b, dtype=float)
+                if len(A) == n_vars:
+                    lu = LUFactorization(A_float)
+                    if not lu.is_singular():
+                        x, steps = self._refine(A_float, b_float, lu)
+                        residual = float(np.abs(A_float @ x - b_float).max(initial=0))
+                        result.update(
+                            type="única", solution=x, basis=[], free=[], rank=n_vars,
+                            residual=residual, refinement_steps=steps, cond=lu.condition_number(),
+                        )
+                        result["parametric"] = self._parametric_text(names, x, [], [])
+                        return result
+                U, pivots, tol = self._float_echelon(augmented, n_vars)
+                U = [list(row) for row in U]
+                scale = max(np.abs(b_float).max(initial=0), 1.0)
+                inconsistent = any(abs(row[n_vars]) > 1e3 * tol * scale for row in U[len(pivots):])
+
+            result["rank"] = len(pivots)
+            if inconsistent:
+                result.update(type="incompatible", solution=None, basis=[], free=[], parametric=[])
+                return result
+            x_p, basis, free = self._back_substitute(U[:len(pivots)], pivots, n_vars)
+            result.update(
+                type="única" if not free else "infinitas",
+                solution=np.array(x_p, dtype=object if exact else float),
+                basis=[np.array(v, dtype=object if exact else float) for v in basis],
+                free=[names[j] for j in free],
+            )
+            if not exact:
+                A_float = np.array(A, dtype=float)
+                result["residual"] = float(np.abs(A_float @ result["solution"] - np.array(b, dtype=float)).max(initial=0))
+                result["refinement_steps"] = 0
+                result["cond"] = np.inf if free or len(A) != n_vars else None
+            result["parametric"] = self._parametric_text(names, x_p, basis, free)
+            return result
+        except Exception as e:
+            raise ValueError(f"Error al resolver el sistema: {str(e)}")
+
+    def _refine(self, A, b, lu):
+        """Refinamiento iterativo: x += LU⁻¹ (b - A x) con el residuo en precisión extendida."""
+        x = lu.solve(b)
+        A_ext = A.astype(np.longdouble)
+        b_ext = b.astype(np.longdouble)
+        steps = 0
+        for steps in range(1, self.REFINEMENT_STEPS + 1):
+            residual = (b_ext - A_ext @ x.astype(np.longdouble)).astype(float)
+            correction = lu.solve(residual)
+            x = x + correction
+            if np.abs(correction).max(initial=0) <= np.finfo(float).eps * np.abs(x).max(initial=0):
+                break
+        return x, steps
+
+    def _parametric_text(self, names, x_p, basis, free):
+        """
+        Cada variable como texto: las pivote en función de las libres.
+        
+        Los valores float menores que el error de redondeo (relativo al mayor
+        valor de la solución) se escriben como 0, sin signo.
+        """
+        def fmt(value):
+            if isinstance(value, Fraction):
+                return str(value.numerator) if value.denominator == 1 else f"{value.numerator}/{value.denominator}"
+            return f"{value:.10g}"
+
+        if not any(isinstance(v, Fraction) for v in list(x_p) + [c for v in basis for c in v]):
+            x_p = np.asarray(x_p, dtype=float)
+            basis = [np.asarray(v, dtype=float) for v in basis]
+            tol = 64 * np.finfo(float).eps * max([np.abs(x_p).max(initial=0)] + [np.abs(v).max(initial=0) for v in basis])
+            # + 0.0 convierte -0.0 en 0.0
+            x_p = np.where(np.abs(x_p) <= tol, 0.0, x_p) + 0.0
+            basis = [np.where(np.abs(v) <= tol, 0.0, v) + 0.0 for v in basis]
+
+        lines = []
+        for i, name in enumerate(names):
+            if i in free:
+                lines.append(f"{name} libre")
+                continue
+            text = fmt(x_p[i]) if x_p[i] != 0 or not any(v[i] != 0 for v in basis) else ""
+            for j, v in zip(free, basis):
+                if v[i] == 0:
+                    continue
+                coeff = abs(v[i])
+                sign = "-" if v[i] < 0 else "+"
+                # Un coeficiente 0.9999999999999998 también se escribe como 1
+                coeff_text = fmt(coeff)
+                term = names[j] if coeff_text == "1" else f"{coeff_text}{names[j]}"
+                text = f"{text} {sign} {term}" if text else (term if sign == "+" else f"-{term}")
+            lines.append(f"{name} = {text}")
+        return lines
+
+    def _split_equations(self, text):
+        # Separadores: saltos de línea, ';' y comas fuera de paréntesis ("x^2 + y^2 = 4, x*y = 1")
+        equations, depth, current = [], 0, []
+        for char in text:
+            depth += (char in '([') - (char in ')]')
+            if char in '\n;' or (char == ',' and depth == 0):
+                equations.append(''.join(current))
+                current = []
+            else:
+                current.append(char)
+        equations.append(''.join(current))
+        return [eq.strip() for eq in equations if eq.strip()]
+
+    def compile_system(self, equations):
+        """
+        Compila un sistema F(v) = 0 y su jacobiano simbólico para evaluarlos por lotes.
+        
+        equations es un texto o una lista de ecuaciones. Devuelve (F, J, nombres):
+        F(X) con X de forma (N, n) devuelve (N, m) y J(X) devuelve (N, m, n).
+        """
+        if isinstance(equations, str):
+            equations = self._split_equations(equations)
+        if not equations:
+            raise ValueError("El sistema está vacío")
+        names = self._detect_variables(' '.join(equations))
+        if not names:
+            raise ValueError("El sistema no tiene incógnitas")
+        symbols = [sp.Symbol(n) for n in names]
+        exprs = [self.parse_equation(eq, symbols) for eq in equations]
+        jacobian = sp.Matrix(exprs).jacobian(symbols)
+        f = sp.lambdify(symbols, exprs, modules='numpy')
+        df = sp.lambdify(symbols, jacobian.tolist(), modules='numpy')
+        m, n = len(exprs), len(symbols)
+
+        def residual(X):
+            # Las componentes constantes devuelven escalares; se amplían a (N,)
+            values = f(*X.T)
+            return np.stack([np.broadcast_to(np.asarray(v, dtype=float), X.shape[:1]) for v in values], axis=1)
+
+        def jac(X):
+            values = df(*X.T)
+            return np.stack(
+                [np.stack([np.broadcast_to(np.asarray(v, dtype=float), X.shape[:1]) for v in row], axis=1) for row in values],
+                axis=1,
+            ).reshape(len(X), m, n)
+
+        return residual, jac, names
+
+    def _newton_step(self, J, Fx):
+        # δ = -J⁻¹ F por lotes; si algún jacobiano es singular (o el sistema no es
+        # cuadrado) se usa mínimos cuadrados punto a punto
+        try:
+            if J.shape[1] != J.shape[2]:
+                raise np.linalg.LinAlgError
+            return -np.linalg.solve(J, Fx[..., np.newaxis])[..., 0]
+        except np.linalg.LinAlgError:
+            return np.stack([-np.linalg.lstsq(j, r, rcond=None)[0] for j, r in zip(J, Fx)]) if len(J) else np.zeros(J.shape[::2])
+
+    def solve_nonlinear_system(self, equations, lower=-10.0, upper=10.0, starts=None, n_starts=None, seed=0):
+        """
+        Raíces reales de un sistema no lineal F(v) = 0 por Newton amortiguado.
+        
+        El residuo y el jacobiano simbólico se compilan una vez y todas las
+        iteraciones avanzan a la vez desde n_starts puntos aleatorios (reproducibles
+        con seed) de la caja [lower, upper]ⁿ, o desde los puntos de starts. Cada paso
+        de Newton se acorta a la mitad hasta que ‖F‖ disminuye (Armijo). Las raíces a
+        las que convergen varios puntos de partida se agrupan.
+        
+        Returns:
+            Dict: variables, roots (k, n), residuals, starts, converged (número de
+            puntos que convergieron), iterations, f_evals
+        """
+        try:
+            F, J, names = self.compile_system(equations)
+            n = len(names)
+            if starts is None:
+                lower, upper = float(lower), float(upper)
+                if not lower < upper:
+                    raise ValueError("El extremo inferior debe ser menor que el superior")
+                rng = np.random.default_rng(seed)
+                starts = rng.uniform(lower, upper, (int(n_starts or self.NEWTON_STARTS), n))
+            X = np.array(starts, dtype=float).reshape(-1, n)
+            n_points = len(X)
+
+            with np.errstate(all='ignore'):
+                Fx = F(X)
+                f_evals = n_points
+                merit = np.einsum('ij,ij->i', Fx, Fx)
+                active = np.isfinite(merit)
+                converged = np.zeros(n_points, dtype=bool)
+                iterations = 0
+                while iterations < self.NEWTON_MAX_ITER and active.any():
+                    iterations += 1
+                    idx = np.flatnonzero(active)
+                    Jx = J(X[idx])
+                    ok = np.all(np.isfinite(Jx), axis=(1, 2))
+                    active[idx[~ok]] = False
+                    idx, Jx = idx[ok], Jx[ok]
+                    delta = self._newton_step(Jx, Fx[idx])
+                    # Búsqueda en línea: λ = 1, 1/2, 1/4, ... hasta cumplir Armijo
+                    step = np.ones(len(idx))
+                    pending = np.arange(len(idx))
+                    new_X = X[idx].copy()
+                    new_F = Fx[idx].copy()
+                    new_merit = merit[idx].copy()
+                    for _ in range(30):
+                        if not len(pending):
+                            break
+                        trial = X[idx[pending]] + step[pending, np.newaxis] * delta[pending]
+                        trial_F = F(trial)
+                        f_evals += len(pending)
+                        trial_merit = np.einsum('ij,ij->i', trial_F, trial_F)
+                        accept = trial_merit <= (1 - 1e-4 * step[pending]) * merit[idx[pending]]
+                        accepted = pending[accept]
+                        new_X[accepted] = trial[accept]
+                        new_F[accepted] = trial_F[accept]
+                        new_merit[accepted] = trial_merit[accept]
+                        pending = pending[~accept]
+                        step[pending] /= 2
+                    # Sin descenso posible: mínimo local de ‖F‖ que no es raíz
+                    active[idx[pending]] = False
+                    moved = np.setdiff1d(np.arange(len(idx)), pending)
+                    X[idx[moved]] = new_X[moved]
+                    Fx[idx[moved]] = new_F[moved]
+                    merit[idx[moved]] = new_merit[moved]
+
+                    size = np.abs(step[moved, np.newaxis] * delta[moved]).max(axis=1, initial=0)
+                    scale = 1 + np.abs(X[idx[moved]]).max(axis=1, initial=0)
+                    small_f = np.abs(Fx[idx[moved]]).max(axis=1, initial=0) <= self.NEWTON_FTOL * scale
+                    small_step = size <= 4 * np.finfo(float).eps * scale
+                    done = idx[moved][small_f & small_step | (merit[idx[moved]] == 0)]
+                    converged[done] = True
+                    active[done] = False
+                # Puntos que terminan sin dar el último paso pero con residuo despreciable
+                tail = ~converged & np.isfinite(merit)
+                scale = 1 + np.abs(X).max(axis=1, initial=0)
+                converged |= tail & (np.sqrt(merit) <= self.NEWTON_FTOL * scale)
+
+            roots = self._merge_roots(X[converged], np.sqrt(merit[converged]))
+            residuals = np.abs(F(roots)).max(axis=1, initial=0) if len(roots) else np.empty(0)
+            return {
+                "variables": names,
+                "roots": roots,
+                "residuals": residuals,
+                "starts": n_points,
+                "converged": int(converged.sum()),
+                "iterations": iterations,
+                "f_evals": f_evals,
+            }
+        except Exception as e:
+            raise ValueError(f"Error al resolver el sistema no lineal: {str(e)}")
+
+    def _merge_roots(self, points, residuals):
+        # Agrupa los puntos que distan menos de ROOT_MERGE_TOL (relativo) y se queda
+        # con el de menor residuo de cada grupo; resultado ordenado por coordenadas
+        roots = np.empty((0, points.shape[1]))
+        for i in np.argsort(residuals, kind='stable'):
+            p = points[i]
+            tol = self.ROOT_MERGE_TOL * (1 + np.abs(p).max(initial=0))
+            if not len(roots) or np.abs(roots - p).max(axis=1).min() > tol:
+                roots = np.vstack([roots, p])
+        return roots[np.lexsort(roots.T[::-1])] if len(roots) else roots
+
     def get_equation_string(self, eq_type, *coeffs):
         try:
             if eq_type == "Lineal":
@@ -1,29 +1,933 @@
+import hashlib
+import os
+import time
 import numpy as np
 from fractions import Fraction
+from math import lcm
+from core.blas_backend import BlasBackend
+from core.number_parser import parse_table
+from core.sparse_matrix import CSRMatrix, SparseLU, conjugate_gradient, gmres
+
+class LUFactorization:
+    """
+    Factorización PA = LU con pivoteo parcial de una matriz cuadrada en float.
+    
+    Determinante, inversa, rango y solución de sistemas salen de la misma
+    factorización; la singularidad se decide con el número de condición.
+    """
+    # Por encima de este número de condición la matriz se trata como singular
+    COND_LIMIT = 1 / np.finfo(float).eps
+    # Ancho de bloque: las actualizaciones del resto de la matriz se hacen con matmul
+    BLOCK_SIZE = 64
+
+    def __init__(self, matrix):
+        A = np.array(matrix, dtype=float)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError("La matriz debe ser cuadrada.")
+        n = A.shape[0]
+        self.n = n
+        self.norm1 = np.abs(A).sum(axis=0).max() if n else 0.0
+        self.piv = np.arange(n)
+        self.sign = 1
+
+        nb = self.BLOCK_SIZE
+        for start in range(0, n, nb):
+            end = min(start + nb, n)
+            # Factorizar el panel de columnas [start, end)
+            for k in range(start, end):
+                p = k + int(np.argmax(np.abs(A[k:, k])))
+                if p != k:
+                    A[[k, p]] = A[[p, k]]
+                    self.piv[[k, p]] = self.piv[[p, k]]
+                    self.sign = -self.sign
+                if A[k, k] != 0:
+                    A[k + 1:, k] /= A[k, k]
+                    A[k + 1:, k + 1:end] -= np.outer(A[k + 1:, k], A[k, k + 1:end])
+            if end < n:
+                # U12 = L11^-1 A12 y actualización A22 -= L21 U12
+                A[start:end, end:] = self._forward(A[start:end, start:end], A[start:end, end:])
+                A[end:, end:] -= A[end:, start:end] @ A[start:end, end:]
+        self.lu = A
+        self._cond = None
+
+    @classmethod
+    def _forward(cls, L, B):
+        """Resuelve L X = B con L triangular inferior de diagonal unitaria, por bloques."""
+        X = np.array(B, dtype=float)
+        n = L.shape[0]
+        for start in range(0, n, cls.BLOCK_SIZE):
+            end = min(start + cls.BLOCK_SIZE, n)
+            if start:
+                X[start:end] -= L[start:end, :start] @ X[:start]
+            for k in range(start + 1, end):
+                X[k] -= L[k, start:k] @ X[start:k]
+        return X
+
+    @classmethod
+    def _backward(cls, U, B):
+        """Resuelve U X = B con U triangular superior, por bloques."""
+        X = np.array(B, dtype=float)
+        n = U.shape[0]
+        for end in range(n, 0, -cls.BLOCK_SIZE):
+            start = max(end - cls.BLOCK_SIZE, 0)
+            if end < n:
+                X[start:end] -= U[start:end, end:] @ X[end:]
+            for k in range(end - 1, start - 1, -1):
+                X[k] = (X[k] - U[k, k + 1:end] @ X[k + 1:end]) / U[k, k]
+        return X
+
+    def determinant(self):
+        return self.sign * np.prod(np.diag(self.lu))
+
+    def solve(self, b):
+        """Resuelve A x = b; b puede ser un vector o una matriz de lados derechos."""
+        x = np.array(b, dtype=float)[self.piv]
+        return self._backward(self.lu, self._forward(self.lu, x))
+
+    def solve_transposed(self, b):
+        """Resuelve A^T x = b reutilizando la misma factorización."""
+        z = np.array(b, dtype=float)
+        for k in range(self.n):
+            z[k] = (z[k] - self.lu[:k, k] @ z[:k]) / self.lu[k, k]
+        for k in range(self.n - 2, -1, -1):
+            z[k] -= self.lu[k + 1:, k] @ z[k + 1:]
+        x = np.empty_like(z)
+        x[self.piv] = z
+        return x
+
+    def inverse(self):
+        return self.solve(np.eye(self.n))
+
+    def rank(self):
+        diag = np.abs(np.diag(self.lu))
+        if not diag.size:
+            return 0
+        tol = self.n * np.finfo(float).eps * diag.max()
+        return int(np.sum(diag > tol))
+
+    def condition_number(self):
+        """Estimación de Hager del número de condición en norma 1 (sin formar A^-1)."""
+        if self._cond is None:
+            if self.n == 0:
+                self._cond = 1.0
+            elif np.any(np.diag(self.lu) == 0):
+                self._cond = np.inf
+            else:
+                with np.errstate(over='ignore', invalid='ignore'):
+                    x = np.full(self.n, 1.0 / self.n)
+                    estimate = 0.0
+                    for _ in range(5):
+                        y = self.solve(x)
+                        estimate = np.abs(y).sum()
+                        z = self.solve_transposed(np.where(y >= 0, 1.0, -1.0))
+                        j = int(np.argmax(np.abs(z)))
+                        if np.abs(z[j]) <= z @ x:
+                            break
+                        x = np.zeros(self.n)
+                        x[j] = 1.0
+                cond = self.norm1 * estimate
+                self._cond = cond if np.isfinite(cond) else np.inf
+        return self._cond
+
+    def is_singular(self):
+        return self.condition_number() > self.COND_LIMIT
 
 class MatrixOperations:
+    # Tamaño máximo para el que se usa aritmética racional exacta
+    EXACT_MAX_SIZE = 20
+    # Número máximo de factorizaciones guardadas en caché
+    MAX_CACHE = 16
+    # Tamaño máximo de las matrices importadas desde archivo
+    MAX_FILE_SIZE = 5000
+    # A partir de este número de elementos el resultado no se convierte a fracciones
+    FORMAT_MAX_ELEMENTS = 10000
+    # Las matrices de al menos SPARSE_MIN_SIZE filas con menos de este porcentaje
+    # de no nulos se tratan en formato CSR
+    SPARSE_MAX_DENSITY = 0.01
+    SPARSE_MIN_SIZE = 100
+
+    # Operaciones que se pueden comparar con compare_timings
+    TIMED_OPERATIONS = ("lu", "qr", "cholesky", "svd", "eig", "rank", "pinv", "expm")
+    # Operaciones del benchmark (todas sobre BLAS/LAPACK) y sus flops para una matriz n × n;
+    # solve resuelve n lados derechos: LU (2n³/3) más las sustituciones (2n³)
+    BENCHMARK_FLOPS = {
+        "matmul": lambda n: 2.0 * n ** 3,
+        "solve": lambda n: 8.0 * n ** 3 / 3,
+        "inverse": lambda n: 2.0 * n ** 3,
+        "determinant": lambda n: 2.0 * n ** 3 / 3,
+    }
+    # Bloque de la dimensión interna en el producto entero exacto
+    INTEGER_BLOCK = 4096
+
+    def __init__(self):
+        self._factorizations = {}
+        # Segundos que tardó la última ejecución de cada operación
+        self.timings = {}
+        self.blas = BlasBackend()
+
+    def _digest(self, *arrays):
+        # Resumen del contenido sin copiarlo: la clave no retiene la matriz (una 5000 x 5000 ocupa 200 MB)
+        digest = hashlib.blake2b(digest_size=32)
+        for array in arrays:
+            digest.update(memoryview(np.ascontiguousarray(array)).cast('B'))
+        return digest.digest()
+
+    def _cached(self, kind, matrix, build):
+        """Calcula build(matrix) una sola vez por matriz y tipo de descomposición."""
+        if isinstance(matrix, CSRMatrix):
+            key = (kind, "csr", matrix.shape, self._digest(matrix.data, matrix.indices, matrix.indptr))
+        else:
+            matrix = np.ascontiguousarray(matrix, dtype=float)
+            key = (kind, matrix.shape, matrix.dtype.str, self._digest(matrix))
+        if key not in self._factorizations:
+            if len(self._factorizations) >= self.MAX_CACHE:
+                self._factorizations.pop(next(iter(self._factorizations)))
+            self._factorizations[key] = build(matrix)
+        return self._factorizations[key]
+
+    def _timed(self, operation, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        self.timings[operation] = time.perf_counter() - start
+        return result
+
+    def factorize(self, matrix):
+        """Devuelve la factorización LU de la matriz, calculándola una sola vez por matriz."""
+        if isinstance(matrix, CSRMatrix):
+            return self._cached("sparse_lu", matrix, SparseLU)
+        return self._cached("lu", matrix, LUFactorization)
+
+    def as_sparse(self, matrix):
+        """Devuelve la matriz en CSR si ya lo está o si es grande y casi toda ceros; si no, None."""
+        if isinstance(matrix, CSRMatrix):
+            return matrix
+        matrix = np.asarray(matrix)
+        if matrix.dtype == object or matrix.ndim != 2 or min(matrix.shape) < self.SPARSE_MIN_SIZE:
+            return None
+        if np.count_nonzero(matrix) > self.SPARSE_MAX_DENSITY * matrix.size:
+            return None
+        return CSRMatrix.from_dense(matrix)
+
+    def load_matrix(self, path, mmap=True):
+        """
+        Carga una matriz desde un archivo .csv/.txt, .npy o .mtx (Matrix Market).
+        
+        Los .npy se abren con mmap_mode='r' para no copiar el archivo a memoria.
+        """
+        try:
+            ext = os.path.splitext(path)[1].lower()
+            if ext == '.npy':
+                matrix = np.load(path, mmap_mode='r' if mmap else None)
+            elif ext == '.mtx':
+                matrix = self._load_matrix_market(path)
+            elif ext in ('.csv', '.txt'):
+                # Separadores ',' ';' tabulador o espacio, coma decimal y fracciones
+                with open(path, 'r') as f:
+                    matrix = parse_table(f.read())
+            else:
+                raise ValueError(f"Formato no soportado: {ext}")
+
+            if len(matrix.shape) != 2:
+                raise ValueError("El archivo no contiene una matriz bidimensional.")
+            if max(matrix.shape) > self.MAX_FILE_SIZE:
+                raise ValueError(f"La matriz supera el tamaño máximo de {self.MAX_FILE_SIZE} × {self.MAX_FILE_SIZE}.")
+            return matrix
+        except Exception as e:
+            raise ValueError(f"Error al cargar la matriz: {str(e)}")
+
+    def _load_matrix_market(self, path):
+        with open(path, 'r') as f:
+            header = f.readline().lower().split()
+            if len(header) < 5 or header[0] != '%%matrixmarket' or header[1] != 'matrix':
+                raise ValueError("Cabecera Matrix Market no válida.")
+            layout, field, symmetry = header[2], header[3], header[4]
+            if field == 'complex':
+                raise ValueError("No se admiten matrices complejas.")
+            line = f.readline()
+            while line.startswith('%'):
+                line = f.readline()
+            sizes = [int(x) for x in line.split()]
+            # El resto del archivo se convierte de una vez (sin bucle por línea en Python)
+            data = np.loadtxt(f, dtype=float, ndmin=2 if layout == 'coordinate' else 1)
+
+        rows, cols = sizes[0], sizes[1]
+        if layout == 'array':
+            # Formato denso: valores por columnas
+            matrix = data.reshape(-1)[:rows * cols].reshape(cols, rows).T.copy()
+            if symmetry != 'general':
+                raise ValueError("Solo se admiten matrices densas generales.")
+            return matrix
+
+        i = data[:, 0].astype(np.int64) - 1 if data.size else np.zeros(0, dtype=np.int64)
+        j = data[:, 1].astype(np.int64) - 1 if data.size else np.zeros(0, dtype=np.int64)
+        values = np.ones(len(i)) if field == 'pattern' or not data.size else data[:, 2]
+        if symmetry in ('symmetric', 'skew-symmetric'):
+            sign = -1.0 if symmetry == 'skew-symmetric' else 1.0
+            off = i != j
+            i, j, values = np.concatenate([i, j[off]]), np.concatenate([j, i[off]]), np.concatenate([values, sign * values[off]])
+        sparse = CSRMatrix.from_coo(i, j, values, (rows, cols))
+        # Las matrices casi vacías se quedan en CSR sin pasar nunca por una matriz densa
+        if min(rows, cols) >= self.SPARSE_MIN_SIZE and sparse.density <= self.SPARSE_MAX_DENSITY:
+            return sparse
+        return sparse.to_dense()
+
+    def save_matrix(self, matrix, path):
+        """Guarda la matriz en .csv/.txt, .npy o .mtx según la extensión."""
+        try:
+            ext = os.path.splitext(path)[1].lower()
+            if isinstance(matrix, CSRMatrix):
+                if ext == '.mtx':
+                    rows, cols, values = matrix.to_coo()
+                    with open(path, 'w') as f:
+                        f.write("%%MatrixMarket matrix coordinate real general\n")
+                        f.write(f"{matrix.shape[0]} {matrix.shape[1]} {matrix.nnz}\n")
+                        np.savetxt(f, np.column_stack([rows + 1, cols + 1, values]), fmt=['%d', '%d', '%.17g'])
+                    return
+                matrix = matrix.to_dense()
+            matrix = np.asarray(matrix, dtype=float)
+            if ext == '.npy':
+                np.save(path, matrix)
+            elif ext in ('.csv', '.txt'):
+                np.savetxt(path, matrix, delimiter=',', fmt='%.17g')
+            elif ext == '.mtx':
+                i, j = np.nonzero(matrix)
+                with open(path, 'w') as f:
+                    f.write("%%MatrixMarket matrix coordinate real general\n")
+                    f.write(f"{matrix.shape[0]} {matrix.shape[1]} {len(i)}\n")
+                    np.savetxt(f, np.column_stack([i + 1, j + 1, matrix[i, j]]), fmt=['%d', '%d', '%.17g'])
+            else:
+                raise ValueError(f"Formato no soportado: {ext}")
+        except Exception as e:
+            raise ValueError(f"Error al guardar la matriz: {str(e)}")
+
+    def summarize_matrix(self, matrix, edge_items=3):
+        """Resumen en texto de una matriz grande: esquinas, dimensiones y estadísticas."""
+        if isinstance(matrix, CSRMatrix):
+            values = matrix.data if matrix.nnz else np.zeros(1)
+            return (
+                f"{matrix.shape[0]} × {matrix.shape[1]} (dispersa, CSR)  |  "
+                f"mín no nulo = {values.min():.4g}, máx no nulo = {values.max():.4g}, "
+                f"no nulos = {matrix.nnz} ({100 * matrix.density:.3f} %)"
+            )
+        matrix = np.asarray(matrix, dtype=float)
+        body = np.array2string(matrix, threshold=4 * edge_items ** 2, edgeitems=edge_items, precision=4, suppress_small=True)
+        nonzeros = int(np.count_nonzero(matrix))
+        return (
+            f"{matrix.shape[0]} × {matrix.shape[1]}  |  "
+            f"mín = {matrix.min():.4g}, máx = {matrix.max():.4g}, "
+            f"no nulos = {nonzeros} ({100 * nonzeros / max(matrix.size, 1):.1f} %)\n{body}"
+        )
+
+    def preview_grid(self, matrix, max_size=200):
+        """Reduce la matriz por bloques (media de cada bloque) para dibujar un mapa de calor."""
+        if isinstance(matrix, CSRMatrix):
+            # Se acumulan solo los no nulos en su bloque
+            step_r = max(1, -(-matrix.shape[0] // max_size))
+            step_c = max(1, -(-matrix.shape[1] // max_size))
+            grid = np.zeros((-(-matrix.shape[0] // step_r), -(-matrix.shape[1] // step_c)))
+            rows, cols, values = matrix.to_coo()
+            np.add.at(grid, (rows // step_r, cols // step_c), values)
+            return grid / (step_r * step_c)
+        matrix = np.asarray(matrix, dtype=float)
+        step_r = max(1, -(-matrix.shape[0] // max_size))
+        step_c = max(1, -(-matrix.shape[1] // max_size))
+        rows = matrix.shape[0] // step_r * step_r
+        cols = matrix.shape[1] // step_c * step_c
+        if step_r == 1 and step_c == 1:
+            return matrix
+        trimmed = matrix[:rows, :cols]
+        return trimmed.reshape(rows // step_r, step_r, cols // step_c, step_c).mean(axis=(1, 3))
+
+    def parse_value(self, value_str):
+        # Acepta enteros, decimales y fracciones "a/b"; Fraction los representa sin error
+        return Fraction(value_str.strip().replace(',', '.'))
+
+    def parse_matrix(self, rows):
+        """Convierte filas de texto en una matriz exacta (Fraction) o, si no es posible, en float."""
+        try:
+            matrix = np.array([[self.parse_value(v) for v in row] for row in rows], dtype=object)
+            if max(matrix.shape) <= self.EXACT_MAX_SIZE:
+                return matrix
+            return matrix.astype(float)
+        except (ValueError, ZeroDivisionError):
+            return np.array([[self._parse_float(v) for v in row] for row in rows], dtype=float)
+
+    def _parse_float(self, value_str):
+        try:
+            return float(self.parse_value(value_str))
+        except (ValueError, ZeroDivisionError):
+            return 0.0
+
+    def to_exact(self, matrix):
+        """Devuelve la matriz como array de Fraction si todos sus valores son racionales exactos, si no None."""
+        if isinstance(matrix, CSRMatrix):
+            return None
+        matrix = np.asarray(matrix)
+        if max(matrix.shape, default=0) > self.EXACT_MAX_SIZE:
+            return None
+        if matrix.dtype == object:
+            try:
+                return np.vectorize(Fraction, otypes=[object])(matrix)
+            except (TypeError, ValueError):
+                return None
+        if np.issubdtype(matrix.dtype, np.integer):
+            return np.vectorize(Fraction, otypes=[object])(matrix.astype(object))
+        if np.issubdtype(matrix.dtype, np.floating) and np.all(np.abs(matrix) < 2**53) and np.all(matrix == np.round(matrix)):
+            # Floats con valor entero (p. ej. botones "Aleatorio" / "Unos")
+            return np.vectorize(Fraction, otypes=[object])(matrix.astype(np.int64).astype(object))
+        return None
+
+    def bareiss_determinant(self, matrix):
+        """Determinante exacto por eliminación de Bareiss (sin fracciones) sobre enteros."""
+        exact = self.to_exact(matrix)
+        n = exact.shape[0]
+        if exact.shape != (n, n):
+            raise ValueError("La matriz debe ser cuadrada.")
+        if n == 0:
+            return Fraction(1)
+
+        # Escalar cada fila por el mcm de sus denominadores para trabajar con enteros
+        scale = Fraction(1)
+        M = []
+        for row in exact:
+            factor = lcm(*(x.denominator for x in row))
+            scale *= factor
+            M.append([int(x * factor) for x in row])
+
+        sign = 1
+        prev = 1
+        for k in range(n - 1):
+            if M[k][k] == 0:
+                # Pivoteo: buscar una fila con pivote no nulo
+                swap = next((i for i in range(k + 1, n) if M[i][k] != 0), None)
+                if swap is None:
+                    return Fraction(0)
+                M[k], M[swap] = M[swap], M[k]
+                sign = -sign
+            pivot = M[k][k]
+            for i in range(k + 1, n):
+                for j in range(k + 1, n):
+                    # La división es exacta por el teorema de Sylvester
+                    M[i][j] = (M[i][j] * pivot - M[i][k] * M[k][j]) // prev
+            prev = pivot
+        return Fraction(sign * M[n - 1][n - 1]) / scale
+
+    def bareiss_echelon(self, rows, n_cols=None):
+        """
+        Forma escalonada entera por eliminación de Bareiss (sin fracciones).
+        
+        rows es una lista de filas de valores racionales; cada fila se escala
+        por el mcm de sus denominadores. Solo se buscan pivotes en las primeras
+        n_cols columnas. Devuelve las filas enteras escalonadas y las columnas pivote.
+        """
+        M = []
+        for row in rows:
+            row = [Fraction(x) for x in row]
+            factor = lcm(*(x.denominator for x in row)) if row else 1
+            M.append([int(x * factor) for x in row])
+        n_rows = len(M)
+        cols = len(M[0]) if n_rows else 0
+        n_cols = cols if n_cols is None else n_cols
+        pivots = []
+        prev = 1
+        r = 0
+        for k in range(n_cols):
+            pivot_row = next((i for i in range(r, n_rows) if M[i][k] != 0), None)
+            if pivot_row is None:
+                continue
+            M[r], M[pivot_row] = M[pivot_row], M[r]
+            pivot = M[r][k]
+            for i in range(r + 1, n_rows):
+                for j in range(k + 1, cols):
+                    # División exacta: cada entrada es un menor de la matriz original
+                    M[i][j] = (M[i][j] * pivot - M[i][k] * M[r][j]) // prev
+                M[i][k] = 0
+            prev = pivot
+            pivots.append(k)
+            r += 1
+            if r == n_rows:
+                break
+        return M, pivots
+
+    def rref_exact(self, matrix, n_cols=None):
+        """
+        Forma escalonada reducida exacta (Gauss-Jordan sobre Fraction).
+        
+        Solo se buscan pivotes en las primeras n_cols columnas (todas por defecto).
+        Devuelve la matriz reducida como lista de filas y las columnas pivote.
+        """
+        M = [list(row) for row in self.to_exact(matrix)]
+        rows = len(M)
+        cols = len(M[0]) if rows else 0
+        n_cols = cols if n_cols is None else n_cols
+        pivots = []
+        r = 0
+        for k in range(n_cols):
+            pivot_row = next((i for i in range(r, rows) if M[i][k] != 0), None)
+            if pivot_row is None:
+                continue
+            M[r], M[pivot_row] = M[pivot_row], M[r]
+            pivot = M[r][k]
+            M[r] = [x / pivot for x in M[r]]
+            for i in range(rows):
+                if i != r and M[i][k] != 0:
+                    factor = M[i][k]
+                    M[i] = [a - factor * b for a, b in zip(M[i], M[r])]
+            pivots.append(k)
+            r += 1
+            if r == rows:
+                break
+        return M, pivots
+
+    def gauss_jordan_inverse(self, matrix):
+        """Inversa exacta por Gauss-Jordan sobre Fraction."""
+        exact = self.to_exact(matrix)
+        n = exact.shape[0]
+        if exact.shape != (n, n):
+            raise ValueError("La matriz debe ser cuadrada.")
+        identity = np.array([[Fraction(int(i == j)) for j in range(n)] for i in range(n)], dtype=object)
+        M, pivots = self.rref_exact(np.hstack([exact, identity]), n_cols=n)
+        if len(pivots) < n:
+            raise ValueError("La matriz es singular, no tiene inversa.")
+        return np.array([row[n:] for row in M], dtype=object)
+
     def calculate_determinant(self, matrix):
         try:
-            det = np.linalg.det(matrix)
+            if self.to_exact(matrix) is not None:
+                return self.simplify_fraction(self.bareiss_determinant(matrix))
+            det = self.factorize(self._sparse_or_dense(matrix)).determinant()
             return self.decimal_to_fraction(det)
         except:
             return None
 
     def calculate_inverse(self, matrix):
         try:
-            # Verificamos si la matriz es singular
-            det = np.linalg.det(matrix)
-            if abs(det) < 1e-10:
+            if self.to_exact(matrix) is not None:
+                return self.format_matrix(self.gauss_jordan_inverse(matrix))
+
+            # Verificamos si la matriz es singular según su número de condición
+            lu = self.factorize(self._sparse_or_dense(matrix))
+            if lu.is_singular():
                 raise ValueError("La matriz es singular, no tiene inversa.")
-                
-            # Calculamos la inversa
-            inv = np.linalg.inv(matrix)
+
+            # Calculamos la inversa con la misma factorización
+            inv = lu.inverse()
             return self.format_matrix(inv)
         except Exception as e:
             raise ValueError(f"Error al calcular la inversa: {str(e)}")
 
+    def calculate_rank(self, matrix):
+        """Rango exacto por RREF para matrices racionales; si no, número de valores singulares no despreciables."""
+        try:
+            if self.to_exact(matrix) is not None:
+                return self._timed("rank", lambda: len(self.rref_exact(matrix)[1]))
+            return self._timed("rank", self._numerical_rank, self._dense(matrix))
+        except Exception as e:
+            raise ValueError(f"Error al calcular el rango: {str(e)}")
+
+    def _numerical_rank(self, matrix):
+        s = self._svd(matrix)[1]
+        if not s.size:
+            return 0
+        tol = max(matrix.shape) * np.finfo(float).eps * s[0]
+        return int(np.sum(s > tol))
+
+    def _svd(self, matrix):
+        return self._cached("svd", matrix, lambda m: np.linalg.svd(m, full_matrices=False))
+
+    def _square(self, matrix):
+        matrix = self._dense(matrix)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("La matriz debe ser cuadrada.")
+        return matrix
+
+    def qr_decomposition(self, matrix):
+        """Factorización A = QR (Householder); devuelve (Q, R)."""
+        try:
+            matrix = self._dense(matrix)
+            return self._timed("qr", self._cached, "qr", matrix, np.linalg.qr)
+        except Exception as e:
+            raise ValueError(f"Error al calcular la factorización QR: {str(e)}")
+
+    def cholesky_decomposition(self, matrix):
+        """Factorización A = L L^T de una matriz simétrica definida positiva; devuelve L."""
+        try:
+            matrix = self._square(matrix)
+            if not np.allclose(matrix, matrix.T):
+                raise ValueError("La matriz no es simétrica.")
+            try:
+                return self._timed("cholesky", self._cached, "cholesky", matrix, np.linalg.cholesky)
+            except np.linalg.LinAlgError:
+                raise ValueError("La matriz no es definida positiva.")
+        except Exception as e:
+            raise ValueError(f"Error al calcular la factorización de Cholesky: {str(e)}")
+
+    def svd_decomposition(self, matrix):
+        """Descomposición en valores singulares A = U diag(s) V^T; devuelve (U, s, V^T)."""
+        try:
+            return self._timed("svd", self._svd, self._dense(matrix))
+        except Exception as e:
+            raise ValueError(f"Error al calcular la SVD: {str(e)}")
+
+    def eigen_decomposition(self, matrix):
+        """
+        Valores y vectores propios (vectores en columnas).
+        
+        Las matrices simétricas usan el algoritmo específico, que da resultados reales
+        y ordenados; el resto puede tener valores propios complejos.
+        """
+        try:
+            matrix = self._square(matrix)
+            if np.allclose(matrix, matrix.T):
+                return self._timed("eig", self._cached, "eigh", matrix, np.linalg.eigh)
+            return self._timed("eig", self._cached, "eig", matrix, np.linalg.eig)
+        except Exception as e:
+            raise ValueError(f"Error al calcular los valores propios: {str(e)}")
+
+    def pseudoinverse(self, matrix):
+        """Pseudoinversa de Moore-Penrose a partir de la SVD (guardada en caché)."""
+        try:
+            matrix = self._dense(matrix)
+
+            def pinv(m):
+                U, s, Vt = self._svd(m)
+                tol = max(m.shape) * np.finfo(float).eps * (s[0] if s.size else 0.0)
+                s_inv = np.divide(1.0, s, out=np.zeros_like(s), where=s > tol)
+                return (Vt.T * s_inv) @ U.T
+
+            return self._timed("pinv", pinv, matrix)
+        except Exception as e:
+            raise ValueError(f"Error al calcular la pseudoinversa: {str(e)}")
+
+    def matrix_power(self, matrix, k):
+        """
+        A^k por cuadrados sucesivos (O(log k) productos).
+        
+        Con exponente negativo se eleva la inversa; con matrices racionales
+        el resultado es exacto.
+        """
+        try:
+            k = int(k)
+            exact = self.to_exact(matrix)
+            if exact is not None:
+                base = exact if k >= 0 else self.gauss_jordan_inverse(exact)
+                n = base.shape[0]
+                if base.shape[1] != n:
+                    raise ValueError("La matriz debe ser cuadrada.")
+                result = np.array([[Fraction(int(i == j)) for j in range(n)] for i in range(n)], dtype=object)
+            else:
+                base = self._square(matrix)
+                if k < 0:
+                    lu = self.factorize(base)
+                    if lu.is_singular():
+                        raise ValueError("La matriz es singular, no tiene inversa.")
+                    base = lu.inverse()
+                result = np.eye(base.shape[0])
+
+            def power(base, result, e):
+                while e:
+                    if e & 1:
+                        result = result @ base
+                    e >>= 1
+                    if e:
+                        base = base @ base
+                return result
+
+            return self.format_matrix(self._timed("power", power, base, result, abs(k)))
+        except Exception as e:
+            raise ValueError(f"Error al calcular la potencia: {str(e)}")
+
+    def matrix_exponential(self, matrix):
+        """e^A por escalado y cuadrado con aproximante de Padé (6, 6)."""
+        try:
+            return self._timed("expm", self._cached, "expm", self._square(matrix), self._pade_exponential)
+        except Exception as e:
+            raise ValueError(f"Error al calcular la exponencial: {str(e)}")
+
+    def _pade_exponential(self, matrix):
+        n = matrix.shape[0]
+        norm = np.linalg.norm(matrix, np.inf)
+        # Escalar para que ||A / 2^s|| <= 1/2
+        s = max(0, int(np.ceil(np.log2(norm))) + 1) if norm > 0 else 0
+        X = matrix / (2.0 ** s)
+        q = 6
+        c = 1.0
+        power = np.eye(n)
+        N = np.eye(n)
+        D = np.eye(n)
+        for k in range(1, q + 1):
+            c = c * (q - k + 1) / (k * (2 * q - k + 1))
+            power = power @ X
+            N += c * power
+            D += (-1) ** k * c * power
+        E = LUFactorization(D).solve(N)
+        for _ in range(s):
+            E = E @ E
+        return E
+
+    def set_blas_threads(self, n):
+        """Limita el número de hilos de BLAS para todas las operaciones siguientes."""
+        try:
+            self.blas.set_threads(n)
+        except Exception as e:
+            raise ValueError(f"Error al cambiar los hilos de BLAS: {str(e)}")
+
+    def benchmark(self, sizes=(128, 256, 512, 1024), threads=(None,), operations=None, repeats=3, seed=0):
+        """
+        Mide GFLOP/s del producto, la resolución, la inversa y el determinante
+        por tamaño y número de hilos.
+        
+        Se llama directamente a NumPy (A @ B, np.linalg.solve, inv, det) para
+        medir BLAS/LAPACK, que es lo que cambia con el número de hilos; la LU
+        por bloques propia no lo usa en todos sus pasos. threads=None usa la
+        configuración actual de BLAS y se toma el mejor de repeats intentos.
+        Devuelve una lista de filas {operation, n, threads, seconds, gflops}.
+        """
+        operations = tuple(operations or self.BENCHMARK_FLOPS)
+        unknown = set(operations) - set(self.BENCHMARK_FLOPS)
+        if unknown:
+            raise ValueError(f"Operaciones desconocidas: {', '.join(sorted(unknown))}")
+        functions = {
+            "matmul": lambda A, B: A @ B,
+            "solve": lambda A, B: np.linalg.solve(A, B),
+            "inverse": lambda A, B: np.linalg.inv(A),
+            "determinant": lambda A, B: np.linalg.det(A),
+        }
+        rng = np.random.default_rng(seed)
+        rows = []
+        for n_threads in threads:
+            with self.blas.limit(n_threads):
+                used = self.blas.get_threads()
+                for n in sizes:
+                    A = rng.standard_normal((n, n))
+                    B = rng.standard_normal((n, n))
+                    for op in operations:
+                        best = np.inf
+                        for _ in range(repeats):
+                            start = time.perf_counter()
+                            functions[op](A, B)
+                            best = min(best, time.perf_counter() - start)
+                        rows.append({
+                            "operation": op,
+                            "n": n,
+                            "threads": used,
+                            "seconds": best,
+                            "gflops": self.BENCHMARK_FLOPS[op](n) / best / 1e9,
+                        })
+        return rows
+
+    def compare_timings(self, sizes, operations=None, repeats=3, seed=0):
+        """
+        Mide cada operación sobre matrices aleatorias de los tamaños dados.
+        
+        Se usan matrices simétricas definidas positivas para que todas las
+        operaciones (incluida Cholesky) estén definidas, y matrices nuevas en
+        cada repetición con la caché vacía. Devuelve {operación: [segundos
+        por tamaño]} con el mejor tiempo de las repeticiones y, en la clave
+        "exponent", la pendiente log-log de cada operación (≈ 3 para O(n^3)).
+        """
+        operations = tuple(operations or self.TIMED_OPERATIONS)
+        functions = {
+            "lu": lambda m: self._timed("lu", LUFactorization, m),
+            "qr": self.qr_decomposition,
+            "cholesky": self.cholesky_decomposition,
+            "svd": self.svd_decomposition,
+            "eig": self.eigen_decomposition,
+            "rank": self.calculate_rank,
+            "pinv": self.pseudoinverse,
+            "expm": self.matrix_exponential,
+        }
+        unknown = set(operations) - set(functions)
+        if unknown:
+            raise ValueError(f"Operaciones desconocidas: {', '.join(sorted(unknown))}")
+        rng = np.random.default_rng(seed)
+        results = {op: [] for op in operations}
+        for n in sizes:
+            best = dict.fromkeys(operations, np.inf)
+            for _ in range(repeats):
+                M = rng.standard_normal((n, n))
+                M = M @ M.T / n + np.eye(n)
+                for op in operations:
+                    # Sin caché: rango y pseudoinversa no deben reutilizar la SVD ya medida
+                    self._factorizations.clear()
+                    functions[op](M)
+                    best[op] = min(best[op], self.timings[op])
+            for op in operations:
+                results[op].append(best[op])
+        if len(sizes) > 1:
+            log_n = np.log(np.asarray(sizes, dtype=float))
+            results["exponent"] = {
+                op: float(np.polyfit(log_n, np.log(np.maximum(results[op], 1e-9)), 1)[0])
+                for op in operations
+            }
+        return results
+
+    def solve(self, matrix_a, b, method="auto"):
+        """
+        Resuelve A x = b: exacto si A y b son racionales, si no por LU.
+        
+        Con matrices dispersas method puede ser "lu", "cg" o "gmres"; "auto" usa
+        gradiente conjugado si A es simétrica con diagonal positiva y LU dispersa
+        en otro caso.
+        """
+        try:
+            sparse = self.as_sparse(matrix_a)
+            if sparse is not None:
+                return self._solve_sparse(sparse, b, method)
+
+            exact_a = self.to_exact(matrix_a)
+            exact_b = self.to_exact(np.reshape(b, (len(b), -1)))
+            if exact_a is not None and exact_b is not None:
+                n = exact_a.shape[0]
+                if exact_a.shape != (n, n):
+                    raise ValueError("La matriz debe ser cuadrada.")
+                M, pivots = self.rref_exact(np.hstack([exact_a, exact_b]), n_cols=n)
+                if len(pivots) < n:
+                    raise ValueError("La matriz es singular, el sistema no tiene solución única.")
+                x = np.array([row[n:] for row in M], dtype=object)
+                return self.format_matrix(x).reshape(np.shape(b))
+
+            lu = self.factorize(matrix_a)
+            if lu.is_singular():
+                raise ValueError("La matriz es singular, el sistema no tiene solución única.")
+            return lu.solve(b)
+        except Exception as e:
+            raise ValueError(f"Error al resolver el sistema: {str(e)}")
+
+    def _sparse_or_dense(self, matrix):
+        sparse = self.as_sparse(matrix)
+        return sparse if sparse is not None else matrix
+
+    def _solve_sparse(self, matrix, b, method):
+        b = np.asarray(b, dtype=float)
+        if matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("La matriz debe ser cuadrada.")
+        if method == "auto":
+            spd_candidate = matrix.is_symmetric() and np.all(matrix.diagonal() > 0)
+            method = "cg" if spd_candidate and b.ndim == 1 else "lu"
+        if method == "cg":
+            try:
+                return conjugate_gradient(matrix, b)[0]
+            except ValueError:
+                # No era definida positiva o no convergió: usar LU dispersa
+                method = "lu"
+        if method == "gmres":
+            return self._gmres_columns(matrix, b)
+        try:
+            lu = self.factorize(matrix)
+        except ValueError:
+            # La banda de la LU no cabe en memoria: resolver por GMRES
+            return self._gmres_columns(matrix, b)
+        if lu.is_singular():
+            raise ValueError("La matriz es singular, el sistema no tiene solución única.")
+        return lu.solve(b)
+
+    def _gmres_columns(self, matrix, b):
+        if b.ndim == 1:
+            return gmres(matrix, b)[0]
+        return np.column_stack([gmres(matrix, b[:, j])[0] for j in range(b.shape[1])])
+
+    def _operands(self, matrix_a, matrix_b):
+        # Si ambas matrices son exactas se opera con Fraction; si no, en float
+        exact_a = self.to_exact(matrix_a)
+        exact_b = self.to_exact(matrix_b)
+        if exact_a is not None and exact_b is not None:
+            return exact_a, exact_b
+        return np.asarray(matrix_a, dtype=float), np.asarray(matrix_b, dtype=float)
+
+    def as_integer(self, matrix):
+        """Devuelve la matriz como enteros (int64 o enteros de Python si no caben) o None."""
+        if isinstance(matrix, CSRMatrix):
+            return None
+        matrix = np.asarray(matrix)
+        if np.issubdtype(matrix.dtype, np.integer):
+            return matrix.astype(np.int64)
+        if np.issubdtype(matrix.dtype, np.floating):
+            if np.all(np.abs(matrix) < 2**53) and np.all(matrix == np.round(matrix)):
+                return matrix.astype(np.int64)
+            return None
+        if matrix.dtype == object:
+            values = matrix.ravel().tolist()
+            if not all(isinstance(v, (int, np.integer)) or (isinstance(v, Fraction) and v.denominator == 1) for v in values):
+                return None
+            values = [int(v) for v in values]
+            if all(-2**63 < v < 2**63 for v in values):
+                return np.array(values, dtype=np.int64).reshape(matrix.shape)
+            result = np.empty(matrix.shape, dtype=object)
+            result.ravel()[:] = values
+            return result
+        return None
+
+    def _limbs(self, matrix, width):
+        # Descompone |x| en trozos de width bits con el signo de x: x = sum(limb_i * 2^(i*width))
+        sign = np.sign(matrix)
+        magnitude = np.abs(matrix)
+        mask = (1 << width) - 1
+        limbs = []
+        while True:
+            limbs.append((sign * (magnitude & mask)).astype(float))
+            magnitude = magnitude >> width
+            if not np.any(magnitude):
+                return limbs
+
+    def integer_matmul(self, matrix_a, matrix_b):
+        """
+        Producto exacto de matrices enteras usando BLAS en float.
+        
+        Un float solo representa enteros exactos hasta 2^53. Si el resultado
+        puede superarlo, cada entrada se parte en trozos de w bits y la
+        dimensión interna en bloques de INTEGER_BLOCK, de modo que cada
+        producto parcial sea exacto; los parciales se acumulan en int64 o, si
+        el resultado no cabe, en enteros de Python.
+        """
+        A = self.as_integer(matrix_a)
+        B = self.as_integer(matrix_b)
+        if A is None or B is None:
+            raise ValueError("Las matrices deben ser enteras.")
+        if A.ndim != 2 or B.ndim != 2 or A.shape[1] != B.shape[0]:
+            raise ValueError("Las dimensiones no son compatibles.")
+        k = A.shape[1]
+        max_a = int(np.abs(A).max()) if A.size else 0
+        max_b = int(np.abs(B).max()) if B.size else 0
+        bound = max_a * max_b * k
+        if bound < 2**53:
+            return np.rint(A.astype(float) @ B.astype(float)).astype(np.int64)
+
+        block = min(k, self.INTEGER_BLOCK)
+        # (2^w)^2 * block < 2^53: cada producto de trozos sumado sobre el bloque es exacto
+        width = (53 - block.bit_length()) // 2
+        big = bound >= 2**63
+        result = np.zeros((A.shape[0], B.shape[1]), dtype=object if big else np.int64)
+        limbs_b = self._limbs(B, width)
+        for start in range(0, k, block):
+            end = min(start + block, k)
+            limbs_a = self._limbs(A[:, start:end], width)
+            for i, limb_a in enumerate(limbs_a):
+                for j, limb_b in enumerate(limbs_b):
+                    partial = np.rint(limb_a @ limb_b[start:end]).astype(np.int64)
+                    shift = width * (i + j)
+                    if big:
+                        result += partial.astype(object) * (1 << shift)
+                    else:
+                        result += partial << shift
+        return result
+
+    def _sparse_operands(self, matrix_a, matrix_b):
+        # Solo se opera en CSR si alguna de las dos ya es dispersa o lo merece
+        sparse_a = self.as_sparse(matrix_a)
+        sparse_b = self.as_sparse(matrix_b)
+        if sparse_a is None and sparse_b is None:
+            return None
+        return sparse_a, sparse_b
+
     def add_matrices(self, matrix_a, matrix_b):
         try:
+            sparse = self._sparse_operands(matrix_a, matrix_b)
+            if sparse is not None and None not in sparse:
+                return sparse[0] + sparse[1]
+            if sparse is not None:
+                return self.format_matrix(self._dense(matrix_a) + self._dense(matrix_b))
+            matrix_a, matrix_b = self._operands(matrix_a, matrix_b)
             result = matrix_a + matrix_b
             return self.format_matrix(result)
         except:
@@ -31,6 +935,12 @@ class MatrixOperations:
 
     def subtract_matrices(self, matrix_a, matrix_b):
         try:
+            sparse = self._sparse_operands(matrix_a, matrix_b)
+            if sparse is not None and None not in sparse:
+                return sparse[0] - sparse[1]
+            if sparse is not None:
+                return self.format_matrix(self._dense(matrix_a) - self._dense(matrix_b))
+            matrix_a, matrix_b = self._operands(matrix_a, matrix_b)
             result = matrix_a - matrix_b
             return self.format_matrix(result)
         except:
@@ -38,33 +948,146 @@ class MatrixOperations:
 
     def multiply_matrices(self, matrix_a, matrix_b):
         try:
+            sparse = self._sparse_operands(matrix_a, matrix_b)
+            if sparse is not None:
+                sparse_a, sparse_b = sparse
+                if sparse_a is not None and sparse_b is not None:
+                    return sparse_a @ sparse_b
+                if sparse_a is not None:
+                    return self.format_matrix(sparse_a @ self._dense(matrix_b))
+                # A densa por B dispersa: (B^T A^T)^T
+                return self.format_matrix((sparse_b.transpose() @ self._dense(matrix_a).T).T)
+            if self.to_exact(matrix_a) is None or self.to_exact(matrix_b) is None:
+                # Matrices enteras grandes: producto exacto aunque supere 2^53
+                int_a = self.as_integer(matrix_a)
+                int_b = self.as_integer(matrix_b)
+                if int_a is not None and int_b is not None:
+                    return self.integer_matmul(int_a, int_b)
+            matrix_a, matrix_b = self._operands(matrix_a, matrix_b)
             result = np.matmul(matrix_a, matrix_b)
             return self.format_matrix(result)
         except:
             raise ValueError("No se pudieron multiplicar las matrices. Asegúrese de que las dimensiones sean compatibles.")
 
+    def simplify_fraction(self, frac):
+        # Las fracciones con denominador 1 se muestran como enteros
+        return frac.numerator if frac.denominator == 1 else frac
+
     def decimal_to_fraction(self, decimal, max_denominator=100):
         try:
+            # Los valores exactos no se aproximan
+            if isinstance(decimal, Fraction):
+                return self.simplify_fraction(decimal)
+
             # Si el número es muy cercano a un entero, lo devolvemos como entero
             if abs(decimal - round(decimal)) < 1e-10:
                 return round(decimal)
-            
+
             # Convertimos a fracción
             frac = Fraction(decimal).limit_denominator(max_denominator)
-            
+
             # Si el denominador es 1, devolvemos solo el numerador
             if frac.denominator == 1:
                 return frac.numerator
-            
+
             # Si el numerador es negativo, movemos el signo al numerador
             if frac.denominator < 0:
                 frac = Fraction(-frac.numerator, -frac.denominator)
-            
+
             return frac
         except:
             return decimal
 
+    def rational_approximation(self, values, max_denominator=100):
+        """
+        Versión vectorizada de decimal_to_fraction: aproxima todo el array por
+        fracciones continuas a la vez, con el mismo criterio que
+        Fraction.limit_denominator.
+        
+        Returns:
+            tuple: (numeradores, denominadores) como arrays int64; los valores a
+            menos de 1e-10 de un entero se devuelven con denominador 1
+        """
+        x = np.asarray(values, dtype=float)
+        sign = np.where(x < 0, -1, 1)
+        r = np.abs(x)
+
+        # Convergentes p/q; (p0, q0) es el anterior y (p1, q1) el actual
+        p0, q0 = np.zeros(x.shape), np.ones(x.shape)
+        p1, q1 = np.ones(x.shape), np.zeros(x.shape)
+        active = np.ones(x.shape, dtype=bool)
+        # Se guardan el penúltimo y último convergente válidos y el término que excedió el límite
+        k = np.zeros(x.shape)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for _ in range(64):
+                a = np.floor(r)
+                q2 = q0 + a * q1
+                exceeded = active & (q2 > max_denominator)
+                # Mayor semiconvergente admisible para los que superan el denominador máximo
+                k = np.where(exceeded, np.floor((max_denominator - q0) / q1), k)
+                active &= ~exceeded
+                p2 = p0 + a * p1
+                p0, q0, p1, q1 = (np.where(active, p1, p0), np.where(active, q1, q0),
+                                  np.where(active, p2, p1), np.where(active, q2, q1))
+                frac = r - a
+                active &= frac > 0
+                if not active.any():
+                    break
+                r = np.where(active, 1.0 / frac, r)
+
+            # Elegir entre el semiconvergente y el último convergente el más cercano
+            bound1 = (p0 + k * p1) / (q0 + k * q1)
+            bound2 = p1 / q1
+            ax = np.abs(x)
+            use_bound1 = (k > 0) & (np.abs(bound1 - ax) < np.abs(bound2 - ax))
+            num = np.where(use_bound1, p0 + k * p1, p1)
+            den = np.where(use_bound1, q0 + k * q1, q1)
+
+        # Valores casi enteros, como en decimal_to_fraction
+        near_int = np.abs(x - np.round(x)) < 1e-10
+        num = np.where(near_int, np.round(ax), num)
+        den = np.where(near_int, 1, den)
+        return (sign * num).astype(np.int64), den.astype(np.int64)
+
+    def matrix_to_strings(self, matrix, max_denominator=100):
+        """Convierte toda la matriz a texto ("a/b" o "a") en una sola operación vectorizada."""
+        matrix = np.asarray(matrix)
+        if np.issubdtype(matrix.dtype, np.integer):
+            return matrix.astype(str)
+        if matrix.dtype == object:
+            exact = self.to_exact(matrix)
+            num = np.vectorize(lambda f: f.numerator, otypes=[object])(exact).astype(str)
+            den = np.vectorize(lambda f: f.denominator, otypes=[object])(exact).astype(str)
+            return np.where(den == '1', num, np.char.add(np.char.add(num, '/'), den))
+        values = matrix.astype(float)
+        finite = np.isfinite(values) & (np.abs(values) < 2**62)
+        num, den = self.rational_approximation(np.where(finite, values, 0), max_denominator)
+        text = np.where(den == 1, num.astype(str), np.char.add(np.char.add(num.astype(str), '/'), den.astype(str)))
+        return np.where(finite, text, values.astype(str))
+
+    def _dense(self, matrix):
+        if isinstance(matrix, CSRMatrix):
+            return matrix.to_dense()
+        return np.asarray(matrix, dtype=float)
+
     def format_matrix(self, matrix):
         if matrix is None:
             return None
-        return np.array([[self.decimal_to_fraction(x) for x in row] for row in matrix]) 
\ No newline at end of file
+        if isinstance(matrix, CSRMatrix):
+            return matrix
+        if np.size(matrix) > self.FORMAT_MAX_ELEMENTS:
+            # Matrices grandes: se devuelven como array numérico sin formatear
+            return np.asarray(matrix, dtype=float)
+        matrix = np.asarray(matrix)
+        if matrix.dtype == object:
+            return np.vectorize(self.decimal_to_fraction, otypes=[object])(matrix)
+        values = matrix.astype(float)
+        finite = np.isfinite(values) & (np.abs(values) < 2**62)
+        num, den = self.rational_approximation(np.where(finite, values, 0))
+        # Los enteros quedan como int y el resto como Fraction; el cálculo ya se hizo en bloque
+        result = np.empty(values.shape, dtype=object)
+        result[...] = num.astype(object)
+        frac_idx = np.nonzero(finite & (den != 1))
+        result[frac_idx] = [Fraction(int(n), int(d)) for n, d in zip(num[frac_idx], den[frac_idx])]
+        result[~finite] = values[~finite]
+        return result
@@ -0,0 +1,127 @@
+import re
+import warnings
+import numpy as np
+
+# Con ';' o tabuladores como separador la coma es decimal ("1,5; 2,5");
+# si no, la coma separa valores ("1, 2, 3")
+_DECIMAL_COMMA = str.maketrans({';': ' ', '\t': ' ', ',': '.'})
+_COMMA_SEPARATOR = str.maketrans({';': ' ', '\t': ' ', ',': ' '})
+_TOKEN_DECIMAL_COMMA = re.compile(r'[^\s;]+')
+_TOKEN_COMMA_SEPARATOR = re.compile(r'[^\s;,]+')
+
+def _uses_decimal_comma(text):
+    return ';' in text or '\t' in text
+
+def _parse_token(token):
+    # Conversión de un único valor; solo se usa para localizar errores
+    if '/' in token:
+        num, _, den = token.partition('/')
+        if float(den) == 0:
+            raise ZeroDivisionError
+        return float(num) / float(den)
+    return float(token)
+
+def _error(text, tokens, decimal_comma):
+    """Construye el error con el primer valor no válido y su posición en el texto."""
+    for index, token in enumerate(tokens):
+        try:
+            _parse_token(token)
+        except (ValueError, ZeroDivisionError) as e:
+            pattern = _TOKEN_DECIMAL_COMMA if decimal_comma else _TOKEN_COMMA_SEPARATOR
+            match = next(m for i, m in enumerate(pattern.finditer(text)) if i == index)
+            line = text.count('\n', 0, match.start()) + 1
+            column = match.start() - (text.rfind('\n', 0, match.start()) + 1) + 1
+            reason = "división por cero" if isinstance(e, ZeroDivisionError) else "no es un número"
+            return ValueError(
+                f"Valor no válido '{match.group()}' ({reason}) en la posición {index + 1}, "
+                f"línea {line}, columna {column}"
+            )
+    return ValueError("Entrada no válida")
+
+def _fast_convert(normalized, tokens):
+    # Sin fracciones el texto normalizado se convierte entero en C, sin crear un
+    # objeto por valor; devuelve None si hay algo que no es un número. Según la
+    # versión de NumPy, fromstring lanza ValueError o se detiene en el primer
+    # valor no válido (con un DeprecationWarning), así que se compara el número
+    # de valores leídos con el de tokens
+    if not tokens:
+        return None
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            values = np.fromstring(normalized, sep=' ')
+    except ValueError:
+        return None
+    return values if len(values) == len(tokens) else None
+
+def _convert(tokens, text, decimal_comma):
+    try:
+        # Fracciones a/b: numeradores y denominadores se convierten en bloque
+        tokens = np.array(tokens)
+        is_fraction = np.char.find(tokens, '/') >= 0
+        values = np.empty(len(tokens))
+        values[~is_fraction] = tokens[~is_fraction].astype(float)
+        parts = np.char.partition(tokens[is_fraction], '/')
+        num = parts[:, 0].astype(float)
+        den = parts[:, 2].astype(float)
+        if np.any(den == 0):
+            raise ZeroDivisionError
+        values[is_fraction] = num / den
+        return values
+    except (ValueError, ZeroDivisionError):
+        raise _error(text, list(tokens), decimal_comma) from None
+
+def parse_numbers(text):
+    """
+    Convierte un texto con números en un array float.
+
+    Acepta enteros, decimales, notación científica y fracciones "a/b",
+    separados por comas, espacios o ';'. Si el separador es ';' (o un
+    tabulador) la coma se interpreta como coma decimal. La conversión se hace
+    en bloque con NumPy (np.fromstring sin fracciones); solo si falla se
+    recorre el texto para indicar el primer valor no válido y su posición.
+    """
+    decimal_comma = _uses_decimal_comma(text)
+    normalized = text.translate(_DECIMAL_COMMA if decimal_comma else _COMMA_SEPARATOR)
+    tokens = normalized.split()
+    if '/' not in text:
+        values = _fast_convert(normalized, tokens)
+        if values is not None:
+            return values
+    if not tokens:
+        raise ValueError("No se ha introducido ningún número")
+    return _convert(tokens, text, decimal_comma)
+
+def parse_table(text):
+    """
+    Convierte un texto con una fila de números por línea en un array (filas, columnas).
+
+    Usa las mismas reglas que parse_numbers; las líneas vacías se ignoran,
+    todas las filas deben tener el mismo número de valores y no se admiten
+    campos vacíos ("1,,2").
+    """
+    decimal_comma = _uses_decimal_comma(text)
+    normalized = text.translate(_DECIMAL_COMMA if decimal_comma else _COMMA_SEPARATOR)
+    tokens = normalized.split()
+    values = _fast_convert(normalized, tokens) if '/' not in text else None
+    if values is None:
+        if not tokens:
+            raise ValueError("No se ha introducido ningún número")
+        values = _convert(tokens, text, decimal_comma)
+    # Cada fila se comprueba aunque el total sea múltiplo del ancho: "1 2\n3 4 5\n6"
+    # no debe leerse como una tabla 3 x 2
+    separators = re.compile(r'[;\t]' if decimal_comma else r',')
+    n_rows = 0
+    n_cols = None
+    for number, (line, original) in enumerate(zip(normalized.split('\n'), text.split('\n')), start=1):
+        count = len(line.split())
+        if not count:
+            continue
+        if any(not field.strip() for field in separators.split(original)):
+            raise ValueError(f"La línea {number} tiene un campo vacío")
+        if n_cols is None:
+            n_cols = count
+        elif count != n_cols:
+            raise ValueError(f"La línea {number} tiene {count} valores y la primera tiene {n_cols}")
+        n_rows += 1
+    return values.reshape(n_rows, n_cols)
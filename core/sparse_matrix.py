@@ -0,0 +1,364 @@
+import numpy as np
+
+class CSRMatrix:
+    """
+    Matriz dispersa en formato CSR (filas comprimidas).
+
+    data[indptr[i]:indptr[i + 1]] son los valores no nulos de la fila i y
+    indices[...] sus columnas. Memoria y tiempo dependen del número de no nulos.
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    @classmethod
+    def from_dense(cls, matrix):
+        matrix = np.asarray(matrix, dtype=float)
+        rows, cols = np.nonzero(matrix)
+        return cls.from_coo(rows, cols, matrix[rows, cols], matrix.shape)
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        """Construye la matriz a partir de coordenadas; los duplicados se suman."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        n_rows, n_cols = shape
+
+        keys = rows * n_cols + cols
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        values = values[order]
+        if keys.size:
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1])
+            keys = keys[starts]
+            values = np.add.reduceat(values, starts)
+        keep = values != 0
+        keys = keys[keep]
+        values = values[keep]
+
+        rows = keys // n_cols
+        counts = np.bincount(rows, minlength=n_rows)
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        return cls(values, keys % n_cols, indptr, shape)
+
+    @property
+    def nnz(self):
+        return int(self.data.size)
+
+    @property
+    def density(self):
+        return self.nnz / max(self.shape[0] * self.shape[1], 1)
+
+    def row_ids(self):
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def to_coo(self):
+        return self.row_ids(), self.indices.copy(), self.data.copy()
+
+    def to_dense(self):
+        dense = np.zeros(self.shape)
+        dense[self.row_ids(), self.indices] = self.data
+        return dense
+
+    def transpose(self):
+        rows, cols, values = self.to_coo()
+        return CSRMatrix.from_coo(cols, rows, values, (self.shape[1], self.shape[0]))
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def diagonal(self):
+        rows = self.row_ids()
+        on_diag = rows == self.indices
+        diag = np.zeros(min(self.shape))
+        diag[rows[on_diag]] = self.data[on_diag]
+        return diag
+
+    def is_symmetric(self, tol=1e-12):
+        if self.shape[0] != self.shape[1]:
+            return False
+        diff = self - self.transpose()
+        return diff.nnz == 0 or np.abs(diff.data).max() <= tol * max(np.abs(self.data).max(), 1.0)
+
+    def _combine(self, other, sign):
+        if self.shape != other.shape:
+            raise ValueError("Las matrices deben tener las mismas dimensiones.")
+        r1, c1, v1 = self.to_coo()
+        r2, c2, v2 = other.to_coo()
+        return CSRMatrix.from_coo(
+            np.concatenate([r1, r2]), np.concatenate([c1, c2]), np.concatenate([v1, sign * v2]), self.shape
+        )
+
+    def __add__(self, other):
+        return self._combine(other, 1.0)
+
+    def __sub__(self, other):
+        return self._combine(other, -1.0)
+
+    def __neg__(self):
+        return CSRMatrix(-self.data, self.indices, self.indptr, self.shape)
+
+    def scale(self, factor):
+        return CSRMatrix(self.data * factor, self.indices, self.indptr, self.shape)
+
+    def matvec(self, x):
+        """Producto A @ x para un vector o una matriz densa de columnas."""
+        x = np.asarray(x, dtype=float)
+        if x.shape[0] != self.shape[1]:
+            raise ValueError("Dimensiones incompatibles para el producto.")
+        rows = self.row_ids()
+        if x.ndim == 1:
+            return np.bincount(rows, weights=self.data * x[self.indices], minlength=self.shape[0])
+        products = self.data[:, None] * x[self.indices]
+        return np.column_stack([
+            np.bincount(rows, weights=products[:, j], minlength=self.shape[0]) for j in range(x.shape[1])
+        ]) if x.shape[1] else np.zeros((self.shape[0], 0))
+
+    def matmul_sparse(self, other):
+        """Producto disperso por disperso; el coste depende de los productos no nulos."""
+        if self.shape[1] != other.shape[0]:
+            raise ValueError("Dimensiones incompatibles para el producto.")
+        a_rows, a_cols, a_vals = self.to_coo()
+        # Cada no nulo A[i, k] se combina con toda la fila k de B
+        counts = np.diff(other.indptr)[a_cols]
+        total = int(counts.sum())
+        starts = other.indptr[a_cols]
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        rows = np.repeat(a_rows, counts)
+        cols = other.indices[offsets]
+        values = np.repeat(a_vals, counts) * other.data[offsets]
+        return CSRMatrix.from_coo(rows, cols, values, (self.shape[0], other.shape[1]))
+
+    def __matmul__(self, other):
+        if isinstance(other, CSRMatrix):
+            return self.matmul_sparse(other)
+        return self.matvec(other)
+
+    def bandwidth(self):
+        rows = self.row_ids()
+        if not rows.size:
+            return 0, 0
+        offsets = rows - self.indices
+        return int(max(offsets.max(), 0)), int(max(-offsets.min(), 0))
+
+    def permute(self, order):
+        """Permutación simétrica P A P^T con la nueva numeración order."""
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        rows, cols, values = self.to_coo()
+        return CSRMatrix.from_coo(inverse[rows], inverse[cols], values, self.shape)
+
+    def reverse_cuthill_mckee(self):
+        """Ordenación de Cuthill-McKee inversa sobre el patrón de A + A^T para reducir el ancho de banda."""
+        n = self.shape[0]
+        rows, cols, _ = self.to_coo()
+        pattern = CSRMatrix.from_coo(np.concatenate([rows, cols]), np.concatenate([cols, rows]), np.ones(2 * len(rows)), self.shape)
+        degree = np.diff(pattern.indptr)
+        visited = np.zeros(n, dtype=bool)
+        order = []
+        for start in np.argsort(degree, kind='stable'):
+            if visited[start]:
+                continue
+            visited[start] = True
+            queue = [start]
+            head = 0
+            while head < len(queue):
+                node = queue[head]
+                head += 1
+                neighbours = pattern.indices[pattern.indptr[node]:pattern.indptr[node + 1]]
+                neighbours = neighbours[~visited[neighbours]]
+                neighbours = neighbours[np.argsort(degree[neighbours], kind='stable')]
+                visited[neighbours] = True
+                queue.extend(neighbours.tolist())
+            order.extend(queue)
+        return np.array(order[::-1], dtype=np.int64)
+
+
+class SparseLU:
+    """
+    Factorización LU de una matriz dispersa cuadrada.
+
+    Se reordena con Cuthill-McKee inversa para concentrar los no nulos cerca de
+    la diagonal y se factoriza en almacenamiento de banda con pivoteo parcial
+    (como dgbtrf de LAPACK). La banda es densa: ocupa n * (2 kl + ku + 1)
+    elementos aunque la mayoría sean ceros, así que solo conviene con matrices
+    de banda estrecha tras el reordenamiento. Si la banda supera MAX_BAND_ENTRIES
+    se lanza ValueError y hay que usar un método iterativo (CG o GMRES).
+    """
+
+    # Elementos máximos de la banda densa (400 MB en float64)
+    MAX_BAND_ENTRIES = 5 * 10**7
+
+    def __init__(self, matrix):
+        if matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("La matriz debe ser cuadrada.")
+        n = matrix.shape[0]
+        self.n = n
+        self.order = matrix.reverse_cuthill_mckee()
+        A = matrix.permute(self.order)
+        kl, ku = A.bandwidth()
+        entries = n * (2 * kl + ku + 1)
+        if entries > self.MAX_BAND_ENTRIES:
+            raise ValueError(
+                f"La banda de la factorización LU tendría {entries} elementos "
+                f"(máximo {self.MAX_BAND_ENTRIES}); use un método iterativo."
+            )
+        self.kl, self.ku = kl, ku
+        # Las filas extra guardan el relleno que produce el pivoteo
+        self.offset = kl + ku
+        ab = np.zeros((2 * kl + ku + 1, n))
+        rows, cols, values = A.to_coo()
+        ab[self.offset + rows - cols, cols] = values
+
+        self.ipiv = np.arange(n)
+        self.singular = False
+        for k in range(n):
+            last_row = min(k + kl, n - 1)
+            last_col = min(k + kl + ku, n - 1)
+            column = ab[self.offset:self.offset + last_row - k + 1, k]
+            p = k + int(np.argmax(np.abs(column)))
+            self.ipiv[k] = p
+            if ab[self.offset + p - k, k] == 0:
+                self.singular = True
+                continue
+            cols_k = np.arange(k, last_col + 1)
+            if p != k:
+                top = ab[self.offset + k - cols_k, cols_k].copy()
+                ab[self.offset + k - cols_k, cols_k] = ab[self.offset + p - cols_k, cols_k]
+                ab[self.offset + p - cols_k, cols_k] = top
+            if last_row > k:
+                pivot = ab[self.offset, k]
+                ab[self.offset + 1:self.offset + last_row - k + 1, k] /= pivot
+                multipliers = ab[self.offset + 1:self.offset + last_row - k + 1, k]
+                rows_i = np.arange(k + 1, last_row + 1)
+                cols_j = cols_k[1:]
+                u_row = ab[self.offset + k - cols_j, cols_j]
+                idx = self.offset + rows_i[:, None] - cols_j[None, :]
+                ab[idx, cols_j[None, :]] -= multipliers[:, None] * u_row[None, :]
+        self.ab = ab
+
+    def log_determinant(self):
+        """Devuelve (signo, log|det|) para evitar desbordamientos con n grande."""
+        if self.singular:
+            return 0.0, -np.inf
+        diag = self.ab[self.offset]
+        swaps = int(np.sum(self.ipiv != np.arange(self.n)))
+        sign = (-1) ** swaps * np.prod(np.sign(diag))
+        return float(sign), float(np.sum(np.log(np.abs(diag))))
+
+    def determinant(self):
+        sign, logdet = self.log_determinant()
+        return sign * np.exp(logdet)
+
+    def is_singular(self):
+        if self.singular:
+            return True
+        diag = np.abs(self.ab[self.offset])
+        return diag.min() <= np.finfo(float).eps * self.n * diag.max()
+
+    def inverse(self):
+        return self.solve(np.eye(self.n))
+
+    def solve(self, b):
+        if self.singular:
+            raise ValueError("La matriz es singular.")
+        x = np.array(b, dtype=float)[self.order]
+        n, kl, ku = self.n, self.kl, self.ku
+        # L y: permutaciones y multiplicadores en el mismo orden que la factorización
+        for k in range(n):
+            p = self.ipiv[k]
+            if p != k:
+                x[[k, p]] = x[[p, k]]
+            last_row = min(k + kl, n - 1)
+            if last_row > k:
+                x[k + 1:last_row + 1] -= np.multiply.outer(self.ab[self.offset + 1:self.offset + last_row - k + 1, k], x[k])
+        # U x = y
+        for k in range(n - 1, -1, -1):
+            last_col = min(k + kl + ku, n - 1)
+            if last_col > k:
+                cols = np.arange(k + 1, last_col + 1)
+                x[k] -= self.ab[self.offset + k - cols, cols] @ x[k + 1:last_col + 1]
+            x[k] /= self.ab[self.offset, k]
+        result = np.empty_like(x)
+        result[self.order] = x
+        return result
+
+
+def conjugate_gradient(matrix, b, tol=1e-10, max_iter=None):
+    """Gradiente conjugado para matrices simétricas definidas positivas."""
+    b = np.asarray(b, dtype=float)
+    max_iter = max_iter or 10 * len(b)
+    x = np.zeros_like(b)
+    r = b.copy()
+    p = r.copy()
+    rs = r @ r
+    b_norm = np.linalg.norm(b) or 1.0
+    for iteration in range(1, max_iter + 1):
+        Ap = matrix @ p
+        curvature = p @ Ap
+        if curvature <= 0:
+            raise ValueError("La matriz no es definida positiva.")
+        alpha = rs / curvature
+        x += alpha * p
+        r -= alpha * Ap
+        rs_new = r @ r
+        if np.sqrt(rs_new) <= tol * b_norm:
+            return x, iteration
+        p = r + (rs_new / rs) * p
+        rs = rs_new
+    raise ValueError("El gradiente conjugado no convergió.")
+
+
+def gmres(matrix, b, tol=1e-10, restart=50, max_iter=None):
+    """GMRES con reinicio, usando rotaciones de Givens sobre la matriz de Hessenberg."""
+    b = np.asarray(b, dtype=float)
+    n = len(b)
+    max_iter = max_iter or 10 * n
+    x = np.zeros(n)
+    b_norm = np.linalg.norm(b) or 1.0
+    iterations = 0
+    while iterations < max_iter:
+        r = b - matrix @ x
+        beta = np.linalg.norm(r)
+        if beta <= tol * b_norm:
+            return x, iterations
+        m = min(restart, n)
+        V = np.zeros((m + 1, n))
+        H = np.zeros((m + 1, m))
+        cs = np.zeros(m)
+        sn = np.zeros(m)
+        g = np.zeros(m + 1)
+        g[0] = beta
+        V[0] = r / beta
+        j = 0
+        for j in range(m):
+            iterations += 1
+            # Arnoldi con Gram-Schmidt modificado
+            w = matrix @ V[j]
+            for i in range(j + 1):
+                H[i, j] = w @ V[i]
+                w -= H[i, j] * V[i]
+            H[j + 1, j] = np.linalg.norm(w)
+            if H[j + 1, j] > 0:
+                V[j + 1] = w / H[j + 1, j]
+            for i in range(j):
+                H[i, j], H[i + 1, j] = cs[i] * H[i, j] + sn[i] * H[i + 1, j], -sn[i] * H[i, j] + cs[i] * H[i + 1, j]
+            denom = np.hypot(H[j, j], H[j + 1, j])
+            cs[j], sn[j] = (1.0, 0.0) if denom == 0 else (H[j, j] / denom, H[j + 1, j] / denom)
+            H[j, j] = cs[j] * H[j, j] + sn[j] * H[j + 1, j]
+            H[j + 1, j] = 0.0
+            g[j + 1] = -sn[j] * g[j]
+            g[j] = cs[j] * g[j]
+            if abs(g[j + 1]) <= tol * b_norm or iterations >= max_iter:
+                break
+        k = j + 1
+        y = np.linalg.solve(np.triu(H[:k, :k]), g[:k]) if k else np.zeros(0)
+        x += V[:k].T @ y
+        if abs(g[k]) <= tol * b_norm:
+            return x, iterations
+    raise ValueError("GMRES no convergió.")
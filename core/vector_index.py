@@ -0,0 +1,193 @@
+import time
+import numpy as np
+from core.vector_operations import VectorOperations
+
+class KDTree:
+    """
+    Árbol k-d sobre un array (N, d), guardado en arrays planos.
+
+    Cada nodo cubre los puntos order[start:end] y guarda su caja envolvente;
+    las hojas tienen como mucho leaf_size puntos y se recorren con NumPy.
+    """
+
+    def __init__(self, points, leaf_size=32):
+        self.points = np.ascontiguousarray(points, dtype=float)
+        self.leaf_size = max(1, int(leaf_size))
+        n = len(self.points)
+        self.order = np.arange(n)
+        self.start, self.end, self.left, self.right = [], [], [], []
+        self.lower, self.upper = [], []
+        if n:
+            self._build()
+        self.start = np.array(self.start, dtype=np.int64)
+        self.end = np.array(self.end, dtype=np.int64)
+        self.left = np.array(self.left, dtype=np.int64)
+        self.right = np.array(self.right, dtype=np.int64)
+        self.lower = np.array(self.lower)
+        self.upper = np.array(self.upper)
+
+    def _new_node(self, start, end):
+        box = self.points[self.order[start:end]]
+        self.start.append(start)
+        self.end.append(end)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.lower.append(box.min(axis=0))
+        self.upper.append(box.max(axis=0))
+        return len(self.start) - 1
+
+    def _build(self):
+        stack = [self._new_node(0, len(self.points))]
+        while stack:
+            node = stack.pop()
+            start, end = self.start[node], self.end[node]
+            if end - start <= self.leaf_size:
+                continue
+            # Se divide por la dimensión de mayor extensión, en la mediana
+            dim = int(np.argmax(self.upper[node] - self.lower[node]))
+            if self.upper[node][dim] == self.lower[node][dim]:
+                continue
+            idx = self.order[start:end]
+            mid = (end - start) // 2
+            part = np.argpartition(self.points[idx, dim], mid)
+            self.order[start:end] = idx[part]
+            self.left[node] = self._new_node(start, start + mid)
+            self.right[node] = self._new_node(start + mid, end)
+            stack.extend((self.left[node], self.right[node]))
+
+    def _box_distance2(self, node, q):
+        gap = np.maximum(self.lower[node] - q, 0.0) + np.maximum(q - self.upper[node], 0.0)
+        return gap @ gap
+
+    def query(self, q, k):
+        """Los k puntos más cercanos a q: (distancias al cuadrado, índices), ordenados."""
+        q = np.asarray(q, dtype=float)
+        best_d = np.full(k, np.inf)
+        best_i = np.full(k, -1, dtype=np.int64)
+        stack = [(0.0, 0)]
+        while stack:
+            bound, node = stack.pop()
+            if bound >= best_d[-1]:
+                continue
+            if self.left[node] < 0:
+                idx = self.order[self.start[node]:self.end[node]]
+                diff = self.points[idx] - q
+                d2 = np.einsum('ij,ij->i', diff, diff)
+                all_d = np.concatenate([best_d, d2])
+                all_i = np.concatenate([best_i, idx])
+                keep = np.argsort(all_d, kind='stable')[:k]
+                best_d, best_i = all_d[keep], all_i[keep]
+                continue
+            children = [(self._box_distance2(child, q), child) for child in (self.left[node], self.right[node])]
+            # El hijo más cercano se visita primero (se apila el último)
+            children.sort(reverse=True)
+            stack.extend(child for child in children if child[0] < best_d[-1])
+        return best_d, best_i
+
+class VectorIndex:
+    """
+    Índice de búsqueda de los k vecinos más cercanos en un conjunto de vectores.
+
+    metric="euclidean" usa la distancia euclídea; metric="cosine" devuelve el
+    ángulo en radianes entre vectores (como angle_between_vectors), buscando
+    sobre los vectores normalizados, donde la distancia euclídea es
+    2 sin(θ/2) y ordena igual que el ángulo.
+
+    method="kdtree" usa un árbol k-d (eficaz en pocas dimensiones),
+    method="brute" compara por bloques con productos de matrices y
+    method="auto" elige según la dimensión y el número de vectores.
+    """
+    # Hasta esta dimensión el árbol k-d descarta ramas de forma eficaz
+    KDTREE_MAX_DIM = 16
+    # Por debajo de este número de vectores la fuerza bruta es más rápida
+    KDTREE_MIN_SIZE = 2000
+    # Filas del conjunto que se comparan en cada producto de matrices
+    BLOCK_SIZE = 8192
+
+    def __init__(self, vectors, metric="euclidean", method="auto", leaf_size=32):
+        self.vector_ops = VectorOperations()
+        if metric not in ("euclidean", "cosine"):
+            raise ValueError(f"Métrica desconocida: {metric}")
+        start = time.perf_counter()
+        data = self.vector_ops.as_batch(vectors)
+        if not len(data):
+            raise ValueError("El conjunto de vectores está vacío")
+        if metric == "cosine":
+            if np.any(self.vector_ops.batch_norms(data) == 0):
+                raise ValueError("No se puede calcular el ángulo con vectores nulos")
+            data = self.vector_ops.batch_normalize(data)
+        if method == "auto":
+            low_dim = data.shape[1] <= self.KDTREE_MAX_DIM
+            method = "kdtree" if low_dim and len(data) >= self.KDTREE_MIN_SIZE else "brute"
+        if method not in ("kdtree", "brute"):
+            raise ValueError(f"Método desconocido: {method}")
+        self.metric = metric
+        self.method = method
+        self.data = np.ascontiguousarray(data)
+        self.tree = KDTree(self.data, leaf_size) if method == "kdtree" else None
+        self.sq_norms = None if self.tree else np.einsum('ij,ij->i', self.data, self.data)
+        self.build_seconds = time.perf_counter() - start
+        self.last_query_seconds = None
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def dimension(self):
+        return self.data.shape[1]
+
+    def query(self, queries, k=1):
+        """
+        Los k vecinos más cercanos de cada consulta.
+
+        Devuelve (distancias, índices), ambos (M, k) y ordenados de más cercano
+        a más lejano; el tiempo de la consulta queda en last_query_seconds.
+        """
+        try:
+            start = time.perf_counter()
+            queries = self.vector_ops.as_batch(queries)
+            if queries.shape[1] != self.dimension:
+                raise ValueError("Los vectores deben tener la misma dimensión")
+            k = int(k)
+            if not 1 <= k <= len(self):
+                raise ValueError(f"k debe estar entre 1 y {len(self)}")
+            if self.metric == "cosine":
+                if np.any(self.vector_ops.batch_norms(queries) == 0):
+                    raise ValueError("No se puede calcular el ángulo con vectores nulos")
+                queries = self.vector_ops.batch_normalize(queries)
+
+            if self.tree is not None:
+                d2 = np.empty((len(queries), k))
+                indices = np.empty((len(queries), k), dtype=np.int64)
+                for row, q in enumerate(queries):
+                    d2[row], indices[row] = self.tree.query(q, k)
+            else:
+                d2, indices = self._brute_force(queries, k)
+
+            distances = np.sqrt(np.maximum(d2, 0.0))
+            if self.metric == "cosine":
+                # Cuerda entre vectores unitarios -> ángulo
+                distances = 2.0 * np.arcsin(np.clip(distances / 2.0, 0.0, 1.0))
+            self.last_query_seconds = time.perf_counter() - start
+            return distances, indices
+        except Exception as e:
+            raise ValueError(f"Error al buscar vecinos: {str(e)}")
+
+    def _brute_force(self, queries, k):
+        # |x - y|^2 = |x|^2 + |y|^2 - 2 x·y, bloque a bloque; se guardan los k mejores
+        q_norms = np.einsum('ij,ij->i', queries, queries)[:, np.newaxis]
+        best_d = np.full((len(queries), k), np.inf)
+        best_i = np.zeros((len(queries), k), dtype=np.int64)
+        rows = np.arange(len(queries))[:, np.newaxis]
+        for start in range(0, len(self), self.BLOCK_SIZE):
+            block = self.data[start:start + self.BLOCK_SIZE]
+            d2 = q_norms + self.sq_norms[start:start + len(block)] - 2.0 * (queries @ block.T)
+            all_d = np.hstack([best_d, d2])
+            all_i = np.hstack([best_i, np.broadcast_to(np.arange(start, start + len(block)), d2.shape)])
+            keep = np.argpartition(all_d, k - 1, axis=1)[:, :k] if all_d.shape[1] > k else np.argsort(all_d, axis=1)
+            best_d, best_i = all_d[rows, keep], all_i[rows, keep]
+        # Distancias exactas de los elegidos (la fórmula expandida pierde precisión) y orden final
+        diff = self.data[best_i] - queries[:, np.newaxis, :]
+        best_d = np.einsum('ijk,ijk->ij', diff, diff)
+        order = np.argsort(best_d, axis=1, kind='stable')
+        return best_d[rows, order], best_i[rows, order]
@@ -1,11 +1,17 @@
+import os
 import numpy as np
+from core.number_parser import parse_numbers, parse_table
 
 class VectorOperations:
+    # Operaciones por lotes disponibles en batch_operation
+    BATCH_OPERATIONS = ("add", "subtract", "dot", "cross", "norm", "normalize", "angle")
+
     def parse_vector(self, entry_text):
+        # Separadores ',' ' ' o ';' (con ';' la coma es decimal) y fracciones "a/b"
         try:
-            return np.array([float(x.strip()) for x in entry_text.split(",")])
-        except:
-            raise ValueError("Entrada no válida. Usa números separados por comas.")
+            return parse_numbers(entry_text)
+        except ValueError as e:
+            raise ValueError(f"Entrada no válida. {str(e)}")
 
     def add_vectors(self, A, B):
         try:
@@ -73,4 +79,134 @@ class VectorOperations:
                 
             return np.arccos(cos_angle)
         except Exception as e:
-            raise ValueError(f"Error al calcular el ángulo: {str(e)}") 
\ No newline at end of file
+            raise ValueError(f"Error al calcular el ángulo: {str(e)}")
+
+    def as_batch(self, vectors):
+        """Convierte un vector o un array (N, d) en array float de dos dimensiones."""
+        batch = np.asarray(vectors, dtype=float)
+        if batch.ndim == 1:
+            batch = batch[np.newaxis, :]
+        if batch.ndim != 2:
+            raise ValueError("Los vectores deben darse como un array (N, d)")
+        return batch
+
+    def _batch_pair(self, A, B):
+        # Mismo número de filas, o una sola fila que se aplica a todas
+        A = self.as_batch(A)
+        B = self.as_batch(B)
+        if A.shape[1] != B.shape[1]:
+            raise ValueError("Los vectores deben tener la misma dimensión")
+        if A.shape[0] != B.shape[0] and 1 not in (A.shape[0], B.shape[0]):
+            raise ValueError(f"Los lotes tienen distinto número de vectores ({A.shape[0]} y {B.shape[0]})")
+        return A, B
+
+    def batch_dot(self, A, B):
+        """Producto escalar fila a fila de dos lotes (N, d); devuelve (N,)."""
+        try:
+            A, B = self._batch_pair(A, B)
+            if A.shape[0] == B.shape[0]:
+                return np.einsum('ij,ij->i', A, B)
+            return (A @ B.T).ravel()
+        except Exception as e:
+            raise ValueError(f"Error al calcular el producto escalar: {str(e)}")
+
+    def pairwise_dot(self, A, B):
+        """Producto escalar de todos los pares: matriz (N, M) con A_i · B_j."""
+        try:
+            A = self.as_batch(A)
+            B = self.as_batch(B)
+            if A.shape[1] != B.shape[1]:
+                raise ValueError("Los vectores deben tener la misma dimensión")
+            return A @ B.T
+        except Exception as e:
+            raise ValueError(f"Error al calcular el producto escalar: {str(e)}")
+
+    def batch_cross(self, A, B):
+        """Producto vectorial fila a fila de dos lotes (N, 3)."""
+        try:
+            A, B = self._batch_pair(A, B)
+            if A.shape[1] != 3:
+                raise ValueError("Los vectores deben ser tridimensionales para el producto vectorial")
+            return np.cross(A, B)
+        except Exception as e:
+            raise ValueError(f"Error al calcular el producto vectorial: {str(e)}")
+
+    def batch_norms(self, A):
+        """Norma euclídea de cada fila; devuelve (N,)."""
+        try:
+            A = self.as_batch(A)
+            return np.sqrt(np.einsum('ij,ij->i', A, A))
+        except Exception as e:
+            raise ValueError(f"Error al calcular la magnitud: {str(e)}")
+
+    def batch_normalize(self, A):
+        """Vector unitario de cada fila; los vectores nulos quedan como NaN."""
+        try:
+            A = self.as_batch(A)
+            norms = self.batch_norms(A)[:, np.newaxis]
+            return np.divide(A, norms, out=np.full_like(A, np.nan), where=norms > 0)
+        except Exception as e:
+            raise ValueError(f"Error al calcular el vector unitario: {str(e)}")
+
+    def batch_angles(self, A, B):
+        """Ángulo (radianes) entre cada par de filas; NaN si alguno de los vectores es nulo."""
+        try:
+            A, B = self._batch_pair(A, B)
+            denom = self.batch_norms(A) * self.batch_norms(B)
+            cos_angle = np.divide(self.batch_dot(A, B), denom, out=np.full(denom.shape, np.nan), where=denom > 0)
+            # Ajustar por errores de precisión
+            return np.arccos(np.clip(cos_angle, -1.0, 1.0))
+        except Exception as e:
+            raise ValueError(f"Error al calcular el ángulo: {str(e)}")
+
+    def batch_operation(self, operation, A, B=None):
+        """Aplica una de BATCH_OPERATIONS a lotes de vectores."""
+        if operation not in self.BATCH_OPERATIONS:
+            raise ValueError(f"Operación desconocida: {operation}")
+        if operation in ("norm", "normalize"):
+            return self.batch_norms(A) if operation == "norm" else self.batch_normalize(A)
+        if B is None:
+            raise ValueError("Esta operación necesita dos lotes de vectores")
+        if operation in ("add", "subtract"):
+            try:
+                A, B = self._batch_pair(A, B)
+                return A + B if operation == "add" else A - B
+            except Exception as e:
+                verb = "sumar" if operation == "add" else "restar"
+                raise ValueError(f"Error al {verb} vectores: {str(e)}")
+        functions = {"dot": self.batch_dot, "cross": self.batch_cross, "angle": self.batch_angles}
+        return functions[operation](A, B)
+
+    def load_vectors(self, path):
+        """
+        Carga un lote de vectores (N, d) desde .npy o CSV.
+        
+        El CSV puede usar ',' ';' o tabuladores (con ';' o tabuladores la coma
+        es decimal), fracciones "a/b" y una fila de cabecera; los .npy se abren
+        mapeados en memoria.
+        """
+        try:
+            if os.path.splitext(path)[1].lower() == '.npy':
+                return self.as_batch(np.load(path, mmap_mode='r'))
+            with open(path, 'r') as f:
+                text = f.read()
+            first, _, rest = text.partition('\n')
+            try:
+                parse_numbers(first)
+            except ValueError:
+                # Fila de cabecera
+                text = rest
+            return parse_table(text)
+        except Exception as e:
+            raise ValueError(f"Error al cargar los vectores: {str(e)}")
+
+    def save_vectors(self, vectors, path):
+        """Guarda un lote de vectores (o de escalares) en .npy o CSV."""
+        try:
+            vectors = np.asarray(vectors, dtype=float)
+            if os.path.splitext(path)[1].lower() == '.npy':
+                np.save(path, vectors)
+            else:
+                np.savetxt(path, vectors.reshape(len(vectors), -1), delimiter=',', fmt='%.17g')
+        except Exception as e:
+            raise ValueError(f"Error al guardar los vectores: {str(e)}")
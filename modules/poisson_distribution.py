@@ -1,19 +1,21 @@
 import numpy as np
 import math
-from modules.linear_congruential import LinearCongruentialGenerator
+from utils.random_generator import create_generator
 
 class PoissonDistribution:
-    def __init__(self, lambda_param):
+    def __init__(self, lambda_param, seed=None, preset="MINSTD"):
         """
         Inicializa la distribución de Poisson.
         
         Args:
             lambda_param (float): Parámetro lambda (tasa media de ocurrencia)
+            seed (int, optional): Semilla del generador uniforme
+            preset (str): Generador uniforme (uno de utils.random_generator.PRESETS)
         """
         if lambda_param <= 0:
             raise ValueError("El parámetro lambda debe ser positivo")
         self.lambda_param = lambda_param
-        self.generator = LinearCongruentialGenerator()
+        self.generator = create_generator(preset, seed)
     
     def generate_poisson(self, n_samples):
         """
@@ -21,9 +23,9 @@ class PoissonDistribution:
         de transformación inversa con números uniformes del generador congruencial lineal.
         
         El método funciona de la siguiente manera:
-        1. Genera números uniformes U(0,1) usando el generador congruencial
-        2. Aplica la transformación inversa de la distribución de Poisson
-        3. El resultado es un número aleatorio que sigue la distribución de Poisson
+        1. Genera de una vez n_samples números uniformes U(0,1) con el generador
+        2. Calcula la función de distribución F(k) hasta que la cola es despreciable
+        3. Cada muestra es el menor k con U < F(k), buscado en bloque con searchsorted
         
         Args:
             n_samples (int): Número de muestras a generar
@@ -33,23 +35,16 @@ class PoissonDistribution:
         """
         if n_samples <= 0:
             raise ValueError("El número de muestras debe ser positivo")
-            
-        poisson_numbers = []
-        exp_neg_lambda = np.exp(-self.lambda_param)
         
-        for _ in range(n_samples):
-            p = 1.0
-            k = 0
-            
-            # Método de transformación inversa para Poisson
-            while p > exp_neg_lambda:
-                u = self.generator.generate()  # Número uniforme del generador congruencial
-                p *= u
-                k += 1
-            
-            poisson_numbers.append(k - 1)
+        # P(X=k) en escala logarítmica: con λ grande e^(-λ) no se puede representar
+        max_k = int(self.lambda_param + 12 * math.sqrt(self.lambda_param) + 20)
+        k_values = np.arange(max_k + 1)
+        log_pmf = k_values * math.log(self.lambda_param) - self.lambda_param - np.array([math.lgamma(k + 1) for k in k_values])
+        cdf = np.cumsum(np.exp(log_pmf))
         
-        return poisson_numbers
+        u = self.generator.random(n_samples)
+        samples = np.searchsorted(cdf, u, side='right')
+        return np.minimum(samples, max_k).tolist()
     
     def get_theoretical_probabilities(self, max_k):
         """
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from core.diff_system_operations import DiffSystemOperations
+
+
+@pytest.fixture
+def ops():
+    return DiffSystemOperations()
+
+
+CONDITIONS = {"x(0)": 5, "y(0)": 7}
+
+
+def test_linear_system_with_reversed_equations(ops):
+    t, x, y, _ = ops.resolver_sistema("dy/dt = 0\ndx/dt = 1", CONDITIONS, 1.0, 0.5)
+    np.testing.assert_allclose(x, 5 + t)
+    np.testing.assert_allclose(y, 7)
+
+
+def test_nonlinear_system_with_reversed_equations(ops):
+    t, x, y, _ = ops.resolver_sistema("dy/dt = 0\ndx/dt = y**2 - 49", CONDITIONS, 1.0, 0.5)
+    np.testing.assert_allclose(x, 5)
+    np.testing.assert_allclose(y, 7)
+
+
+def test_reversed_equations_give_the_same_solution(ops):
+    forward = ops.resolver_sistema("dx/dt = -2*x + y\ndy/dt = x - 2*y", CONDITIONS, 2.0, 0.1)
+    backward = ops.resolver_sistema("dy/dt = x - 2*y\ndx/dt = -2*x + y", CONDITIONS, 2.0, 0.1)
+    np.testing.assert_allclose(forward[1], backward[1])
+    np.testing.assert_allclose(forward[2], backward[2])
+
+
+def test_implicit_products_of_variables(ops):
+    # Ejemplo de Lotka-Volterra tal como se escribe en la petición
+    variables, rhs = ops.parsear_sistema("dx/dt = 0.5x - 0.02xy\ndy/dt = -0.5y + 0.01xy")
+    x, y = variables
+    assert rhs[0].equals(0.5 * x - 0.02 * x * y)
+    assert rhs[1].equals(-0.5 * y + 0.01 * x * y)
+    assert not ops.es_lineal(variables, rhs)
+
+
+def test_implicit_products_of_multi_letter_names(ops):
+    variables, rhs = ops.parsear_sistema("dx1/dt = x1x2\ndx2/dt = -x2")
+    x1, x2 = variables
+    assert rhs[0].equals(x1 * x2)
+
+
+def test_unknown_symbols_are_still_reported(ops):
+    with pytest.raises(ValueError, match="Símbolos sin ecuación en el sistema: xyz"):
+        ops.parsear_sistema("dx/dt = xyz\ndy/dt = y")
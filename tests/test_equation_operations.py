@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from core.equation_operations import EquationOperations
+
+
+@pytest.fixture
+def ops():
+    return EquationOperations()
+
+
+@pytest.mark.parametrize("a, b, c, root", [
+    (1, -2, 1, 1.0),
+    # 0.1² no es exactamente representable: las dos raíces calculadas no coinciden
+    (1, -0.2, 0.1 ** 2, 0.1),
+    (3, -0.6, 0.03, 0.1),
+    (1e-200, 2e-200, 1e-200, -1.0),
+])
+def test_quadratic_double_root_is_reported_once(ops, a, b, c, root):
+    roots = ops.solve_quadratic_equation(a, b, c)
+    assert len(roots) == 1
+    assert roots[0] == pytest.approx(root)
+
+
+def test_quadratic_distinct_roots(ops):
+    assert ops.solve_quadratic_equation(1, -3, 2) == [1.0, 2.0]
+    assert ops.solve_quadratic_equation(1, 0, 1) == ["0.0000-1.0000i", "0.0000+1.0000i"]
+
+
+@pytest.mark.parametrize("equation", ["x - x", "0", "2*(x + 1) - 2*x - 2"])
+def test_find_roots_rejects_identities(ops, equation):
+    with pytest.raises(ValueError, match="se cumple para todo x"):
+        ops.find_roots(equation, -2, 2)
+
+
+def test_find_roots_simple(ops):
+    result = ops.find_roots("x^2 - 1", -2, 2)
+    assert result["roots"] == pytest.approx([-1.0, 1.0])
+
+
+def test_parametric_text_has_no_negative_zero(ops):
+    result = ops.solve_linear_system("x + y = 1\nx - y = 1")
+    assert result["parametric"] == ["x = 1", "y = 0"]
+    assert ops._parametric_text(["x", "y", "z"], [-0.0, -1e-17, 1.0], [], []) == ["x = 0", "y = 0", "z = 1"]
+
+
+def test_parametric_text_rounds_unit_coefficients(ops):
+    result = ops.solve_linear_system("0.1x + 0.2y + 0.3z = 0.6\n0.4x + 0.5y + 0.6z = 1.5\n0.7x + 0.8y + 0.9z = 2.4")
+    assert result["parametric"] == ["x = z", "y = 3 - 2z", "z libre"]
+
+
+@pytest.mark.parametrize("system, names", [
+    ("2beta + gamma = 1; beta - gamma = 2", ["beta", "gamma"]),
+    ("E + x = 3; E - x = 1", ["E", "x"]),
+])
+def test_sympy_names_are_variables(ops, system, names):
+    result = ops.solve_linear_system(system)
+    assert result["variables"] == names
+    assert result["type"] == "única"
+
+
+def test_sympy_functions_are_not_variables(ops):
+    assert ops.compile_system("sin(x) + gamma = 0, gamma - x = 1")[2] == ["gamma", "x"]
+
+
+@pytest.mark.parametrize("a, b, c, roots", [
+    (1, 1e200, 1, [-1e200, -1e-200]),
+    (1e-200, 1, 1e-200, [-1e200, -1e-200]),
+    (1e200, -3e200, 2e200, [1.0, 2.0]),
+    (1e-200, -3e-200, 2e-200, [1.0, 2.0]),
+])
+def test_quadratic_extreme_coefficients(ops, a, b, c, roots):
+    with np.errstate(all='raise'):
+        result = ops.solve_quadratic_equation(a, b, c)
+    assert result == pytest.approx(roots, rel=1e-12)
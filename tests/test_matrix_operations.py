@@ -0,0 +1,24 @@
+import numpy as np
+
+from core.matrix_operations import MatrixOperations
+from core.sparse_matrix import CSRMatrix
+
+
+def test_factorization_cache_hits_on_equal_content():
+    ops = MatrixOperations()
+    A = np.random.default_rng(0).standard_normal((50, 50))
+    lu = ops.factorize(A)
+    assert ops.factorize(A.copy()) is lu
+    changed = A.copy()
+    changed[0, 0] += 1
+    assert ops.factorize(changed) is not lu
+
+    sparse = CSRMatrix.from_dense(2 * np.eye(150))
+    assert ops.factorize(CSRMatrix.from_dense(2 * np.eye(150))) is ops.factorize(sparse)
+
+
+def test_factorization_cache_keys_do_not_keep_the_matrix():
+    ops = MatrixOperations()
+    ops.factorize(np.random.default_rng(1).standard_normal((200, 200)))
+    key, = ops._factorizations
+    assert all(not isinstance(part, bytes) or len(part) <= 64 for part in key)
@@ -0,0 +1,41 @@
+import pickle
+from functools import partial
+
+import numpy as np
+import pytest
+
+from utils.monte_carlo import MonteCarlo, evaluate_expression
+
+
+def test_expression_evaluator_is_picklable():
+    func = partial(evaluate_expression, "x^2 + sin(x)")
+    assert pickle.loads(pickle.dumps(func))(0.0) == 0.0
+
+
+def test_result_does_not_depend_on_workers():
+    func = partial(evaluate_expression, "x^2")
+    n_points = 3 * MonteCarlo.CHUNK_SIZE + 5
+    serial = MonteCarlo(seed=7, workers=1).estimate_area(func, 0, 1, 0, 1, n_points)
+    parallel = MonteCarlo(seed=7, workers=2).estimate_area(func, 0, 1, 0, 1, n_points)
+    assert serial == parallel
+    assert serial[0] == pytest.approx(1 / 3, abs=5 * serial[1])
+
+
+def test_invalid_expression_raises_value_error():
+    with pytest.raises(ValueError, match="Error al evaluar la función"):
+        evaluate_expression("x +* 2", 1.0)
+
+
+@pytest.mark.parametrize("expression, x, expected", [
+    ("abs(x)", -2.0, 2.0),
+    ("max(x, 0)", -1.5, 0.0),
+    ("min(x, 0)", 3.0, 0.0),
+    ("maximum(x^2, 1)", 0.5, 1.0),
+])
+def test_expression_helpers(expression, x, expected):
+    assert evaluate_expression(expression, x) == expected
+
+
+def test_expression_helpers_work_on_arrays():
+    x = np.array([-1.0, 0.5, 2.0])
+    np.testing.assert_array_equal(evaluate_expression("max(abs(x), 1)", x), [1.0, 1.0, 2.0])
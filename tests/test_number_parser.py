@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import core.number_parser as number_parser
+from core.number_parser import parse_numbers, parse_table
+
+
+def _truncating_fromstring(text, sep=' '):
+    # Comportamiento de np.fromstring en NumPy 2.2: se detiene en el primer valor no válido
+    values = []
+    for token in text.split():
+        try:
+            values.append(float(token))
+        except ValueError:
+            break
+    return np.array(values)
+
+
+@pytest.fixture(params=["numpy", "truncating"])
+def fromstring(request, monkeypatch):
+    if request.param == "truncating":
+        monkeypatch.setattr(number_parser.np, "fromstring", _truncating_fromstring)
+    return request.param
+
+
+@pytest.mark.parametrize("text, position", [("1, 2, abc", 3), ("abc", 1), ("1 2 3x", 3)])
+def test_parse_numbers_rejects_invalid_values(fromstring, text, position):
+    with pytest.raises(ValueError, match=f"posición {position}"):
+        parse_numbers(text)
+
+
+def test_parse_table_reports_invalid_value_position(fromstring):
+    with pytest.raises(ValueError, match="línea 2, columna 3"):
+        parse_table("1,2\n3,abc")
+
+
+def test_parse_numbers_valid_input(fromstring):
+    np.testing.assert_array_equal(parse_numbers("1, 2.5, -3e2"), [1, 2.5, -300])
+    np.testing.assert_array_equal(parse_numbers("1,5; 2"), [1.5, 2])
+    np.testing.assert_array_equal(parse_numbers("1/2 3"), [0.5, 3])
+    assert parse_table("1 2\n3 4").shape == (2, 2)
+
+
+@pytest.mark.parametrize("text, line", [("1 2\n3 4 5\n6", 2), ("1,2\n3\n4,5,6", 2), ("1 2\n3 4\n5 6 7 8", 3)])
+def test_parse_table_rejects_ragged_rows(fromstring, text, line):
+    with pytest.raises(ValueError, match=f"línea {line} tiene"):
+        parse_table(text)
+
+
+@pytest.mark.parametrize("text, line", [("1,,2", 1), ("1,2\n3,,4", 2), ("1;2\n3;;4", 2), ("1\t2\n\t3\t4", 2), ("1,2,\n3,4", 1)])
+def test_parse_table_rejects_empty_fields(fromstring, text, line):
+    with pytest.raises(ValueError, match=f"línea {line} tiene un campo vacío"):
+        parse_table(text)
+
+
+def test_parse_table_valid_input(fromstring):
+    np.testing.assert_array_equal(parse_table("1,2\n\n3,4\n"), [[1, 2], [3, 4]])
+    np.testing.assert_array_equal(parse_table("1,5;2\n3;4,5"), [[1.5, 2], [3, 4.5]])
+    np.testing.assert_array_equal(parse_table("1 2 3"), [[1, 2, 3]])
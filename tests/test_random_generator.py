@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from modules.linear_congruential import LinearCongruentialGenerator
+from utils.random_generator import CongruentialGenerator, PCG32Generator, PRESETS
+
+M = PRESETS["MINSTD"]["m"]
+SIZES = [
+    1,
+    CongruentialGenerator.BULK_MIN_SIZE - 1,
+    CongruentialGenerator.BULK_MIN_SIZE,
+    CongruentialGenerator.LANES + 7,
+    CongruentialGenerator.LANES * CongruentialGenerator.BLOCK_ROWS * 2 + 3,
+]
+
+
+def _scalar(generator, n):
+    return np.array([generator.generate() for _ in range(n)])
+
+
+@pytest.mark.parametrize("seed", [0, 1, M - 1])
+@pytest.mark.parametrize("n", SIZES)
+def test_minstd_bulk_matches_scalar(seed, n):
+    bulk = LinearCongruentialGenerator(seed)
+    scalar = LinearCongruentialGenerator(seed)
+    np.testing.assert_array_equal(bulk.generate_sequence(n), _scalar(scalar, n))
+    assert bulk.current == scalar.current
+
+
+# Otros módulos 2^k - 1 (reducción de Mersenne), con y sin incremento
+@pytest.mark.parametrize("params", [
+    {"a": 48271, "c": 0, "m": 2**31 - 1},
+    {"a": 1103515245, "c": 12345, "m": 2**31 - 1},
+    {"a": 5, "c": 3, "m": 2**13 - 1},
+    {"a": 69069, "c": 1, "m": 2**32 - 1},
+])
+@pytest.mark.parametrize("n", SIZES)
+def test_mersenne_moduli_bulk_matches_scalar(params, n):
+    for seed in (0, 1, params["m"] - 1):
+        bulk = CongruentialGenerator(seed=seed, **params)
+        scalar = CongruentialGenerator(seed=seed, **params)
+        np.testing.assert_array_equal(bulk.generate_sequence(n), _scalar(scalar, n))
+        assert bulk.current == scalar.current
+
+
+@pytest.mark.parametrize("preset", ["Numerical Recipes", "RANDU"])
+def test_power_of_two_presets_bulk_matches_scalar(preset):
+    n = SIZES[-1]
+    bulk = CongruentialGenerator(seed=1, **PRESETS[preset])
+    scalar = CongruentialGenerator(seed=1, **PRESETS[preset])
+    np.testing.assert_array_equal(bulk.generate_sequence(n), _scalar(scalar, n))
+    assert bulk.current == scalar.current
+
+
+def test_pcg32_reference_values():
+    # Salida de pcg32-demo (implementación de referencia) con semilla 42 y secuencia 54
+    expected = [0xa15c02b7, 0x7b47f409, 0xba1d3330, 0x83d2f293, 0xbfa4784b, 0xcbed606e]
+    generator = PCG32Generator(seed=42, stream=54)
+    assert [int(generator.generate() * 2**32) for _ in expected] == expected
+    bulk = PCG32Generator(seed=42, stream=54).generate_sequence(CongruentialGenerator.LANES + 7)
+    np.testing.assert_array_equal((bulk[:len(expected)] * 2**32).astype(np.uint64), expected)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_pcg32_bulk_matches_scalar(n):
+    bulk = PCG32Generator(seed=42, stream=54)
+    scalar = PCG32Generator(seed=42, stream=54)
+    np.testing.assert_array_equal(bulk.generate_sequence(n), _scalar(scalar, n))
+    assert bulk.current == scalar.current
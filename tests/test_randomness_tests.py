@@ -0,0 +1,31 @@
+import pytest
+
+from utils.random_generator import CongruentialGenerator, create_generator
+from utils.randomness_tests import RandomnessTests
+
+
+def test_battery_passes_for_pcg32():
+    results = RandomnessTests().run_all(create_generator("PCG32", 1), 10**5)
+    assert all(result["passed"] for result in results)
+
+
+def test_scalar_only_modulus_limits_the_work():
+    tests = RandomnessTests()
+    # 2^33 - 1 no cabe en el cálculo en bloque: todo va por el bucle escalar
+    generator = CongruentialGenerator(seed=1, a=16807, c=0, m=2**33 - 1)
+    assert tests.sample_size(generator, 10**7) == tests.SCALAR_MAX_SAMPLES
+    period = tests.period(generator)
+    assert period["period"] is None
+    assert period["steps"] < 2 * tests.SCALAR_MAX_SAMPLES
+
+
+def test_period_of_a_short_cycle():
+    result = RandomnessTests().period(CongruentialGenerator(seed=1, a=5, c=3, m=16))
+    assert result["period"] == 16
+    assert result["tail"] == 0
+
+
+@pytest.mark.parametrize("m", [0, -7])
+def test_non_positive_modulus_is_rejected(m):
+    with pytest.raises(ValueError, match="módulo"):
+        CongruentialGenerator(seed=1, a=5, c=3, m=m)
@@ -1,67 +1,126 @@
+import pickle
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from typing import Callable, Tuple, List, Optional
-from utils.random_generator import CongruentialGenerator
+from utils.random_generator import create_generator
+
+# Nombres disponibles en las expresiones escritas por el usuario; abs, max y min
+# son las versiones de NumPy, que también funcionan elemento a elemento con arrays
+EXPRESSION_NAMES = {"np": np, "sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp,
+                    "log": np.log, "sqrt": np.sqrt, "pi": np.pi,
+                    "abs": np.abs, "max": np.maximum, "min": np.minimum,
+                    "maximum": np.maximum, "minimum": np.minimum}
+
+def evaluate_expression(expression: str, x):
+    """
+    Evalúa una expresión en x (escalar o array), con ^ como potencia.
+
+    Al ser una función de módulo, functools.partial(evaluate_expression, texto)
+    se puede enviar a otros procesos, a diferencia de una lambda.
+    """
+    try:
+        return eval(expression.replace("^", "**"), {"__builtins__": {}}, {**EXPRESSION_NAMES, "x": x})
+    except Exception as e:
+        raise ValueError(f"Error al evaluar la función: {str(e)}")
+
+def _evaluate(func: Callable, x: np.ndarray) -> np.ndarray:
+    # Evaluación vectorizada si func admite arrays; si no, punto a punto
+    try:
+        values = np.asarray(func(x), dtype=float)
+        if values.shape == x.shape:
+            return values
+    except Exception:
+        pass
+    return np.array([func(v) for v in x], dtype=float)
+
+def _sample_chunk(funcs, ranges, generators, count):
+    """
+    Trozo de la simulación: count puntos con una coordenada por generador,
+    escalada a su rango, y los valores de cada función en la primera coordenada.
+    """
+    coords = [low + (high - low) * g.generate_sequence(count) for (low, high), g in zip(ranges, generators)]
+    return coords, [_evaluate(func, coords[0]) for func in funcs]
 
 class MonteCarlo:
-    
-    def __init__(self, seed: Optional[int] = None):
-        self.generator = CongruentialGenerator(seed=seed)
-    
-    def integrate(self, 
-                 func: Callable[[float], float], 
-                 a: float, 
-                 b: float, 
+    # Puntos por trozo; es fijo para que el resultado no dependa del número de procesos
+    CHUNK_SIZE = 65536
+
+    def __init__(self, seed: Optional[int] = None, workers: int = 1, preset: str = "Numerical Recipes"):
+        self.generator = create_generator(preset, seed)
+        self.workers = max(1, int(workers))
+
+    def _sample(self, funcs, ranges, n_points):
+        """
+        Genera n_points puntos aleatorios y evalúa funcs en ellos, por trozos.
+
+        La coordenada d usa los números d * n_points ... (d + 1) * n_points - 1
+        de la secuencia, igual que si se generaran en orden; cada trozo recibe
+        sus subsecuencias por salto (split), así que con workers > 1 los trozos
+        se reparten entre procesos y el resultado es el mismo para una semilla
+        dada. Si las funciones no se pueden enviar a otro proceso (lambdas), los
+        trozos se calculan aquí. Al terminar el generador queda tras los números usados.
+        """
+        n_chunks = -(-n_points // self.CHUNK_SIZE)
+        streams = [start.split(n_chunks, self.CHUNK_SIZE) for start in self.generator.split(len(ranges), n_points)]
+        counts = [min(self.CHUNK_SIZE, n_points - i * self.CHUNK_SIZE) for i in range(n_chunks)]
+        tasks = [(funcs, ranges, [s[i] for s in streams], counts[i]) for i in range(n_chunks)]
+
+        parallel = self.workers > 1 and n_chunks > 1
+        if parallel:
+            try:
+                pickle.dumps(funcs)
+            except Exception:
+                parallel = False
+        if parallel:
+            with ProcessPoolExecutor(max_workers=min(self.workers, n_chunks)) as pool:
+                results = list(pool.map(_sample_chunk, *zip(*tasks)))
+        else:
+            results = [_sample_chunk(*task) for task in tasks]
+
+        self.generator.jump(len(ranges) * n_points)
+        coords = [np.concatenate([r[0][d] for r in results]) for d in range(len(ranges))]
+        values = [np.concatenate([r[1][k] for r in results]) for k in range(len(funcs))]
+        return coords, values
+
+    def integrate(self,
+                 func: Callable[[float], float],
+                 a: float,
+                 b: float,
                  n_points: int = 10000) -> Tuple[float, float]:
-       
-        x_values = np.array([a + (b - a) * self.generator.generate() for _ in range(n_points)])
-        y_values = np.array([func(x) for x in x_values])
-        
+
+        _, (y_values,) = self._sample([func], [(a, b)], n_points)
+
         integral = (b - a) * np.mean(y_values)
         # Error estándar de la media multiplicado por (b-a)
         error = (b - a) * np.std(y_values) / np.sqrt(n_points)
-        
+
         return integral, error
-    
-    def estimate_area(self, 
-                     func: Callable[[float], float], 
-                     a: float, 
-                     b: float, 
-                     y_min_rect: float, 
-                     y_max_rect: float, 
+
+    def estimate_area(self,
+                     func: Callable[[float], float],
+                     a: float,
+                     b: float,
+                     y_min_rect: float,
+                     y_max_rect: float,
                      n_points: int = 10000) -> Tuple[float, float]:
-       
-        x_rand = np.array([a + (b - a) * self.generator.generate() for _ in range(n_points)])
-        y_rand = np.array([y_min_rect + (y_max_rect - y_min_rect) * self.generator.generate() for _ in range(n_points)])
-        
-        
-        func_values = np.array([func(x) for x in x_rand])
-        
-        
-        # Area entre la curva"
-        points_hit = np.sum( (y_rand >= np.minimum(func_values, y_max_rect)) & (y_rand <= np.maximum(func_values, y_min_rect)) & (y_rand >= y_min_rect) & (y_rand <= y_max_rect) | (y_rand <= np.minimum(func_values, y_max_rect)) & (y_rand >= np.maximum(func_values, y_min_rect)) & (y_rand >= y_min_rect) & (y_rand <= y_max_rect) )
-        
-        
-        
-        count = 0
-        for i in range(n_points):
-            f_val = func(x_rand[i])
-            # Punto entre eje-x y la función
-            is_between_fn_and_axis = (y_rand[i] >= 0 and y_rand[i] <= f_val) or \
-                                     (y_rand[i] < 0 and y_rand[i] >= f_val)
-            # Punto dentro de los límites verticales del rectángulo de muestreo
-            is_within_rect_y = (y_rand[i] >= y_min_rect and y_rand[i] <= y_max_rect)
-            
-            if is_between_fn_and_axis and is_within_rect_y:
-                count += 1
-        
+
+        (x_rand, y_rand), (func_values,) = self._sample([func], [(a, b), (y_min_rect, y_max_rect)], n_points)
+
+        # Punto entre eje-x y la función
+        is_between_fn_and_axis = ((y_rand >= 0) & (y_rand <= func_values)) | \
+                                 ((y_rand < 0) & (y_rand >= func_values))
+        # Punto dentro de los límites verticales del rectángulo de muestreo
+        is_within_rect_y = (y_rand >= y_min_rect) & (y_rand <= y_max_rect)
+        count = int(np.sum(is_between_fn_and_axis & is_within_rect_y))
+
         points_hit_ratio = count / n_points
         total_sampling_area = (b - a) * (y_max_rect - y_min_rect)
         area = total_sampling_area * points_hit_ratio
-        
-        
+
+
         error_in_ratio = np.sqrt(points_hit_ratio * (1 - points_hit_ratio) / n_points)
         error = total_sampling_area * error_in_ratio
-        
+
         return area, error
 
     def estimate_area_between_curves(self,
@@ -69,49 +128,38 @@ class MonteCarlo:
                                      func2: Callable[[float], float],
                                      a: float, b: float,
                                      n_points: int = 10000) -> Tuple[float, float, List[float], List[float], List[bool]]:
-        
-        
-        x_sample_for_range = np.linspace(a, b, 200) 
+
+
+        x_sample_for_range = np.linspace(a, b, 200)
         y1_sample_for_range = np.array([func1(x) for x in x_sample_for_range])
         y2_sample_for_range = np.array([func2(x) for x in x_sample_for_range])
 
-        
+
         y_min_sampling = 0.0
         y_max_sampling = 1.0
-        
+
         # Asegurar un pequeño margen si y_min == y_max (curvas constantes e iguales, área 0)
         if y_min_sampling == y_max_sampling:
             y_min_sampling -= 0.1
             y_max_sampling += 0.1
-            if y_min_sampling == y_max_sampling: 
-                 y_max_sampling = y_min_sampling + 1.0 
-
-        x_rand_points = np.array([a + (b - a) * self.generator.generate() for _ in range(n_points)])
-        y_rand_points = np.array([y_min_sampling + (y_max_sampling - y_min_sampling) * self.generator.generate() for _ in range(n_points)])
-        
-        count_inside = 0
-        is_inside_flags = []
-
-        for i in range(n_points):
-            x = x_rand_points[i]
-            y = y_rand_points[i]
-            val1 = func1(x)
-            val2 = func2(x)
-            
-            # Asumimos func1 es la inferior, func2 la superior, como en el ejemplo (x^2 vs sqrt(x))
-            if val1 <= y <= val2:
-                count_inside += 1
-                is_inside_flags.append(True)
-            else:
-                is_inside_flags.append(False)
-        
+            if y_min_sampling == y_max_sampling:
+                 y_max_sampling = y_min_sampling + 1.0
+
+        (x_rand_points, y_rand_points), (val1, val2) = self._sample(
+            [func1, func2], [(a, b), (y_min_sampling, y_max_sampling)], n_points)
+
+        # Asumimos func1 es la inferior, func2 la superior, como en el ejemplo (x^2 vs sqrt(x))
+        is_inside = (val1 <= y_rand_points) & (y_rand_points <= val2)
+        count_inside = int(np.sum(is_inside))
+        is_inside_flags = is_inside.tolist()
+
         points_hit_ratio = count_inside / n_points
         # El área del rectángulo de muestreo para x en [a,b] y y en [y_min_sampling, y_max_sampling]
         total_sampling_rectangle_area = (b - a) * (y_max_sampling - y_min_sampling)
-        
+
         estimated_area = total_sampling_rectangle_area * points_hit_ratio
-        
+
         error_in_ratio = np.sqrt(points_hit_ratio * (1 - points_hit_ratio) / n_points)
         estimated_error = total_sampling_rectangle_area * error_in_ratio
-        
-        return estimated_area, estimated_error, x_rand_points.tolist(), y_rand_points.tolist(), is_inside_flags
\ No newline at end of file
+
+        return estimated_area, estimated_error, x_rand_points.tolist(), y_rand_points.tolist(), is_inside_flags
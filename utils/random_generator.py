@@ -1,7 +1,79 @@
+import copy
 import numpy as np
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-class CongruentialGenerator:
+def jump_coefficients(a: int, c: int, m: int, k: int) -> Tuple[int, int]:
+    """
+    Coeficientes (A, C) de avanzar k pasos un generador congruencial lineal.
+    
+    Aplicar k veces X -> (a X + c) mod m equivale a X -> (A X + C) mod m. Se
+    calcula por exponenciación binaria de la aplicación afín, en O(log k) pasos.
+    
+    Args:
+        a, c, m: Parámetros del generador
+        k: Número de pasos (k >= 0)
+        
+    Returns:
+        Tuple[int, int]: (A, C)
+    """
+    k = int(k)
+    if k < 0:
+        raise ValueError("El número de pasos debe ser no negativo")
+    # (A, C) acumula el salto total; (a, c) es la aplicación elevada a 2^i
+    A, C = 1 % m, 0
+    a, c = a % m, c % m
+    while k:
+        if k & 1:
+            A, C = (a * A) % m, (a * C + c) % m
+        a, c = (a * a) % m, (a * c + c) % m
+        k >>= 1
+    return A, C
+
+class RandomGenerator:
+    """
+    Interfaz común de los generadores: a partir de random(n), que devuelve n
+    números uniformes en [0, 1) como array, se obtienen por lotes enteros,
+    normales y exponenciales.
+    """
+
+    def generate(self) -> float:
+        raise NotImplementedError
+
+    def generate_sequence(self, n: int) -> np.ndarray:
+        return np.array([self.generate() for _ in range(int(n))], dtype=float)
+
+    def random(self, n: int) -> np.ndarray:
+        """n números uniformes en [0, 1)."""
+        return self.generate_sequence(n)
+
+    def uniform(self, low: float = 0.0, high: float = 1.0, n: int = 1) -> np.ndarray:
+        """n números uniformes en [low, high)."""
+        return low + (high - low) * self.random(n)
+
+    def integers(self, low: int, high: int, n: int = 1) -> np.ndarray:
+        """n enteros uniformes en [low, high)."""
+        if high <= low:
+            raise ValueError("El extremo superior debe ser mayor que el inferior")
+        values = np.floor(low + (high - low) * self.random(n)).astype(np.int64)
+        # Con un módulo no potencia de dos el producto puede redondear hasta high
+        return np.minimum(values, high - 1)
+
+    def normal(self, mean: float = 0.0, std: float = 1.0, n: int = 1) -> np.ndarray:
+        """n números normales N(mean, std²) por el método de Box-Muller."""
+        n = int(n)
+        pairs = -(-n // 2)
+        u = self.random(2 * pairs)
+        # 1 - u está en (0, 1], así que el logaritmo es finito
+        radius = np.sqrt(-2.0 * np.log(1.0 - u[:pairs]))
+        angle = 2.0 * np.pi * u[pairs:]
+        z = np.concatenate([radius * np.cos(angle), radius * np.sin(angle)])[:n]
+        return mean + std * z
+
+    def exponential(self, scale: float = 1.0, n: int = 1) -> np.ndarray:
+        """n números exponenciales de media scale por transformación inversa."""
+        return -scale * np.log1p(-self.random(n))
+
+class CongruentialGenerator(RandomGenerator):
     """
     Implementación del generador congruencial lineal para números pseudoaleatorios.
     X_{n+1} = (a * X_n + c) mod m
@@ -13,6 +85,11 @@ class CongruentialGenerator:
     """
     
     DEFAULT_SEED = 12345
+    # Generación en bloque: número de secuencias paralelas (columnas) y filas por bloque
+    LANES = 4096
+    BLOCK_ROWS = 8
+    # Por debajo de este tamaño el bucle escalar es más rápido que preparar el bloque
+    BULK_MIN_SIZE = 64
 
     def __init__(self, seed: Optional[int] = None, a: int = 1664525, c: int = 1013904223, m: int = 2**32):
         """
@@ -24,12 +101,25 @@ class CongruentialGenerator:
             c: Incremento
             m: Módulo
         """
-        self.seed = seed if seed is not None else self.DEFAULT_SEED
+        if m <= 0:
+            raise ValueError("El módulo m debe ser un entero positivo")
         self.a = a
         self.c = c
         self.m = m
-        self.current = self.seed
+        self.reset(seed if seed is not None else self.DEFAULT_SEED)
         
+    def _seed_state(self, seed: int) -> int:
+        # Estado inicial a partir de la semilla (en el LCG, la propia semilla)
+        return seed
+
+    def _unit(self, previous: int, state: int) -> float:
+        # Número en [0, 1) que corresponde al paso previous -> state (X_n / m)
+        return state / self.m
+
+    def _units(self, previous: np.ndarray, states: np.ndarray) -> np.ndarray:
+        # Versión por lotes de _unit; m es potencia de dos o m <= 2^32, así que float(m) es exacto
+        return states / float(self.m)
+
     def generate(self) -> float:
         """
         Genera el siguiente número pseudoaleatorio en el rango [0,1).
@@ -37,21 +127,197 @@ class CongruentialGenerator:
         Returns:
             float: Número pseudoaleatorio entre 0 y 1
         """
+        previous = self.current
         self.current = (self.a * self.current + self.c) % self.m
-        return self.current / self.m
+        return self._unit(previous, self.current)
     
-    def generate_sequence(self, n: int) -> List[float]:
+    def _affine_table(self, a: int, c: int, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Coeficientes de aplicar k veces X -> (a X + c) mod m: A_k y C_k, para k = 0..count-1.
+        
+        Se construyen por duplicación: A_{s+j} = A_j A_s y C_{s+j} = A_j C_s + C_j.
+        Con m <= 2^32 todos los productos caben en uint64; con m potencia de dos
+        el desbordamiento de uint64 es módulo 2^64, múltiplo de m, y basta una máscara.
+        """
+        reduce = self._reducer()
+        A = np.ones(count, dtype=np.uint64)
+        C = np.zeros(count, dtype=np.uint64)
+        if count > 1:
+            A[1] = a % self.m
+            C[1] = c % self.m
+        size = min(count, 2)
+        while size < count:
+            # Con s = size - 1 (ya calculado) se rellenan los índices s + 1 .. s + step
+            s = size - 1
+            step = min(s, count - size)
+            A[size:size + step] = reduce(A[1:step + 1] * A[s])
+            C[size:size + step] = reduce(A[1:step + 1] * C[s] + C[1:step + 1])
+            size += step
+        return A, C
+
+    def _reducer(self):
+        # Reducción módulo m de un array uint64, en el sitio
+        if self.m & (self.m - 1) == 0:
+            mask = np.uint64(self.m - 1)
+            return lambda values: np.bitwise_and(values, mask, out=values)
+        if (self.m + 1) & self.m == 0:
+            return self._mersenne_reducer()
+        m = np.uint64(self.m)
+        return lambda values: np.remainder(values, m, out=values)
+
+    def _mersenne_reducer(self):
+        """
+        Reducción módulo m = 2^k - 1 (MINSTD usa el primo de Mersenne 2^31 - 1) sin división.
+        
+        Como 2^k ≡ 1 (mod m), x ≡ (x & m) + (x >> k): dos pliegues llevan cualquier
+        x < 2^64 (con k <= 32) por debajo de 2m, y una resta condicional deja el resto.
+        """
+        k = self.m.bit_length()
+        m = np.uint64(self.m)
+        shift = np.uint64(k)
+
+        def reduce(values):
+            high = np.empty_like(values)
+            for _ in range(2):
+                np.right_shift(values, shift, out=high)
+                np.bitwise_and(values, m, out=values)
+                values += high
+            np.multiply(values >= m, m, out=high)
+            values -= high
+            return values
+        return reduce
+
+    def _bulk_available(self) -> bool:
+        # Sin desbordamiento en uint64 hace falta m <= 2^32, o m potencia de dos hasta 2^64
+        power_of_two = self.m > 0 and self.m & (self.m - 1) == 0
+        return (0 < self.m <= 2**32 or power_of_two and self.m <= 2**64) and 0 <= self.a and 0 <= self.c and 0 <= self.current
+
+    def generate_sequence(self, n: int) -> np.ndarray:
         """
         Genera una secuencia de n números pseudoaleatorios.
         
+        Con m <= 2^32 (o m potencia de dos) la secuencia se calcula en bloque con NumPy: los LANES primeros
+        estados se obtienen saltando k pasos desde el actual, y cada fila siguiente
+        salta LANES pasos de una vez, así que cada número cuesta una multiplicación
+        y una suma en uint64. El resultado es idéntico, bit a bit, al de llamar n
+        veces a generate().
+        
         Args:
             n: Cantidad de números a generar
             
         Returns:
-            List[float]: Lista de n números pseudoaleatorios
+            np.ndarray: Array float64 con n números pseudoaleatorios
+        """
+        n = int(n)
+        if n <= 0:
+            return np.empty(0)
+        if n < self.BULK_MIN_SIZE or not self._bulk_available():
+            return np.array([self.generate() for _ in range(n)], dtype=float)
+
+        states = self._states(n)
+        return self._units(states[:-1], states[1:])
+
+    def generate_states(self, n: int) -> np.ndarray:
         """
-        return [self.generate() for _ in range(n)]
+        Los n estados siguientes X_{k+1} ... X_{k+n} como array uint64 (m <= 2^64).
+        
+        Avanza el generador igual que generate_sequence; sirve para las pruebas que
+        trabajan con el estado entero, como la detección del período.
+        """
+        n = int(n)
+        if self.m > 2**64:
+            raise ValueError("El estado solo se puede representar en uint64 si m <= 2^64")
+        if n <= 0:
+            return np.empty(0, dtype=np.uint64)
+        if n < self.BULK_MIN_SIZE or not self._bulk_available():
+            states = []
+            for _ in range(n):
+                self.current = (self.a * self.current + self.c) % self.m
+                states.append(self.current)
+            return np.array(states, dtype=np.uint64)
+        return self._states(n)[1:]
+
+    def _states(self, n: int) -> np.ndarray:
+        """Array uint64 con el estado actual y los n siguientes; deja el generador tras el último."""
+        lanes = min(n, self.LANES)
+        rows = -(-n // lanes)
+        reduce = self._reducer()
+        # Estados tras 1..lanes pasos y coeficientes para saltar r * lanes pasos
+        A, C = self._affine_table(self.a, self.c, lanes + 1)
+        first = reduce(A[1:] * np.uint64(self.current % self.m) + C[1:])
+        A_rows, C_rows = self._affine_table(int(A[lanes]), int(C[lanes]), rows)
+
+        states = np.empty(rows * lanes + 1, dtype=np.uint64)
+        states[0] = self.current % self.m
+        for start in range(0, rows, self.BLOCK_ROWS):
+            stop = min(start + self.BLOCK_ROWS, rows)
+            # Se calcula directamente sobre el resultado, en bloques que caben en caché
+            block = states[1 + start * lanes:1 + stop * lanes].reshape(stop - start, lanes)
+            np.multiply(A_rows[start:stop, np.newaxis], first, out=block)
+            if self.c % self.m:
+                block += C_rows[start:stop, np.newaxis]
+            reduce(block)
+        states = states[:n + 1]
+        self.current = int(states[-1])
+        return states
     
+    def jump(self, k: int) -> None:
+        """
+        Avanza el generador k pasos sin generar los números intermedios, en O(log k).
+        
+        Args:
+            k: Número de pasos
+        """
+        A, C = jump_coefficients(self.a, self.c, self.m, k)
+        self.current = (A * self.current + C) % self.m
+
+    def at(self, index: int) -> float:
+        """
+        Número de la posición index (desde 0) de la secuencia que empieza en la semilla.
+        
+        No cambia el estado del generador: at(i) es el valor que devuelve la
+        llamada i + 1 a generate() tras reset().
+        
+        Args:
+            index: Posición en la secuencia
+            
+        Returns:
+            float: Número pseudoaleatorio entre 0 y 1
+        """
+        A, C = jump_coefficients(self.a, self.c, self.m, int(index))
+        previous = (A * self.origin + C) % self.m
+        return self._unit(previous, (self.a * previous + self.c) % self.m)
+
+    def _stream_at(self, state: int) -> "CongruentialGenerator":
+        # Copia del generador que empieza (posición 0) en el estado dado
+        stream = copy.copy(self)
+        stream.origin = stream.current = state
+        return stream
+
+    def split(self, n_streams: int, stream_length: int) -> List["CongruentialGenerator"]:
+        """
+        Divide la secuencia en subsecuencias consecutivas que no se solapan.
+        
+        La subsecuencia i genera los números de las posiciones
+        i * stream_length ... (i + 1) * stream_length - 1 a partir del estado
+        actual, así que repartirlas entre procesos da los mismos números que
+        generarlos en orden. El generador original no cambia.
+        
+        Args:
+            n_streams: Número de subsecuencias
+            stream_length: Números de cada subsecuencia
+            
+        Returns:
+            List[CongruentialGenerator]: Un generador por subsecuencia
+        """
+        A, C = jump_coefficients(self.a, self.c, self.m, stream_length)
+        streams = []
+        state = self.current
+        for _ in range(int(n_streams)):
+            streams.append(self._stream_at(state))
+            state = (A * state + C) % self.m
+        return streams
+
     def reset(self, seed: Optional[int] = None) -> None:
         """
         Reinicia el generador con una nueva semilla o la semilla original.
@@ -61,7 +327,69 @@ class CongruentialGenerator:
         """
         if seed is not None:
             self.seed = seed
-        self.current = self.seed
+        # Estado de la posición 0 de la secuencia (desde el que cuentan at y reset)
+        self.origin = self._seed_state(self.seed)
+        self.current = self.origin
+
+class PCG32Generator(CongruentialGenerator):
+    """
+    Generador PCG32 (O'Neill, 2014): un LCG de 64 bits cuyo estado se transforma
+    (xorshift y rotación aleatoria, "XSH RR") para dar 32 bits de salida.
+    
+    Pasa las baterías estadísticas que los LCG clásicos no superan, y como el
+    estado sigue siendo un LCG módulo 2^64 conserva el cálculo en bloque, jump,
+    at y split. stream elige una de las 2^63 secuencias independientes.
+    """
+    MULTIPLIER = 6364136223846793005
+    DEFAULT_INCREMENT = 1442695040888963407
+
+    def __init__(self, seed: Optional[int] = None, stream: Optional[int] = None):
+        increment = self.DEFAULT_INCREMENT if stream is None else (2 * int(stream) + 1) % 2**64
+        super().__init__(seed=seed, a=self.MULTIPLIER, c=increment, m=2**64)
+
+    def _seed_state(self, seed: int) -> int:
+        # Inicialización de la implementación de referencia (pcg32_srandom_r)
+        state = (self.c + seed) % self.m
+        return (self.a * state + self.c) % self.m
+
+    @staticmethod
+    def _permute(state):
+        # XSH RR sobre el estado anterior; sirve para enteros de Python y arrays uint64
+        xorshifted = (((state >> 18) ^ state) >> 27) & 0xFFFFFFFF
+        rot = state >> 59
+        return ((xorshifted >> rot) | (xorshifted << ((32 - rot) & 31))) & 0xFFFFFFFF
+
+    def _unit(self, previous: int, state: int) -> float:
+        return self._permute(previous) / 2**32
+
+    def _units(self, previous: np.ndarray, states: np.ndarray) -> np.ndarray:
+        return self._permute(previous) / 2.0**32
+
+# Parámetros conocidos; RANDU se incluye como ejemplo de generador defectuoso
+# (sus ternas consecutivas caen en 15 planos de R³)
+PRESETS = {
+    "MINSTD": {"a": 16807, "c": 0, "m": 2**31 - 1},
+    "Numerical Recipes": {"a": 1664525, "c": 1013904223, "m": 2**32},
+    "RANDU": {"a": 65539, "c": 0, "m": 2**31},
+    "PCG32": None,
+}
+
+def create_generator(preset: str = "Numerical Recipes", seed: Optional[int] = None) -> CongruentialGenerator:
+    """
+    Crea un generador a partir de uno de los PRESETS.
+    
+    Args:
+        preset: Nombre del conjunto de parámetros
+        seed: Semilla inicial (opcional)
+        
+    Returns:
+        CongruentialGenerator: Generador con la interfaz de RandomGenerator
+    """
+    if preset not in PRESETS:
+        raise ValueError(f"Generador desconocido: {preset}. Opciones: {', '.join(PRESETS)}")
+    if preset == "PCG32":
+        return PCG32Generator(seed=seed)
+    return CongruentialGenerator(seed=seed, **PRESETS[preset])
 
 # Ejemplo de uso
 if __name__ == "__main__":
@@ -0,0 +1,339 @@
+import copy
+import math
+import numpy as np
+from typing import Dict, List, Optional
+from utils.random_generator import CongruentialGenerator, PCG32Generator
+
+def _chi2_sf(x: float, df: int) -> float:
+    """P(χ² > x) con df grados de libertad: función gamma incompleta regularizada Q(df/2, x/2)."""
+    a, x = df / 2.0, x / 2.0
+    if x <= 0:
+        return 1.0
+    log_prefactor = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # Serie de P(a, x)
+        term = total = 1.0 / a
+        k = a
+        while abs(term) > abs(total) * 1e-15:
+            k += 1
+            term *= x / k
+            total += term
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+    # Fracción continua de Q(a, x) (método de Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, h * math.exp(log_prefactor))
+
+def _normal_two_sided(z: float) -> float:
+    # P(|Z| > |z|) para Z normal estándar
+    return math.erfc(abs(z) / math.sqrt(2))
+
+class RandomnessTests:
+    """
+    Batería de pruebas estadísticas para los generadores de utils.random_generator.
+
+    Las pruebas sobre la secuencia (chi-cuadrado, correlación serial, rachas,
+    huecos y póker) trabajan con arrays de NumPy generados en bloque, así que
+    10^7 números se evalúan en pocos segundos. Cada prueba devuelve un
+    diccionario con el estadístico, su p-valor y si pasa al nivel ALPHA.
+    La prueba espectral estudia la red de puntos (x_n, ..., x_{n+t-1}) de un
+    LCG a partir de a y m, y period busca el período con el método de Brent.
+    """
+    # Nivel de significación de las pruebas
+    ALPHA = 0.01
+    # Dimensiones de la prueba espectral y valor mínimo aceptable de μ_t (Knuth)
+    SPECTRAL_DIMENSIONS = range(2, 7)
+    SPECTRAL_MIN_MERIT = 0.1
+    # Pasos máximos de la búsqueda del período y estados generados de cada vez
+    PERIOD_MAX_STEPS = 10**8
+    PERIOD_BLOCK = 2**22
+    # Sin cálculo en bloque (p. ej. m = 2^33 - 1) cada número cuesta una iteración de
+    # Python: la muestra y la búsqueda del período se limitan a este tamaño
+    SCALAR_MAX_SAMPLES = 10**6
+
+    def _chi_square(self, observed, probabilities) -> Dict:
+        # Agrupa categorías contiguas hasta que cada una espera al menos 5 observaciones
+        observed = np.asarray(observed, dtype=float)
+        expected = np.asarray(probabilities, dtype=float) * observed.sum()
+        groups_obs, groups_exp = [], []
+        acc_obs = acc_exp = 0.0
+        for o, e in zip(observed, expected):
+            acc_obs += o
+            acc_exp += e
+            if acc_exp >= 5:
+                groups_obs.append(acc_obs)
+                groups_exp.append(acc_exp)
+                acc_obs = acc_exp = 0.0
+        if acc_exp > 0 and groups_exp:
+            groups_obs[-1] += acc_obs
+            groups_exp[-1] += acc_exp
+        if len(groups_exp) < 2:
+            raise ValueError("Hay muy pocas muestras para la prueba chi-cuadrado")
+        groups_obs, groups_exp = np.array(groups_obs), np.array(groups_exp)
+        statistic = float(np.sum((groups_obs - groups_exp) ** 2 / groups_exp))
+        df = len(groups_exp) - 1
+        return {"statistic": statistic, "df": df, "p_value": _chi2_sf(statistic, df)}
+
+    def _result(self, name, statistic, p_value, **detail) -> Dict:
+        return {"test": name, "statistic": statistic, "p_value": p_value, "passed": p_value >= self.ALPHA, **detail}
+
+    def chi_square(self, u: np.ndarray, bins: int = 100) -> Dict:
+        """Uniformidad: frecuencias de u en bins intervalos iguales de [0, 1)."""
+        bins = max(2, min(int(bins), len(u) // 5))
+        counts = np.bincount(np.minimum((u * bins).astype(np.int64), bins - 1), minlength=bins)
+        chi = self._chi_square(counts, np.full(bins, 1.0 / bins))
+        return self._result("Chi-cuadrado", chi["statistic"], chi["p_value"], df=chi["df"])
+
+    def serial_correlation(self, u: np.ndarray, lag: int = 1) -> Dict:
+        """Correlación entre u_i y u_{i+lag}; bajo independencia r·√n es N(0, 1)."""
+        x, y = u[:-lag], u[lag:]
+        x = x - x.mean()
+        y = y - y.mean()
+        r = float(np.dot(x, y) / math.sqrt(np.dot(x, x) * np.dot(y, y)))
+        return self._result("Correlación serial", r, _normal_two_sided(r * math.sqrt(len(x))), lag=lag)
+
+    def runs(self, u: np.ndarray) -> Dict:
+        """Rachas por encima y por debajo de 0.5 (Wald-Wolfowitz)."""
+        above = u >= 0.5
+        n = len(u)
+        n1 = int(above.sum())
+        n2 = n - n1
+        if n1 == 0 or n2 == 0:
+            return self._result("Rachas", float(1), 0.0, runs=1)
+        n_runs = 1 + int(np.count_nonzero(above[1:] != above[:-1]))
+        mean = 2.0 * n1 * n2 / n + 1
+        variance = 2.0 * n1 * n2 * (2.0 * n1 * n2 - n) / (n * n * (n - 1))
+        z = (n_runs - mean) / math.sqrt(variance)
+        return self._result("Rachas", z, _normal_two_sided(z), runs=n_runs)
+
+    def gap(self, u: np.ndarray, low: float = 0.0, high: float = 0.5, max_gap: int = 10) -> Dict:
+        """
+        Prueba de huecos (Knuth): longitud de los huecos entre valores de [low, high).
+
+        Un hueco de longitud r tiene probabilidad p (1 - p)^r con p = high - low;
+        los huecos de max_gap o más forman una sola categoría.
+        """
+        hits = np.flatnonzero((u >= low) & (u < high))
+        if len(hits) < 2:
+            return self._result("Huecos", float("nan"), 0.0, gaps=0)
+        gaps = np.diff(hits) - 1
+        counts = np.bincount(np.minimum(gaps, max_gap), minlength=max_gap + 1)
+        p = high - low
+        probabilities = np.append(p * (1 - p) ** np.arange(max_gap), (1 - p) ** max_gap)
+        chi = self._chi_square(counts, probabilities)
+        return self._result("Huecos", chi["statistic"], chi["p_value"], df=chi["df"], gaps=len(gaps))
+
+    def poker(self, u: np.ndarray, hand: int = 5, digits: int = 10) -> Dict:
+        """
+        Prueba de póker (Knuth): número de valores distintos en manos de `hand`
+        dígitos floor(u·digits). P(r distintos) = d(d-1)...(d-r+1) S(k, r) / d^k.
+        """
+        n_hands = len(u) // hand
+        cards = np.minimum((u[:n_hands * hand] * digits).astype(np.int64), digits - 1).reshape(n_hands, hand)
+        cards.sort(axis=1)
+        distinct = 1 + np.count_nonzero(np.diff(cards, axis=1), axis=1)
+        counts = np.bincount(distinct, minlength=hand + 1)[1:]
+        # Números de Stirling de segunda especie S(hand, r)
+        stirling = [[1]]
+        for k in range(1, hand + 1):
+            prev = stirling[-1] + [0]
+            stirling.append([0] + [r * prev[r] + prev[r - 1] for r in range(1, k + 1)])
+        probabilities = [
+            math.perm(digits, r) * stirling[hand][r] / digits ** hand if r <= digits else 0.0
+            for r in range(1, hand + 1)
+        ]
+        chi = self._chi_square(counts, probabilities)
+        return self._result("Póker", chi["statistic"], chi["p_value"], df=chi["df"], hands=n_hands)
+
+    def _reduce_basis(self, basis: List[List[int]], delta: float = 0.99) -> List[List[int]]:
+        """
+        Reducción LLL de una base entera. Los coeficientes de Gram-Schmidt se
+        calculan en coma flotante, pero las operaciones sobre la base son enteras,
+        así que el resultado es siempre una base de la misma red.
+        """
+        basis = [list(v) for v in basis]
+        k = 1
+        while k < len(basis):
+            for j in range(k - 1, -1, -1):
+                _, mu = self._gram_schmidt(basis)
+                q = round(mu[k][j])
+                if q:
+                    basis[k] = [x - q * y for x, y in zip(basis[k], basis[j])]
+            norms, mu = self._gram_schmidt(basis)
+            if norms[k] >= (delta - mu[k][k - 1] ** 2) * norms[k - 1]:
+                k += 1
+            else:
+                basis[k - 1], basis[k] = basis[k], basis[k - 1]
+                k = max(k - 1, 1)
+        return basis
+
+    def _gram_schmidt(self, basis):
+        # Normas al cuadrado de los b*_i y coeficientes mu[i][j] = <b_i, b*_j> / |b*_j|²
+        n = len(basis)
+        vectors = [np.array(v, dtype=float) for v in basis]
+        ortho, norms = [], []
+        mu = [[0.0] * n for _ in range(n)]
+        for i, v in enumerate(vectors):
+            w = v.copy()
+            for j in range(i):
+                mu[i][j] = float(v @ ortho[j]) / norms[j]
+                w -= mu[i][j] * ortho[j]
+            ortho.append(w)
+            norms.append(float(w @ w))
+        return norms, mu
+
+    def _shortest_vector(self, basis: List[List[int]]) -> int:
+        """Norma al cuadrado (exacta) del vector no nulo más corto de la red, por enumeración."""
+        basis = self._reduce_basis(basis)
+        n = len(basis)
+        norms, mu = self._gram_schmidt(basis)
+        best = [min(sum(x * x for x in v) for v in basis)]
+        coeffs = [0] * n
+
+        def search(i, partial):
+            center = -sum(mu[j][i] * coeffs[j] for j in range(i + 1, n))
+            radius = math.sqrt(max(best[0] * (1 + 1e-9) - partial, 0.0) / norms[i])
+            for x in range(math.ceil(center - radius), math.floor(center + radius) + 1):
+                value = partial + norms[i] * (x - center) ** 2
+                if value > best[0] * (1 + 1e-9):
+                    continue
+                coeffs[i] = x
+                if i:
+                    search(i - 1, value)
+                elif any(coeffs):
+                    vector = [sum(c * b[k] for c, b in zip(coeffs, basis)) for k in range(n)]
+                    best[0] = min(best[0], sum(v * v for v in vector))
+            coeffs[i] = 0
+
+        search(n - 1, 0.0)
+        return best[0]
+
+    def spectral(self, a: int, m: int, dimensions=None) -> Dict:
+        """
+        Prueba espectral (Knuth, 3.3.4) del multiplicador a módulo m.
+
+        Los vectores (x_n, ..., x_{n+t-1}) de un LCG caen en hiperplanos paralelos
+        separados 1/ν_t, donde ν_t es la longitud del vector más corto de la red
+        dual {s : s_1 + s_2 a + ... + s_t a^{t-1} ≡ 0 (mod m)}. Se calcula por
+        reducción LLL y enumeración exacta. La figura de mérito
+        μ_t = π^{t/2} ν_t^t / ((t/2)! m) debe ser al menos 0.1 (Knuth).
+
+        Returns:
+            Dict: test, passed y, por dimensión, nu (ν_t), separation (1/ν_t) y merit (μ_t)
+        """
+        dimensions = self.SPECTRAL_DIMENSIONS if dimensions is None else dimensions
+        rows = []
+        for t in dimensions:
+            basis = [[m] + [0] * (t - 1)]
+            for i in range(1, t):
+                row = [0] * t
+                row[0] = -pow(a, i, m)
+                row[i] = 1
+                basis.append(row)
+            nu = math.sqrt(self._shortest_vector(basis))
+            merit = math.pi ** (t / 2) * nu ** t / (math.gamma(t / 2 + 1) * m)
+            rows.append({"dimension": t, "nu": nu, "separation": 1 / nu, "merit": merit})
+        return {
+            "test": "Espectral",
+            "passed": all(row["merit"] >= self.SPECTRAL_MIN_MERIT for row in rows),
+            "dimensions": rows,
+        }
+
+    def period(self, generator: CongruentialGenerator, max_steps: Optional[int] = None, min_period: int = 0) -> Dict:
+        """
+        Período λ y longitud de la cola μ de la secuencia de estados (método de Brent).
+
+        Brent fija la tortuga y avanza la liebre hasta 2^i pasos antes de mover la
+        tortuga; cada ronda se hace en bloque con generate_states y se busca la
+        tortuga en el bloque con NumPy. Después, μ es la primera posición con
+        X_i = X_{i+λ}, comparando bloques de dos copias separadas λ pasos con jump.
+        Si en max_steps pasos no se cierra el ciclo, period es None. La prueba
+        pasa si el período es al menos min_period (o mayor que max_steps).
+        Sin cálculo en bloque max_steps se limita a SCALAR_MAX_SAMPLES.
+        """
+        max_steps = self.PERIOD_MAX_STEPS if max_steps is None else int(max_steps)
+        if not generator._bulk_available():
+            max_steps = min(max_steps, self.SCALAR_MAX_SAMPLES)
+        hare = copy.copy(generator)
+        hare.reset()
+        tortoise = hare.current
+        power = 1
+        steps = 0
+        period = None
+        while steps < max_steps and period is None:
+            offset = 0
+            while offset < power:
+                block = hare.generate_states(min(power - offset, self.PERIOD_BLOCK))
+                hits = np.flatnonzero(block == tortoise)
+                if len(hits):
+                    period = offset + int(hits[0]) + 1
+                    break
+                offset += len(block)
+            steps += power
+            tortoise = hare.current
+            power *= 2
+        if period is None:
+            return {"test": "Período", "passed": True, "period": None, "tail": None, "steps": steps}
+
+        # Cola: primera posición i con X_i = X_{i + λ}
+        first = copy.copy(generator)
+        first.reset()
+        second = copy.copy(first)
+        second.jump(period)
+        tail = 0
+        if first.current != second.current:
+            while tail < max_steps:
+                size = min(self.PERIOD_BLOCK, max_steps)
+                equal = np.flatnonzero(first.generate_states(size) == second.generate_states(size))
+                if len(equal):
+                    tail += int(equal[0]) + 1
+                    break
+                tail += size
+        return {"test": "Período", "passed": period >= min_period, "period": period, "tail": tail, "steps": steps}
+
+    def sample_size(self, generator: CongruentialGenerator, n: int) -> int:
+        """Números que run_all analiza de verdad: n, o SCALAR_MAX_SAMPLES si no hay cálculo en bloque."""
+        n = int(n)
+        return n if generator._bulk_available() else min(n, self.SCALAR_MAX_SAMPLES)
+
+    def run_all(self, generator: CongruentialGenerator, n: int = 10**7) -> List[Dict]:
+        """
+        Ejecuta toda la batería sobre sample_size(generator, n) números del
+        generador (sin cambiar su estado).
+
+        La prueba espectral solo se incluye para generadores congruenciales cuya
+        salida es X_n / m (no para PCG32, cuya salida permuta el estado), y la del
+        período solo si el estado cabe en uint64 (m <= 2^64).
+        """
+        n = self.sample_size(generator, n)
+        sample = copy.copy(generator)
+        sample.reset()
+        u = sample.random(n)
+        results = [
+            self.chi_square(u),
+            self.serial_correlation(u),
+            self.runs(u),
+            self.gap(u),
+            self.poker(u),
+        ]
+        if not isinstance(generator, PCG32Generator):
+            results.append(self.spectral(generator.a, generator.m))
+        if generator.m <= 2**64:
+            # El período debe ser al menos tan largo como la muestra analizada
+            results.append(self.period(generator, min_period=n))
+        return results
@@ -138,6 +138,14 @@ class DiffEquationView:
             check_color=ft.Colors.WHITE,
         )
         
+        # Mostrar el campo de pendientes de dy/dx = f(x, y) detrás de la solución
+        self.slope_field = ft.Checkbox(
+            label="Campo de pendientes",
+            value=False,
+            fill_color=ft.Colors.BLUE_400,
+            check_color=ft.Colors.WHITE,
+        )
+        
         # Contenedor para la gráfica
         self.graph_container = ft.Container(
             width=650,
@@ -327,6 +335,7 @@ class DiffEquationView:
                             self.method_selector,
                             self.compare_methods,
                         ], spacing=10, alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                        self.slope_field,
                     ], spacing=10),
                     margin=ft.margin.only(bottom=20)
                 ),
@@ -605,6 +614,8 @@ class DiffEquationView:
             # Graficar línea con puntos
             plt.plot(t, y, 'o-', color=color, linewidth=2, markersize=4)
             
+            field_error = self.plot_slope_field(equation) if self.slope_field.value else None
+            
             # Configuración básica
             plt.grid(True, alpha=0.5)
             plt.title(equation, color='white')
@@ -626,12 +637,19 @@ class DiffEquationView:
             plt.close()
             
             # Mostrar la imagen en el contenedor
-            self.graph_container.content = ft.Image(
+            image = ft.Image(
                 src=temp_file,
                 width=650,
                 height=350,
                 fit=ft.ImageFit.CONTAIN
             )
+            if field_error:
+                self.graph_container.content = ft.Column([
+                    image,
+                    ft.Text(f"Error: {field_error}", color=ft.Colors.RED, size=14)
+                ])
+            else:
+                self.graph_container.content = image
             
             # Mostrar mensaje de éxito
             self.show_message("Ecuación resuelta correctamente.", is_error=False)
@@ -641,6 +659,25 @@ class DiffEquationView:
         except Exception as e:
             self.show_message(f"Error al graficar la solución: {str(e)}")
     
+    def plot_slope_field(self, equation):
+        # Solo aplica a ecuaciones de primer orden dy/dx = f(x, y).
+        # Devuelve el mensaje de error si no se pudo dibujar, o None.
+        try:
+            x_min, x_max = plt.xlim()
+            y_min, y_max = plt.ylim()
+            X, Y, U, V = self.diff_eq_ops.campo_pendientes(equation, (x_min, x_max), (y_min, y_max), 20)
+            plt.quiver(X, Y, U, V, color='#95a5a6', alpha=0.6, angles='xy', pivot='middle', headwidth=0, headlength=0, headaxislength=0)
+            
+            # Soluciones vecinas desde el borde izquierdo, integradas en un solo lote
+            y0s = np.linspace(y_min, y_max, 8)[1:-1]
+            x_puntos, trayectorias = self.diff_eq_ops.trayectorias_lote(equation, x_min, y0s, x_max - x_min, (x_max - x_min) / 200)
+            plt.plot(x_puntos, trayectorias, '-', color='#e67e22', linewidth=0.8, alpha=0.7)
+            plt.xlim(x_min, x_max)
+            plt.ylim(y_min, y_max)
+            return None
+        except ValueError as e:
+            return str(e)
+    
     def plot_comparison(self, solutions, equation):
         try:
             # Verificar que hay soluciones válidas
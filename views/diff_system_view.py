@@ -22,7 +22,9 @@ class DiffSystemView:
             "Sistema con Sumidero": "dx/dt = -2*x + y\ndy/dt = x - 2*y",
             "Sistema con Fuente": "dx/dt = 2*x + y\ndy/dt = x + 2*y",
             "Sistema de Masas Acopladas": "dx/dt = y\ndy/dt = -2*x - y",
-            "Sistema de Circuito RLC": "dx/dt = y\ndy/dt = -x - 0.5*y"
+            "Sistema de Circuito RLC": "dx/dt = y\ndy/dt = -x - 0.5*y",
+            "Lotka-Volterra (no lineal)": "dx/dt = 0.5x - 0.02x y\ndy/dt = -0.5y + 0.01x y",
+            "Péndulo Amortiguado (no lineal)": "dx/dt = y\ndy/dt = -sin(x) - 0.2*y"
         }
         
         # Selector de ejemplos
@@ -95,6 +97,46 @@ class DiffSystemView:
             text_size=16,
         )
         
+        # Modo de gráfica: series temporales o retrato de fase (y frente a x)
+        self.phase_switch = ft.Switch(
+            label="Retrato de fase",
+            value=False,
+            active_color=ft.Colors.BLUE_400,
+            label_style=ft.TextStyle(color=ft.Colors.WHITE),
+        )
+        
+        # Barrido de un parámetro del sistema en el plano traza-determinante
+        self.param_input = ft.TextField(
+            label="Parámetro",
+            value="k",
+            hint_text="Ej: dy/dt = -x - k*y",
+            border=ft.InputBorder.OUTLINE,
+            border_color=ft.Colors.BLUE_400,
+            color=ft.Colors.WHITE,
+            width=110,
+            text_size=16,
+        )
+        
+        self.param_min_input = ft.TextField(
+            label="Desde",
+            value="-3",
+            border=ft.InputBorder.OUTLINE,
+            border_color=ft.Colors.BLUE_400,
+            color=ft.Colors.WHITE,
+            width=110,
+            text_size=16,
+        )
+        
+        self.param_max_input = ft.TextField(
+            label="Hasta",
+            value="3",
+            border=ft.InputBorder.OUTLINE,
+            border_color=ft.Colors.BLUE_400,
+            color=ft.Colors.WHITE,
+            width=110,
+            text_size=16,
+        )
+        
         # Contenedor para la gráfica
         self.graph_container = ft.Container(
             width=650,
@@ -192,6 +234,14 @@ class DiffSystemView:
                 self.x0_input.value = "1"
                 self.y0_input.value = "0"
                 self.t_total_input.value = "10"
+            elif e.control.value == "Lotka-Volterra (no lineal)":
+                self.x0_input.value = "40"
+                self.y0_input.value = "9"
+                self.t_total_input.value = "30"
+            elif e.control.value == "Péndulo Amortiguado (no lineal)":
+                self.x0_input.value = "2"
+                self.y0_input.value = "0"
+                self.t_total_input.value = "20"
             
             self.page.update()
     
@@ -217,6 +267,19 @@ class DiffSystemView:
             )
         )
         
+        # Botón del barrido traza-determinante
+        sweep_button = ft.ElevatedButton(
+            text="Barrido traza-det",
+            on_click=self.sweep_parameter,
+            bgcolor=ft.Colors.BLUE_700,
+            color=ft.Colors.WHITE,
+            width=180,
+            height=45,
+            style=ft.ButtonStyle(
+                shape=ft.RoundedRectangleBorder(radius=10)
+            )
+        )
+        
         # Panel de configuración - Lado izquierdo
         config_panel = ft.Container(
             width=400,
@@ -263,6 +326,7 @@ class DiffSystemView:
                             self.t_total_input,
                             self.h_input,
                         ], spacing=10),
+                        self.phase_switch,
                     ], spacing=10),
                     margin=ft.margin.only(bottom=20)
                 ),
@@ -273,6 +337,23 @@ class DiffSystemView:
                     alignment=ft.alignment.center,
                 ),
                 
+                # Sección del barrido de parámetro
+                ft.Container(
+                    content=ft.Column([
+                        ft.Text("Barrido de parámetro", color=ft.Colors.WHITE, size=16, weight=ft.FontWeight.BOLD),
+                        ft.Row([
+                            self.param_input,
+                            self.param_min_input,
+                            self.param_max_input,
+                        ], spacing=10),
+                        ft.Container(
+                            content=sweep_button,
+                            alignment=ft.alignment.center,
+                        ),
+                    ], spacing=10),
+                    margin=ft.margin.only(top=20)
+                ),
+                
                 # Panel de valores y vectores propios
                 ft.Container(
                     content=self.eigen_panel,
@@ -457,16 +538,26 @@ class DiffSystemView:
         try:
             # Crear figura
             plt.figure(figsize=(6, 3.5), facecolor='#212121')
+            field_error = None
             
-            # Graficar x(t) y y(t)
-            plt.plot(t, x, 'o-', color='#3498db', linewidth=2, markersize=4, label='x(t)')
-            plt.plot(t, y, 's-', color='#e74c3c', linewidth=2, markersize=4, label='y(t)')
+            if self.phase_switch.value:
+                # Retrato de fase: trayectoria en el plano (x, y)
+                plt.plot(x, y, '-', color='#3498db', linewidth=2, label='Trayectoria')
+                plt.plot(x[0], y[0], 'o', color='#2ecc71', markersize=6, label='Inicio')
+                field_error = self.plot_direction_field(system, x, y)
+                plt.title("Retrato de Fase", color='white')
+                plt.xlabel("x", color='white')
+                plt.ylabel("y", color='white')
+            else:
+                # Graficar x(t) y y(t)
+                plt.plot(t, x, 'o-', color='#3498db', linewidth=2, markersize=4, label='x(t)')
+                plt.plot(t, y, 's-', color='#e74c3c', linewidth=2, markersize=4, label='y(t)')
+                plt.title("Solución del Sistema", color='white')
+                plt.xlabel("t", color='white')
+                plt.ylabel("x(t), y(t)", color='white')
             
             # Configuración básica
             plt.grid(True, alpha=0.5)
-            plt.title("Solución del Sistema", color='white')
-            plt.xlabel("t", color='white')
-            plt.ylabel("x(t), y(t)", color='white')
             plt.legend(facecolor='#303030', edgecolor='white', labelcolor='white')
             
             # Configurar colores para modo oscuro
@@ -484,18 +575,128 @@ class DiffSystemView:
             plt.close()
             
             # Mostrar la imagen
-            self.graph_container.content = ft.Image(
+            image = ft.Image(
                 src=temp_file,
                 width=650,
                 height=350,
                 fit=ft.ImageFit.CONTAIN
             )
+            if field_error:
+                self.graph_container.content = ft.Column([
+                    image,
+                    ft.Text(f"Error: {field_error}", color=ft.Colors.RED, size=14)
+                ])
+            else:
+                self.graph_container.content = image
             
             self.page.update()
             
         except Exception as e:
             self.show_message(f"Error al graficar la solución: {str(e)}")
     
+    def plot_direction_field(self, system, x, y):
+        # Campo de direcciones y trayectorias vecinas alrededor de la solución.
+        # Devuelve el mensaje de error si no se pudo dibujar, o None.
+        try:
+            margen_x = max(np.ptp(x) * 0.2, 1.0)
+            margen_y = max(np.ptp(y) * 0.2, 1.0)
+            x_rango = (float(np.min(x) - margen_x), float(np.max(x) + margen_x))
+            y_rango = (float(np.min(y) - margen_y), float(np.max(y) + margen_y))
+            X, Y, U, V = self.diff_sys_ops.campo_direcciones(system, x_rango, y_rango, 25)
+            plt.streamplot(X, Y, U, V, color='#95a5a6', linewidth=0.6, density=1.0, arrowsize=0.8)
+            
+            # Semillas en una malla 4x4; todas se integran en un solo lote
+            sx, sy = np.meshgrid(np.linspace(*x_rango, 6)[1:-1], np.linspace(*y_rango, 6)[1:-1])
+            semillas = np.column_stack([sx.ravel(), sy.ravel()])
+            t_total = float(self.t_total_input.value) if self.t_total_input.value else 5.0
+            h = float(self.h_input.value) if self.h_input.value else 0.1
+            _, trayectorias = self.diff_sys_ops.trayectorias_fase(system, semillas, t_total, h)
+            plt.plot(trayectorias[:, 0, :], trayectorias[:, 1, :], '-', color='#e67e22', linewidth=0.8, alpha=0.7)
+            plt.xlim(*x_rango)
+            plt.ylim(*y_rango)
+            return None
+        except ValueError as e:
+            return str(e)
+    
+    def sweep_parameter(self, e):
+        # Recorre el parámetro y dibuja el camino (traza, det) sobre la parábola 4·det = tr²
+        system = self.system_input.value.strip() if self.system_input.value else ""
+        if not system:
+            self.show_message("Por favor, ingrese un sistema de ecuaciones.")
+            return
+        parameter = (self.param_input.value or "").strip()
+        if not parameter:
+            self.show_message("Indique el nombre del parámetro a recorrer.")
+            return
+        try:
+            p_min = float(self.param_min_input.value)
+            p_max = float(self.param_max_input.value)
+        except (TypeError, ValueError):
+            self.show_message("Los valores numéricos no son válidos.")
+            return
+        if p_min >= p_max:
+            self.show_message("El rango del parámetro debe ser creciente.")
+            return
+        
+        try:
+            barrido = self.diff_sys_ops.barrido_traza_determinante(system, parameter, np.linspace(p_min, p_max, 400))
+        except ValueError as ex:
+            self.show_message(str(ex))
+            return
+        
+        try:
+            traza = barrido['traza']
+            determinante = barrido['determinante']
+            clasificacion = barrido['clasificacion']
+            
+            plt.figure(figsize=(6, 3.5), facecolor='#212121')
+            
+            # Parábola 4·det = tr² y ejes: fronteras entre los tipos de equilibrio
+            limite = max(float(np.max(np.abs(traza))), 1.0) * 1.2
+            tr = np.linspace(-limite, limite, 200)
+            plt.plot(tr, tr ** 2 / 4, '--', color='#95a5a6', linewidth=1, label='4·det = tr²')
+            plt.axhline(0, color='white', linewidth=0.6)
+            plt.axvline(0, color='white', linewidth=0.6)
+            
+            # Camino del barrido, coloreado por clasificación
+            plt.plot(traza, determinante, '-', color='#3498db', linewidth=1, alpha=0.6)
+            colores = plt.cm.tab10(np.linspace(0, 1, len(self.diff_sys_ops.CLASIFICACIONES)))
+            for k, nombre in enumerate(self.diff_sys_ops.CLASIFICACIONES):
+                mascara = clasificacion == k
+                if np.any(mascara):
+                    plt.plot(traza[mascara], determinante[mascara], '.', color=colores[k], markersize=4, label=nombre)
+            plt.plot(traza[0], determinante[0], 'o', color='#2ecc71', markersize=6)
+            plt.plot(traza[-1], determinante[-1], 's', color='#e74c3c', markersize=6)
+            
+            plt.grid(True, alpha=0.5)
+            plt.title(f"Barrido de {parameter} en [{p_min:g}, {p_max:g}]", color='white')
+            plt.xlabel("Traza", color='white')
+            plt.ylabel("Determinante", color='white')
+            plt.legend(facecolor='#303030', edgecolor='white', labelcolor='white', fontsize=7)
+            
+            # Configurar colores para modo oscuro
+            plt.gca().set_facecolor('#303030')
+            plt.gca().tick_params(colors='white')
+            plt.gca().spines['bottom'].set_color('white')
+            plt.gca().spines['top'].set_color('white')
+            plt.gca().spines['left'].set_color('white')
+            plt.gca().spines['right'].set_color('white')
+            
+            temp_filename = f"diff_sys_sweep_{uuid.uuid4().hex[:8]}.png"
+            temp_file = os.path.join(self.temp_dir, temp_filename)
+            plt.savefig(temp_file, dpi=100, bbox_inches='tight', facecolor='#212121')
+            plt.close()
+            
+            self.graph_container.content = ft.Image(
+                src=temp_file,
+                width=650,
+                height=350,
+                fit=ft.ImageFit.CONTAIN
+            )
+            self.show_message("Barrido calculado correctamente.", is_error=False)
+        except Exception as ex:
+            self.show_message(f"Error al graficar el barrido: {str(ex)}")
+    
     def generate_results_table(self, t, x, y):
         try:
             self.results_table.rows = []
@@ -540,8 +741,18 @@ class DiffSystemView:
     def show_latex_eigen(self, info):
         # Muestra los valores y vectores propios como texto
         if 'valores_propios' in info and 'vectores_propios' in info:
+            clasificacion = f"\n\nClasificación: {info['clasificacion']}" if 'clasificacion' in info else ""
+            eigen_text = ft.Text(
+                f"{info['valores_propios']}\n\n{info['vectores_propios']}{clasificacion}",
+                color=ft.Colors.WHITE,
+                size=14,
+            )
+            self.eigen_panel.content.controls[1] = eigen_text
+            self.page.update()
+        elif 'equilibrios' in info:
+            # Sistemas no lineales: equilibrios y su linealización
             eigen_text = ft.Text(
-                f"{info['valores_propios']}\n\n{info['vectores_propios']}",
+                f"Equilibrios y linealización:\n{info['equilibrios']}",
                 color=ft.Colors.WHITE,
                 size=14,
             )
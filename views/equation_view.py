@@ -1,14 +1,21 @@
 import flet as ft
 import sympy as sp
+import numpy as np
+import time
 from core.equation_operations import EquationOperations
+from core.number_parser import parse_table
 
 class EquationView:
     def __init__(self, page: ft.Page):
         self.page = page
         self.eq_ops = EquationOperations()
-        self.eq_types = ["Lineal", "Cuadrática", "Sistema 2x2"]
+        self.eq_types = ["Lineal", "Cuadrática", "Sistema 2x2", "Sistema n×n", "Polinómica", "No lineal", "Sistema no lineal"]
         self.current_eq_type = "Lineal"
         self.coefficient_inputs = []
+        # Resultado del último archivo de coeficientes resuelto
+        self.batch_result = None
+        self.batch_picker = ft.FilePicker(on_result=self.solve_file)
+        self.batch_save_picker = ft.FilePicker(on_result=self.export_batch)
         
     def show(self):
         # Título de la página
@@ -55,6 +62,31 @@ class EquationView:
             color=ft.Colors.WHITE,
         )
         
+        # Soluciones exactas con radicales (SymPy), solo para mostrar
+        self.exact_checkbox = ft.Checkbox(
+            label="Soluciones exactas",
+            value=False,
+            label_style=ft.TextStyle(color=ft.Colors.WHITE),
+        )
+        
+        # Resolver un archivo CSV con una ecuación por fila
+        for picker in (self.batch_picker, self.batch_save_picker):
+            if picker not in self.page.overlay:
+                self.page.overlay.append(picker)
+        file_button = ft.ElevatedButton(
+            text="Resolver CSV",
+            tooltip="Una fila de coeficientes por ecuación",
+            on_click=lambda _: self.batch_picker.pick_files(allowed_extensions=["csv", "txt"]),
+            bgcolor=ft.Colors.BLUE_GREY_700,
+            color=ft.Colors.WHITE,
+        )
+        export_button = ft.ElevatedButton(
+            text="Exportar",
+            on_click=lambda _: self.batch_save_picker.save_file(file_name="soluciones.csv", allowed_extensions=["csv"]),
+            bgcolor=ft.Colors.BLUE_GREY_700,
+            color=ft.Colors.WHITE,
+        )
+        
         # Layout principal
         self.page.controls[0].controls[1].content.controls = [
             ft.Column(
@@ -84,7 +116,10 @@ class EquationView:
                     # Botón de resolver
                     ft.Container(
                         padding=ft.padding.symmetric(horizontal=40, vertical=10),
-                        content=solve_button,
+                        content=ft.Row(
+                            [solve_button, self.exact_checkbox, file_button, export_button],
+                            alignment=ft.MainAxisAlignment.CENTER,
+                        ),
                         alignment=ft.alignment.center,
                     ),
                     
@@ -177,6 +212,102 @@ class EquationView:
             
             self.coefficient_container.content.controls.extend([layout1, layout2])
             
+        elif eq_type == "Sistema n×n":
+            # Una ecuación por línea, o la matriz ampliada [A | b] fila a fila
+            self.system_input = ft.TextField(
+                value="2x + 3y - z = 1\nx - y = 2\nx + y + z = 3",
+                width=400,
+                multiline=True,
+                min_lines=3,
+                max_lines=10,
+                bgcolor=ft.Colors.WHITE10,
+                color=ft.Colors.WHITE,
+                border_radius=10,
+                hint_text="Ecuaciones (x + 2y = 3) o matriz ampliada (1 2 3)",
+                border=ft.border.all(1, ft.Colors.BLUE_200),
+            )
+            layout = ft.Row([self.system_input], alignment=ft.MainAxisAlignment.CENTER)
+            self.coefficient_container.content.controls.append(layout)
+            
+        elif eq_type == "Polinómica":
+            # Expresión en x o lista de coeficientes de mayor a menor grado
+            self.polynomial_input = ft.TextField(
+                value="x^3 - 2x + 1",
+                width=400,
+                bgcolor=ft.Colors.WHITE10,
+                color=ft.Colors.WHITE,
+                border_radius=10,
+                hint_text="Ej: x^5 - 3x^2 + 1  o  1, 0, 0, -3, 0, 1",
+                border=ft.border.all(1, ft.Colors.BLUE_200),
+            )
+            layout = ft.Row(
+                [
+                    ft.Text("p(x):", color=ft.Colors.WHITE),
+                    self.polynomial_input,
+                    ft.Text("= 0", color=ft.Colors.WHITE),
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=10,
+            )
+            self.coefficient_container.content.controls.append(layout)
+            
+        elif eq_type == "No lineal":
+            # f(x) = g(x) con búsqueda de todas las raíces en [a, b]
+            self.nonlinear_input = ft.TextField(
+                value="cos(x) = x",
+                width=300,
+                bgcolor=ft.Colors.WHITE10,
+                color=ft.Colors.WHITE,
+                border_radius=10,
+                hint_text="Ej: x^5 - 3x + 1 = 0",
+                border=ft.border.all(1, ft.Colors.BLUE_200),
+            )
+            self.interval_a = ft.TextField(value="-10", width=70, text_align=ft.TextAlign.CENTER, color=ft.Colors.WHITE)
+            self.interval_b = ft.TextField(value="10", width=70, text_align=ft.TextAlign.CENTER, color=ft.Colors.WHITE)
+            layout = ft.Row(
+                [
+                    self.nonlinear_input,
+                    ft.Text("en [", color=ft.Colors.WHITE),
+                    self.interval_a,
+                    ft.Text(",", color=ft.Colors.WHITE),
+                    self.interval_b,
+                    ft.Text("]", color=ft.Colors.WHITE),
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=10,
+            )
+            self.coefficient_container.content.controls.append(layout)
+            
+        elif eq_type == "Sistema no lineal":
+            # Ecuaciones separadas por líneas, ';' o ','; raíces buscadas en la caja [a, b]ⁿ
+            self.nonlinear_system_input = ft.TextField(
+                value="x^2 + y^2 = 4\nx*y = 1",
+                width=300,
+                multiline=True,
+                min_lines=2,
+                max_lines=8,
+                bgcolor=ft.Colors.WHITE10,
+                color=ft.Colors.WHITE,
+                border_radius=10,
+                hint_text="Ej: x^2 + y^2 = 4, x*y = 1",
+                border=ft.border.all(1, ft.Colors.BLUE_200),
+            )
+            self.box_a = ft.TextField(value="-10", width=70, text_align=ft.TextAlign.CENTER, color=ft.Colors.WHITE)
+            self.box_b = ft.TextField(value="10", width=70, text_align=ft.TextAlign.CENTER, color=ft.Colors.WHITE)
+            layout = ft.Row(
+                [
+                    self.nonlinear_system_input,
+                    ft.Text("en [", color=ft.Colors.WHITE),
+                    self.box_a,
+                    ft.Text(",", color=ft.Colors.WHITE),
+                    self.box_b,
+                    ft.Text("]ⁿ", color=ft.Colors.WHITE),
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+                spacing=10,
+            )
+            self.coefficient_container.content.controls.append(layout)
+            
         self.page.update()
     
     def create_coef_input(self, default_value="0"):
@@ -202,8 +333,94 @@ class EquationView:
         self.result_container.content.controls = []
         self.page.update()
     
+    def solve_polynomial(self):
+        start = time.perf_counter()
+        result = self.eq_ops.polynomial_roots(self.polynomial_input.value)
+        elapsed = time.perf_counter() - start
+        roots = result["roots"]
+        solutions = []
+        for root, cond in zip(roots[:10], result["condition"][:10]):
+            value = f"{root.real:.6g}" if root.imag == 0 else f"{root.real:.6g} {'+' if root.imag >= 0 else '-'} {abs(root.imag):.6g}i"
+            solutions.append(f"x = {value}   (condición {cond:.2g})")
+        if len(roots) > 10:
+            solutions.append(f"... ({len(roots) - 10} raíces más)")
+        method = "matriz compañera" if result["method"] == "companion" else f"Aberth ({result['iterations']} iteraciones)"
+        summary = f"Grado {len(roots)}, {method}, {1000 * elapsed:.1f} ms, error hacia atrás máx. {result['backward_error'].max(initial=0):.1e}"
+        if not result["converged"]:
+            summary += " (sin converger)"
+        solutions.append(summary)
+        self.show_results(self.polynomial_input.value, solutions)
+
+    def solve_nonlinear(self):
+        start = time.perf_counter()
+        result = self.eq_ops.find_roots(self.nonlinear_input.value, self.interval_a.value, self.interval_b.value)
+        elapsed = time.perf_counter() - start
+        roots = result["roots"]
+        solutions = [f"x = {root:.12g}   (|f(x)| = {residual:.1e})" for root, residual in zip(roots[:10], result["residuals"][:10])]
+        if len(roots) > 10:
+            solutions.append(f"... ({len(roots) - 10} raíces más)")
+        if not len(roots):
+            solutions.append(f"Sin raíces en [{self.interval_a.value}, {self.interval_b.value}]")
+        solutions.append(
+            f"{result['f_evals']} evaluaciones de f, {result['df_evals']} de f', {1000 * elapsed:.1f} ms"
+        )
+        self.show_results(self.nonlinear_input.value, solutions)
+
+    def solve_linear_system(self):
+        exact = bool(self.exact_checkbox.value)
+        start = time.perf_counter()
+        result = self.eq_ops.solve_linear_system(self.system_input.value, exact=exact)
+        elapsed = time.perf_counter() - start
+        if result["type"] == "incompatible":
+            solutions = [f"Sistema incompatible (rango {result['rank']})"]
+        else:
+            solutions = list(result["parametric"])
+            if result["type"] == "infinitas":
+                solutions.append(f"Infinitas soluciones: rango {result['rank']}, {len(result['free'])} variable(s) libre(s)")
+        if exact:
+            summary = f"Eliminación de Bareiss (exacta), {1000 * elapsed:.1f} ms"
+        else:
+            summary = f"Residuo máx. {result.get('residual', 0):.1e}, {1000 * elapsed:.1f} ms"
+            if result.get("refinement_steps"):
+                summary += f", {result['refinement_steps']} paso(s) de refinamiento, condición {result['cond']:.2g}"
+        solutions.append(summary)
+        self.show_results(self.system_input.value.replace("\n", "; "), solutions)
+
+    def solve_nonlinear_system(self):
+        start = time.perf_counter()
+        result = self.eq_ops.solve_nonlinear_system(self.nonlinear_system_input.value, self.box_a.value, self.box_b.value)
+        elapsed = time.perf_counter() - start
+        names = result["variables"]
+        roots = result["roots"]
+        solutions = [
+            ", ".join(f"{name} = {value:.10g}" for name, value in zip(names, root)) + f"   (residuo {residual:.1e})"
+            for root, residual in zip(roots[:10], result["residuals"][:10])
+        ]
+        if len(roots) > 10:
+            solutions.append(f"... ({len(roots) - 10} raíces más)")
+        if not len(roots):
+            solutions.append(f"Sin raíces reales en [{self.box_a.value}, {self.box_b.value}]")
+        solutions.append(
+            f"{result['converged']} de {result['starts']} puntos de partida convergieron, "
+            f"{result['iterations']} iteraciones, {result['f_evals']} evaluaciones de F, {1000 * elapsed:.1f} ms"
+        )
+        self.show_results(self.nonlinear_system_input.value.replace("\n", "; "), solutions)
+
     def solve_equation(self, e):
         try:
+            if self.current_eq_type == "Sistema no lineal":
+                self.solve_nonlinear_system()
+                return
+            if self.current_eq_type == "Sistema n×n":
+                self.solve_linear_system()
+                return
+            if self.current_eq_type == "Polinómica":
+                self.solve_polynomial()
+                return
+            if self.current_eq_type == "No lineal":
+                self.solve_nonlinear()
+                return
+            
             coeffs = []
             for input_field in self.coefficient_inputs:
                 try:
@@ -228,9 +445,13 @@ class EquationView:
                 eq_str = f"{a1}x + {b1}y = {c1}\n{a2}x + {b2}y = {c2}"
                 
                 if isinstance(result, dict):
-                    solutions = [f"x = {result['x']:.4f}, y = {result['y']:.4f}"]
+                    solutions = [f"x = {result['x']:.4f}, y = {result['y']:.4f}", f"Número de condición: {result['cond']:.4g}"]
                 else:
                     solutions = [result]
+            
+            if self.exact_checkbox.value:
+                exact = self.eq_ops.exact_roots(self.current_eq_type, *coeffs)
+                solutions = list(solutions) + [f"Exacta: {sol}" for sol in exact]
                 
             # Mostrar resultados
             self.show_results(eq_str, solutions)
@@ -264,4 +485,34 @@ class EquationView:
         self.result_container.content.controls.append(
             ft.Text(f"Error: {error_msg}", color=ft.Colors.RED, size=16)
         )
-        self.page.update() 
\ No newline at end of file
+        self.page.update()
+
+    def solve_file(self, e):
+        if not e.files:
+            return
+        try:
+            with open(e.files[0].path, 'r') as f:
+                coefficients = parse_table(f.read())
+            start = time.perf_counter()
+            result = self.eq_ops.solve_batch(self.current_eq_type, coefficients)
+            elapsed = time.perf_counter() - start
+            self.batch_result = result
+            lines = [np.array2string(row, precision=4, suppress_small=True) for row in result[:5]]
+            if len(result) > 5:
+                lines.append(f"... ({len(result) - 5} más)")
+            solved = int(np.all(np.isfinite(result), axis=1).sum())
+            self.show_results(
+                f"{len(result)} ecuaciones ({self.current_eq_type}) resueltas en {1000 * elapsed:.1f} ms, {solved} con solución única",
+                lines,
+            )
+        except Exception as ex:
+            self.show_error(str(ex))
+
+    def export_batch(self, e):
+        if not e.path or self.batch_result is None:
+            return
+        try:
+            np.savetxt(e.path, self.batch_result, delimiter=',', fmt='%.17g')
+            self.show_results(f"Soluciones guardadas en {e.path}", [])
+        except Exception as ex:
+            self.show_error(str(ex))
@@ -2,6 +2,12 @@ import flet as ft
 import numpy as np
 from core.matrix_operations import MatrixOperations
 from fractions import Fraction
+import threading
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import io
+import base64
 
 class MatrixView:
     def __init__(self, page: ft.Page):
@@ -12,6 +18,14 @@ class MatrixView:
         self.matrix_b = np.zeros((self.matrix_size_b, self.matrix_size_b))
         self.matrix_ops = MatrixOperations()
         self.result_matrix = None
+        # Matrices importadas desde archivo (sustituyen a los campos de texto)
+        self.loaded_matrices = {"A": None, "B": None}
+        self.last_result = None
+        # Hasta este tamaño se muestra una celda por elemento
+        self.max_input_size = 4
+        self.file_picker_a = ft.FilePicker(on_result=lambda e: self.import_matrix(e, "A"))
+        self.file_picker_b = ft.FilePicker(on_result=lambda e: self.import_matrix(e, "B"))
+        self.save_picker = ft.FilePicker(on_result=self.export_result)
 
     def fraction_to_str(self, value):
         """Convierte un valor (entero, float o Fraction) a string para mostrar"""
@@ -28,13 +42,17 @@ class MatrixView:
         return str(value)
 
     def create_matrix_inputs(self, size, initial_values=None):
+        # Todo el texto de las celdas se genera de una vez
+        texts = None
+        if initial_values is not None:
+            texts = self.matrix_ops.matrix_to_strings(initial_values)
         inputs = []
         for i in range(size):
             row = []
             for j in range(size):
                 value = "1"
-                if initial_values is not None and i < len(initial_values) and j < len(initial_values[i]):
-                    value = self.fraction_to_str(initial_values[i][j])
+                if texts is not None and i < texts.shape[0] and j < texts.shape[1]:
+                    value = str(texts[i, j])
                 
                 input_field = ft.TextField(
                     value=value,
@@ -53,28 +71,172 @@ class MatrixView:
         return ft.Column(inputs, spacing=10, alignment=ft.MainAxisAlignment.CENTER)
 
     def get_matrix_values(self, matrix_inputs):
-        rows = len(matrix_inputs.controls)
-        matrix = []
-        for i in range(rows):
-            row_controls = matrix_inputs.controls[i].controls
-            matrix_row = []
-            for j in range(len(row_controls)):
-                try:
-                    # Intentar procesar fracciones en formato "a/b"
-                    value_str = row_controls[j].value.strip()
-                    if '/' in value_str:
-                        num, denom = value_str.split('/')
-                        value = float(int(num)) / float(int(denom))
-                    else:
-                        value = float(value_str)
-                except ValueError:
-                    value = 0
-                matrix_row.append(value)
-            matrix.append(matrix_row)
-        return np.array(matrix)
+        # Si todos los valores son racionales ("3", "-1.5", "2/7") la matriz es exacta
+        rows = [
+            [control.value for control in row.controls]
+            for row in matrix_inputs.controls
+        ]
+        return self.matrix_ops.parse_matrix(rows)
+
+    def get_operand(self, matrix_type):
+        loaded = self.loaded_matrices[matrix_type]
+        if loaded is not None:
+            return loaded
+        return self.get_matrix_values(self.matrix_a_inputs if matrix_type == "A" else self.matrix_b_inputs)
+
+    def heatmap_image(self, matrix, width=320, height=260):
+        grid = self.matrix_ops.preview_grid(matrix)
+        fig, ax = plt.subplots(figsize=(4, 3.2), facecolor='#212121')
+        image = ax.imshow(grid, cmap='viridis', aspect='auto', interpolation='nearest')
+        ax.tick_params(colors='white')
+        fig.colorbar(image, ax=ax)
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=80, bbox_inches='tight', facecolor='#212121')
+        plt.close(fig)
+        return ft.Image(
+            src_base64=base64.b64encode(buf.getvalue()).decode('utf-8'),
+            width=width,
+            height=height,
+            fit=ft.ImageFit.CONTAIN,
+        )
+
+    def matrix_preview(self, matrix):
+        # Vista resumida para matrices grandes: esquinas + mapa de calor
+        return ft.Column(
+            [
+                ft.Text(self.matrix_ops.summarize_matrix(matrix), color=ft.Colors.WHITE, size=12, font_family="monospace"),
+                self.heatmap_image(matrix),
+            ],
+            spacing=10,
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+
+    def factor_view(self, name, value):
+        # Un factor de una descomposición: texto si es pequeño, vista resumida si no
+        value = np.asarray(value)
+        if value.dtype != object:
+            value = np.real_if_close(value)
+        if value.ndim == 2 and max(value.shape) > self.max_input_size and not np.iscomplexobj(value):
+            content = self.matrix_preview(value)
+        elif value.dtype == object:
+            content = ft.Text(
+                "\n".join("  ".join(row) for row in np.atleast_2d(self.matrix_ops.matrix_to_strings(value))),
+                color=ft.Colors.WHITE, size=14, font_family="monospace",
+            )
+        else:
+            content = ft.Text(
+                np.array2string(value, precision=4, suppress_small=True, threshold=50, max_line_width=120),
+                color=ft.Colors.WHITE, size=14, font_family="monospace",
+            )
+        return ft.Column(
+            [ft.Text(name, color=ft.Colors.BLUE_200, size=16, weight=ft.FontWeight.BOLD), content],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        )
+
+    def decompose(self):
+        matrix = self.get_operand("A")
+        kind = self.decomposition_dropdown.value
+        ops = self.matrix_ops
+        try:
+            if kind == "QR":
+                names, operation = ("Q", "R"), "qr"
+                factors = ops.qr_decomposition(matrix)
+            elif kind == "Cholesky":
+                names, operation = ("L",), "cholesky"
+                factors = (ops.cholesky_decomposition(matrix),)
+            elif kind == "SVD":
+                names, operation = ("U", "Valores singulares", "Vᵀ"), "svd"
+                factors = ops.svd_decomposition(matrix)
+            elif kind == "Valores propios":
+                names, operation = ("Valores propios", "Vectores propios"), "eig"
+                factors = ops.eigen_decomposition(matrix)
+            elif kind == "Rango":
+                rank = ops.calculate_rank(matrix)
+                self.result_text.value = f"Rango de A = {rank}  ({1000 * ops.timings['rank']:.3f} ms)"
+                self.page.update()
+                return
+            elif kind == "Pseudoinversa":
+                names, operation = ("A⁺",), "pinv"
+                factors = (ops.pseudoinverse(matrix),)
+            elif kind == "Potencia":
+                k = int(self.power_field.value)
+                names, operation = (f"A^{k}",), "power"
+                factors = (ops.matrix_power(matrix, k),)
+            elif kind == "Exponencial":
+                names, operation = ("e^A",), "expm"
+                factors = (ops.matrix_exponential(matrix),)
+
+            # Se exporta el primer factor (o el resultado, si solo hay uno)
+            self.last_result = factors[0]
+            self.result_matrix = ft.Row(
+                [self.factor_view(name, factor) for name, factor in zip(names, factors)],
+                alignment=ft.MainAxisAlignment.CENTER,
+                vertical_alignment=ft.CrossAxisAlignment.START,
+                wrap=True,
+                spacing=30,
+            )
+            self.result_container.content = self.result_matrix
+            self.result_text.value = f"{kind} de A calculada en {1000 * ops.timings[operation]:.3f} ms"
+        except Exception as e:
+            self.result_text.value = f"Error: {str(e)}"
+        self.page.update()
+
+    def change_threads(self, e):
+        try:
+            self.matrix_ops.set_blas_threads(int(e.control.value))
+            self.result_text.value = f"BLAS usa ahora {self.matrix_ops.blas.get_threads()} hilo(s)"
+        except Exception as ex:
+            self.result_text.value = f"Error: {str(ex)}"
+        self.page.update()
+
+    def run_benchmark(self):
+        info = self.matrix_ops.blas.info()
+        self.result_text.value = f"Ejecutando benchmark ({info['name']} {info['version']})..."
+        self.page.update()
+        # El benchmark tarda varios segundos: se ejecuta fuera del hilo de la interfaz
+        threading.Thread(target=self._benchmark_thread, args=(info,), daemon=True).start()
+
+    def _benchmark_thread(self, info):
+        try:
+            rows = self.matrix_ops.benchmark(sizes=(128, 256, 512, 1024))
+            lines = [f"{'Operación':<12}{'n':>6}{'Hilos':>7}{'Tiempo (ms)':>14}{'GFLOP/s':>10}"]
+            for row in rows:
+                lines.append(
+                    f"{row['operation']:<12}{row['n']:>6}{str(row['threads']):>7}"
+                    f"{1000 * row['seconds']:>14.2f}{row['gflops']:>10.2f}"
+                )
+            self.result_container.content = ft.Text("\n".join(lines), color=ft.Colors.WHITE, size=14, font_family="monospace")
+            self.result_text.value = f"BLAS: {info['name']} {info['version']}"
+        except Exception as ex:
+            self.result_text.value = f"Error: {str(ex)}"
+        self.page.update()
+
+    def import_matrix(self, e, matrix_type):
+        if not e.files:
+            return
+        try:
+            matrix = self.matrix_ops.load_matrix(e.files[0].path)
+            self.loaded_matrices[matrix_type] = matrix
+            container = self.matrix_container_a if matrix_type == "A" else self.matrix_container_b
+            container.content = self.matrix_preview(matrix)
+            self.result_text.value = f"Matriz {matrix_type} importada: {matrix.shape[0]} × {matrix.shape[1]}"
+        except Exception as ex:
+            self.result_text.value = f"Error: {str(ex)}"
+        self.page.update()
+
+    def export_result(self, e):
+        if not e.path or self.last_result is None:
+            return
+        try:
+            self.matrix_ops.save_matrix(self.last_result, e.path)
+            self.result_text.value = f"Resultado guardado en {e.path}"
+        except Exception as ex:
+            self.result_text.value = f"Error: {str(ex)}"
+        self.page.update()
 
     def update_matrix_size(self, e, matrix_type):
         size = int(e.control.value.split(" × ")[0])
+        self.loaded_matrices[matrix_type] = None
         if matrix_type == "A":
             self.matrix_size_a = size
             self.matrix_a_inputs = self.create_matrix_inputs(size, np.ones((size, size)))
@@ -86,6 +248,17 @@ class MatrixView:
         self.page.update()
 
     def fill_matrix(self, matrix_type, fill_type):
+        if self.loaded_matrices[matrix_type] is not None:
+            # Volver a los campos de texto al rellenar una matriz importada
+            self.loaded_matrices[matrix_type] = None
+            size = self.matrix_size_a if matrix_type == "A" else self.matrix_size_b
+            inputs = self.create_matrix_inputs(size, np.ones((size, size)))
+            if matrix_type == "A":
+                self.matrix_a_inputs = inputs
+                self.matrix_container_a.content = inputs
+            else:
+                self.matrix_b_inputs = inputs
+                self.matrix_container_b.content = inputs
         size = self.matrix_size_a if matrix_type == "A" else self.matrix_size_b
         matrix_inputs = self.matrix_a_inputs if matrix_type == "A" else self.matrix_b_inputs
         
@@ -105,8 +278,8 @@ class MatrixView:
 
     def calculate(self, operation):
         # Obtener valores de matrices
-        matrix_a = self.get_matrix_values(self.matrix_a_inputs)
-        matrix_b = self.get_matrix_values(self.matrix_b_inputs)
+        matrix_a = self.get_operand("A")
+        matrix_b = self.get_operand("B")
         
         try:
             if operation == "+":
@@ -137,7 +310,11 @@ class MatrixView:
                 result = self.matrix_ops.calculate_inverse(matrix_b)
             
             # Mostrar resultados
-            self.result_matrix = self.create_matrix_inputs(len(result), result)
+            self.last_result = result
+            if max(getattr(result, "shape", np.shape(result))) > self.max_input_size:
+                self.result_matrix = self.matrix_preview(result)
+            else:
+                self.result_matrix = self.create_matrix_inputs(len(result), result)
             self.result_container.content = self.result_matrix
             self.result_text.value = ""
         except Exception as e:
@@ -189,6 +366,19 @@ class MatrixView:
             color=ft.Colors.WHITE,
         )
 
+        # Importación / exportación de matrices grandes (.csv, .npy, .mtx)
+        for picker in (self.file_picker_a, self.file_picker_b, self.save_picker):
+            if picker not in self.page.overlay:
+                self.page.overlay.append(picker)
+        matrix_extensions = ["csv", "txt", "npy", "mtx"]
+
+        import_button_a = ft.ElevatedButton(
+            text="Importar",
+            on_click=lambda _: self.file_picker_a.pick_files(allowed_extensions=matrix_extensions),
+            bgcolor=ft.Colors.BLUE_GREY_700,
+            color=ft.Colors.WHITE,
+        )
+
         # Inicializar matriz A
         self.matrix_a_inputs = self.create_matrix_inputs(self.matrix_size_a, np.ones((self.matrix_size_a, self.matrix_size_a)))
         self.matrix_container_a = ft.Container(
@@ -233,6 +423,13 @@ class MatrixView:
             color=ft.Colors.WHITE,
         )
 
+        import_button_b = ft.ElevatedButton(
+            text="Importar",
+            on_click=lambda _: self.file_picker_b.pick_files(allowed_extensions=matrix_extensions),
+            bgcolor=ft.Colors.BLUE_GREY_700,
+            color=ft.Colors.WHITE,
+        )
+
         # Inicializar matriz B
         self.matrix_b_inputs = self.create_matrix_inputs(self.matrix_size_b, np.ones((self.matrix_size_b, self.matrix_size_b)))
         self.matrix_container_b = ft.Container(
@@ -292,6 +489,35 @@ class MatrixView:
             ],
         )
 
+        # Descomposiciones y funciones de A (con su tiempo de cálculo)
+        self.decomposition_dropdown = ft.Dropdown(
+            width=180,
+            text_size=14,
+            value="QR",
+            options=[
+                ft.dropdown.Option(option)
+                for option in ("QR", "Cholesky", "SVD", "Valores propios", "Rango", "Pseudoinversa", "Potencia", "Exponencial")
+            ],
+        )
+        self.power_field = ft.TextField(
+            label="k",
+            value="2",
+            width=70,
+            text_align=ft.TextAlign.CENTER,
+            color=ft.Colors.WHITE,
+        )
+        decomposition_a = ft.Row(
+            [
+                self.decomposition_dropdown,
+                self.power_field,
+                ft.ElevatedButton(
+                    text="Calcular",
+                    on_click=lambda _: self.decompose(),
+                    bgcolor=ft.Colors.INDIGO_400,
+                ),
+            ],
+        )
+
         matrix_b_ops = ft.Row(
             [
                 ft.ElevatedButton(
@@ -328,6 +554,31 @@ class MatrixView:
             weight=ft.FontWeight.BOLD,
         )
 
+        # Hilos de BLAS y benchmark de rendimiento
+        blas_info = self.matrix_ops.blas.info()
+        threads_dropdown = ft.Dropdown(
+            width=130,
+            text_size=14,
+            label="Hilos BLAS",
+            value=str(blas_info["threads"]) if blas_info["threads"] else None,
+            options=[ft.dropdown.Option(str(n)) for n in range(1, blas_info["max_threads"] + 1)],
+            on_change=self.change_threads,
+            disabled=not blas_info["controllable"],
+        )
+        benchmark_button = ft.ElevatedButton(
+            text="Benchmark",
+            on_click=lambda _: self.run_benchmark(),
+            bgcolor=ft.Colors.BLUE_GREY_700,
+            color=ft.Colors.WHITE,
+        )
+
+        export_button = ft.ElevatedButton(
+            text="Exportar resultado",
+            on_click=lambda _: self.save_picker.save_file(file_name="resultado.csv", allowed_extensions=["csv", "npy", "mtx"]),
+            bgcolor=ft.Colors.BLUE_GREY_700,
+            color=ft.Colors.WHITE,
+        )
+
         # Layout de la página
         self.page.controls[0].controls[1].content.controls = [
             ft.Column(
@@ -344,11 +595,12 @@ class MatrixView:
                                 ft.Column(
                                     [
                                         ft.Row(
-                                            [size_dropdown_a, random_button_a, zeros_button_a, ones_button_a],
+                                            [size_dropdown_a, random_button_a, zeros_button_a, ones_button_a, import_button_a],
                                             alignment=ft.MainAxisAlignment.CENTER,
                                         ),
                                         self.matrix_container_a,
                                         matrix_a_ops,
+                                        decomposition_a,
                                     ],
                                     alignment=ft.MainAxisAlignment.CENTER,
                                     horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -364,7 +616,7 @@ class MatrixView:
                                 ft.Column(
                                     [
                                         ft.Row(
-                                            [size_dropdown_b, random_button_b, zeros_button_b, ones_button_b],
+                                            [size_dropdown_b, random_button_b, zeros_button_b, ones_button_b, import_button_b],
                                             alignment=ft.MainAxisAlignment.CENTER,
                                         ),
                                         self.matrix_container_b,
@@ -383,7 +635,7 @@ class MatrixView:
                         padding=ft.padding.symmetric(horizontal=40, vertical=20),
                         content=ft.Column(
                             [
-                                result_label,
+                                ft.Row([result_label, export_button, threads_dropdown, benchmark_button], alignment=ft.MainAxisAlignment.CENTER),
                                 self.result_text,
                                 self.result_container,
                             ],
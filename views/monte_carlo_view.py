@@ -1,6 +1,7 @@
 import flet as ft
 import numpy as np
-from utils.monte_carlo import MonteCarlo
+from utils.monte_carlo import MonteCarlo, evaluate_expression
+from functools import partial
 import matplotlib.pyplot as plt
 from io import BytesIO
 import base64
@@ -77,6 +78,17 @@ class MonteCarloView:
             text_size=16
         )
         
+        # Procesos para repartir los trozos de la simulación
+        self.workers_selector = ft.Dropdown(
+            label="Procesos",
+            width=150,
+            border=ft.InputBorder.OUTLINE,
+            border_color=ft.Colors.BLUE_400,
+            color=ft.Colors.WHITE,
+            options=[ft.dropdown.Option(str(n)) for n in range(1, (os.cpu_count() or 1) + 1)],
+            value="1",
+        )
+        
         # Selector de método (solo dos opciones)
         self.method_selector = ft.Dropdown(
             label="Método",
@@ -162,16 +174,7 @@ class MonteCarloView:
     
     def evaluate_function(self, x: float) -> float:
         """Evalúa la función ingresada por el usuario."""
-        try:
-            # Permitir ^ como potencia
-            func_str = self.function_input.value.replace("^", "**")
-            # Crear un entorno seguro para eval
-            safe_dict = {"x": x, "np": np, "sin": np.sin, "cos": np.cos, 
-                        "tan": np.tan, "exp": np.exp, "log": np.log, 
-                        "sqrt": np.sqrt, "pi": np.pi}
-            return eval(func_str, {"__builtins__": {}}, safe_dict)
-        except Exception as e:
-            raise ValueError(f"Error al evaluar la función: {str(e)}")
+        return evaluate_expression(self.function_input.value, x)
     
     def calculate(self, e):
         try:
@@ -204,8 +207,8 @@ class MonteCarloView:
             method = self.method_selector.value
             seed_value_str = self.seed_input.value
             seed = int(seed_value_str) if seed_value_str else None
-            self.monte_carlo = MonteCarlo(seed=seed)
-            print(f"Método seleccionado: {method}, Semilla: {seed}")
+            workers = int(self.workers_selector.value or 1)
+            self.monte_carlo = MonteCarlo(seed=seed, workers=workers)
             if method == "Estimación de área":
                 a = float(self.a_input.value)
                 b = float(self.b_input.value)
@@ -213,8 +216,9 @@ class MonteCarloView:
                 y_test = [self.evaluate_function(x) for x in x_test]
                 y_min = min(y_test) - 0.1 * (max(y_test) - min(y_test))
                 y_max = max(y_test) + 0.1 * (max(y_test) - min(y_test))
+                # partial de una función de módulo: se puede enviar a los procesos
                 result, error = self.monte_carlo.estimate_area(
-                    self.evaluate_function, a, b, y_min, y_max, n_points)
+                    partial(evaluate_expression, self.function_input.value), a, b, y_min, y_max, n_points)
                 x_points = [a + (b - a) * self.monte_carlo.generator.generate() for _ in range(n_points)]
                 y_points = [y_min + (y_max - y_min) * self.monte_carlo.generator.generate() for _ in range(n_points)]
                 f_values = [self.evaluate_function(x) for x in x_points]
@@ -234,8 +238,8 @@ class MonteCarloView:
                 b = float(self.b_input.value)
                 func1_str = self.function_input.value.replace("^", "**")
                 func2_str = self.function2_input.value.replace("^", "**")
-                f1 = lambda x: eval(func1_str, {"x": x, "np": np, "sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "pi": np.pi})
-                f2 = lambda x: eval(func2_str, {"x": x, "np": np, "sin": np.sin, "cos": np.cos, "tan": np.tan, "exp": np.exp, "log": np.log, "sqrt": np.sqrt, "pi": np.pi})
+                f1 = partial(evaluate_expression, func1_str)
+                f2 = partial(evaluate_expression, func2_str)
                 result, error, xs, ys, is_in = self.monte_carlo.estimate_area_between_curves(f1, f2, a, b, n_points)
                 f_values = [f1(x) for x in xs]
                 g_values = [f2(x) for x in xs]
@@ -561,6 +565,7 @@ class MonteCarloView:
                 self.b_input,
                 self.n_points_input,
                 self.seed_input,
+                self.workers_selector,
                 ft.Container(
                     content=calculate_button,
                     padding=ft.padding.symmetric(vertical=10),
@@ -1,11 +1,28 @@
+import time
+import threading
 import flet as ft
-from utils.random_generator import CongruentialGenerator
+from utils.random_generator import CongruentialGenerator, PRESETS, create_generator
+from utils.randomness_tests import RandomnessTests
 
 class RandomGeneratorView:
+    # Números sobre los que se ejecuta la batería de pruebas
+    TEST_SAMPLES = 10**7
+
     def __init__(self, page: ft.Page):
         self.page = page
         self.generator = CongruentialGenerator()
         
+        # Parámetros predefinidos (rellenan a, c y m)
+        self.preset_dropdown = ft.Dropdown(
+            label="Parámetros",
+            value="Numerical Recipes",
+            options=[ft.dropdown.Option(name) for name in PRESETS] + [ft.dropdown.Option("Personalizado")],
+            on_change=self.change_preset,
+            border_color=ft.Colors.BLUE_400,
+            color=ft.Colors.WHITE,
+            width=320,
+        )
+        
         # Campos de entrada
         self.seed_input = ft.TextField(
             label="Semilla inicial",
@@ -67,17 +84,68 @@ class RandomGeneratorView:
             height=200,
         )
         
+    def change_preset(self, e):
+        preset = self.preset_dropdown.value
+        params = PRESETS.get(preset)
+        for field in (self.a_input, self.c_input, self.m_input):
+            field.disabled = preset == "PCG32"
+        if params:
+            self.a_input.value = str(params["a"])
+            self.c_input.value = str(params["c"])
+            self.m_input.value = str(params["m"])
+        self.page.update()
+    
+    def create_generator(self):
+        seed = int(self.seed_input.value)
+        if self.preset_dropdown.value == "PCG32":
+            return create_generator("PCG32", seed)
+        return CongruentialGenerator(seed=seed, a=int(self.a_input.value), c=int(self.c_input.value), m=int(self.m_input.value))
+    
+    def run_tests(self, e):
+        self.result_container.content = ft.Text("Ejecutando pruebas...", color=ft.Colors.WHITE, size=16)
+        self.page.update()
+        # La batería tarda varios segundos: se ejecuta fuera del hilo de la interfaz
+        threading.Thread(target=self._tests_thread, daemon=True).start()
+
+    def _tests_thread(self):
+        try:
+            tests = RandomnessTests()
+            generator = self.create_generator()
+            n = tests.sample_size(generator, self.TEST_SAMPLES)
+            start = time.perf_counter()
+            results = tests.run_all(generator, n)
+            elapsed = time.perf_counter() - start
+            lines = []
+            for result in results:
+                status = "pasa" if result["passed"] else "NO pasa"
+                if result["test"] == "Espectral":
+                    merits = ", ".join(f"μ{row['dimension']}={row['merit']:.3g}" for row in result["dimensions"])
+                    lines.append(f"Espectral: {status} ({merits})")
+                elif result["test"] == "Período":
+                    if result["period"] is None:
+                        lines.append(f"Período: mayor que {result['steps']} pasos")
+                    else:
+                        lines.append(f"Período: {result['period']} (cola de {result['tail']})")
+                else:
+                    lines.append(f"{result['test']}: {status} (p = {result['p_value']:.4f})")
+            if n < self.TEST_SAMPLES:
+                lines.append(f"Sin cálculo en bloque para este módulo: muestra reducida a {n} números")
+            lines.append(f"{n} números, {elapsed:.2f} s")
+            self.result_container.content = ft.Column(
+                [ft.Text(line, color=ft.Colors.WHITE, size=14) for line in lines],
+                scroll=ft.ScrollMode.AUTO,
+            )
+        except Exception as ex:
+            # En el hilo no hay nadie más que recoja el error: también los de parámetros absurdos
+            self.result_container.content = ft.Text(f"Error: {str(ex)}", color=ft.Colors.RED, size=16)
+        self.page.update()
+    
     def generate_numbers(self, e):
         try:
-            # Obtener valores de los campos
-            seed = int(self.seed_input.value)
-            a = int(self.a_input.value)
-            c = int(self.c_input.value)
-            m = int(self.m_input.value)
             n = int(self.n_input.value)
             
             # Crear nuevo generador con los parámetros
-            self.generator = CongruentialGenerator(seed=seed, a=a, c=c, m=m)
+            self.generator = self.create_generator()
             
             # Generar números
             numbers = self.generator.generate_sequence(n)
@@ -119,6 +187,15 @@ class RandomGeneratorView:
             height=45,
         )
         
+        test_button = ft.ElevatedButton(
+            text="Evaluar calidad",
+            on_click=self.run_tests,
+            bgcolor=ft.Colors.BLUE_700,
+            color=ft.Colors.WHITE,
+            width=150,
+            height=45,
+        )
+        
         # Layout principal
         self.page.controls[0].controls[1].content.controls = [
             ft.Column(
@@ -142,6 +219,10 @@ class RandomGeneratorView:
                                     color=ft.Colors.WHITE,
                                     size=16,
                                 ),
+                                ft.Row(
+                                    [self.preset_dropdown],
+                                    alignment=ft.MainAxisAlignment.CENTER,
+                                ),
                                 ft.Row(
                                     [self.seed_input, self.a_input],
                                     alignment=ft.MainAxisAlignment.CENTER,
@@ -157,7 +238,7 @@ class RandomGeneratorView:
                                     alignment=ft.MainAxisAlignment.CENTER,
                                 ),
                                 ft.Container(
-                                    content=generate_button,
+                                    content=ft.Row([generate_button, test_button], alignment=ft.MainAxisAlignment.CENTER, spacing=20),
                                     padding=ft.padding.symmetric(vertical=10),
                                     alignment=ft.alignment.center,
                                 ),
@@ -1,7 +1,9 @@
 import flet as ft
 import numpy as np
 from core.vector_operations import VectorOperations
+from core.vector_index import VectorIndex
 import math
+import time
 
 class VectorView:
     def __init__(self, page: ft.Page):
@@ -9,6 +11,14 @@ class VectorView:
         self.vector_ops = VectorOperations()
         self.dimensions = ["2D", "3D"]
         self.current_dimension = "3D"
+        # Lotes de vectores cargados desde archivo (arrays (N, d))
+        self.batches = {"A": None, "B": None}
+        self.batch_result = None
+        # Índice de vecinos sobre el lote A, se reconstruye al cambiar el lote o la métrica
+        self.index = None
+        self.batch_picker_a = ft.FilePicker(on_result=lambda e: self.load_batch(e, "A"))
+        self.batch_picker_b = ft.FilePicker(on_result=lambda e: self.load_batch(e, "B"))
+        self.batch_save_picker = ft.FilePicker(on_result=self.export_batch)
         
     def show(self):
         # Título de la página
@@ -193,6 +203,86 @@ class VectorView:
             alignment=ft.MainAxisAlignment.CENTER,
         )
         
+        # Operaciones por lotes sobre archivos con muchos vectores
+        for picker in (self.batch_picker_a, self.batch_picker_b, self.batch_save_picker):
+            if picker not in self.page.overlay:
+                self.page.overlay.append(picker)
+        batch_extensions = ["csv", "txt", "npy"]
+        self.batch_operation_dropdown = ft.Dropdown(
+            width=170,
+            text_size=14,
+            value="angle",
+            options=[
+                ft.dropdown.Option(key, text)
+                for key, text in (
+                    ("add", "A + B"),
+                    ("subtract", "A - B"),
+                    ("dot", "A · B"),
+                    ("cross", "A × B"),
+                    ("norm", "|A|"),
+                    ("normalize", "Â"),
+                    ("angle", "∠(A,B)"),
+                )
+            ],
+        )
+        batch_row = ft.Row(
+            [
+                ft.Text("Lotes: ", color=ft.Colors.WHITE),
+                ft.ElevatedButton(
+                    text="Archivo A",
+                    on_click=lambda _: self.batch_picker_a.pick_files(allowed_extensions=batch_extensions),
+                    bgcolor=ft.Colors.BLUE_GREY_700,
+                ),
+                ft.ElevatedButton(
+                    text="Archivo B",
+                    on_click=lambda _: self.batch_picker_b.pick_files(allowed_extensions=batch_extensions),
+                    bgcolor=ft.Colors.BLUE_GREY_700,
+                ),
+                self.batch_operation_dropdown,
+                ft.ElevatedButton(
+                    text="Calcular lote",
+                    on_click=lambda _: self.calculate_batch(),
+                    bgcolor=ft.Colors.INDIGO_400,
+                    color=ft.Colors.WHITE,
+                ),
+                ft.ElevatedButton(
+                    text="Exportar",
+                    on_click=lambda _: self.batch_save_picker.save_file(file_name="resultado.csv", allowed_extensions=["csv", "npy"]),
+                    bgcolor=ft.Colors.BLUE_GREY_700,
+                ),
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+        )
+        
+        # Búsqueda de vecinos: el lote A es el conjunto, B (lote o vector) las consultas
+        self.neighbors_k = ft.TextField(
+            label="k",
+            value="5",
+            width=70,
+            text_align=ft.TextAlign.CENTER,
+            color=ft.Colors.WHITE,
+        )
+        self.neighbors_metric = ft.Dropdown(
+            width=150,
+            text_size=14,
+            value="euclidean",
+            options=[ft.dropdown.Option("euclidean", "Euclídea"), ft.dropdown.Option("cosine", "Ángulo (coseno)")],
+        )
+        neighbors_row = ft.Row(
+            [
+                ft.Text("Vecinos: ", color=ft.Colors.WHITE),
+                self.neighbors_k,
+                self.neighbors_metric,
+                ft.ElevatedButton(
+                    text="k vecinos de B en A",
+                    on_click=lambda _: self.find_neighbors(),
+                    bgcolor=ft.Colors.INDIGO_400,
+                    color=ft.Colors.WHITE,
+                ),
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+        )
+        
         # Área de resultados
         result_label = ft.Text(
             "Resultado:",
@@ -255,7 +345,7 @@ class VectorView:
                     ft.Container(
                         padding=ft.padding.symmetric(horizontal=40, vertical=10),
                         content=ft.Column(
-                            [operations_row, advanced_operations_row],
+                            [operations_row, advanced_operations_row, batch_row, neighbors_row],
                             alignment=ft.MainAxisAlignment.CENTER,
                             spacing=10,
                         ),
@@ -406,4 +496,83 @@ class VectorView:
         except Exception as e:
             self.result_text.value = f"Error: {str(e)}"
             
-        self.page.update() 
\ No newline at end of file
+        self.page.update()
+
+    def load_batch(self, e, label):
+        if not e.files:
+            return
+        try:
+            vectors = self.vector_ops.load_vectors(e.files[0].path)
+            self.batches[label] = vectors
+            if label == "A":
+                self.index = None
+            self.result_text.value = f"Lote {label}: {vectors.shape[0]} vectores de dimensión {vectors.shape[1]}"
+        except Exception as ex:
+            self.result_text.value = f"Error: {str(ex)}"
+        self.page.update()
+
+    def calculate_batch(self):
+        operation = self.batch_operation_dropdown.value
+        try:
+            batch_a = self.batches["A"]
+            if batch_a is None:
+                raise ValueError("Primero carga un archivo para el lote A")
+            # Sin archivo B se usa el vector B escrito a mano para todas las filas
+            batch_b = self.batches["B"]
+            if batch_b is None:
+                batch_b = self.vector_ops.parse_vector(self.vector_b_input.value)
+            start = time.perf_counter()
+            result = self.vector_ops.batch_operation(operation, batch_a, batch_b)
+            elapsed = time.perf_counter() - start
+            self.batch_result = result
+            if operation == "angle":
+                result = np.degrees(result)
+            preview = "\n".join(
+                self.vector_to_str(row) if np.ndim(row) else f"{row:.4f}" for row in result[:5]
+            )
+            if len(result) > 5:
+                preview += f"\n... ({len(result) - 5} más)"
+            if result.ndim == 1:
+                preview += f"\nmín = {np.nanmin(result):.4f}, máx = {np.nanmax(result):.4f}, media = {np.nanmean(result):.4f}"
+            self.result_text.value = f"{len(result)} resultados en {1000 * elapsed:.1f} ms\n{preview}"
+        except Exception as ex:
+            self.result_text.value = f"Error: {str(ex)}"
+        self.page.update()
+
+    def export_batch(self, e):
+        if not e.path or self.batch_result is None:
+            return
+        try:
+            self.vector_ops.save_vectors(self.batch_result, e.path)
+            self.result_text.value = f"Resultado guardado en {e.path}"
+        except Exception as ex:
+            self.result_text.value = f"Error: {str(ex)}"
+        self.page.update()
+
+    def find_neighbors(self):
+        try:
+            if self.batches["A"] is None:
+                raise ValueError("Primero carga un archivo para el lote A")
+            metric = self.neighbors_metric.value
+            if self.index is None or self.index.metric != metric:
+                self.index = VectorIndex(self.batches["A"], metric=metric)
+            queries = self.batches["B"]
+            if queries is None:
+                queries = self.vector_ops.parse_vector(self.vector_b_input.value)
+            distances, indices = self.index.query(queries, int(self.neighbors_k.value))
+            unit = " rad" if metric == "cosine" else ""
+            lines = [
+                f"Consulta {row}: " + ", ".join(f"#{i} ({d:.4f}{unit})" for d, i in zip(distances[row], indices[row]))
+                for row in range(min(len(indices), 3))
+            ]
+            if len(indices) > 3:
+                lines.append(f"... ({len(indices) - 3} consultas más)")
+            lines.append(
+                f"{len(self.index)} vectores, método {self.index.method}: índice {1000 * self.index.build_seconds:.1f} ms, "
+                f"consulta {1000 * self.index.last_query_seconds:.2f} ms"
+            )
+            self.batch_result = np.hstack([indices, distances])
+            self.result_text.value = "\n".join(lines)
+        except Exception as ex:
+            self.result_text.value = f"Error: {str(ex)}"
+        self.page.update()